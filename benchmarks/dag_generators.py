@@ -0,0 +1,105 @@
+"""Generators of synthetic `Task` dependency graphs for the benchmarks.
+
+Every generator returns a list of `Task` instances in which dependencies always appear before the tasks depending on
+them. The `spec` of each `Task` references the `OUTPUT` variable of each of its dependencies, so that variable resolution
+has the same amount of work to do as the dependency graph suggests.
+"""
+
+import math
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../src")
+
+from magnum_opus.operarius import Task
+
+
+BENCHMARK_API_VERSION = 'NoOpTaskProcessor/v1'
+MIN_TASK_QTY = 10
+MAX_TASK_QTY = 100000
+
+
+def _create_task_name(task_number: int)->str:
+    return 'task-{:06d}'.format(task_number)
+
+
+def _create_task(task_number: int, dependency_task_numbers: list)->Task:
+    metadata = {'name': _create_task_name(task_number=task_number)}
+    if len(dependency_task_numbers) > 0:
+        metadata['dependencies'] = [{'tasks': [_create_task_name(task_number=n) for n in dependency_task_numbers]},]
+    return Task(
+        api_version=BENCHMARK_API_VERSION,
+        kind='NoOp',
+        metadata=metadata,
+        spec={
+            'taskNumber': task_number,
+            'inputs': ['${}VAR:{}:OUTPUT{}'.format('{', _create_task_name(task_number=n), '}') for n in dependency_task_numbers],
+        }
+    )
+
+
+def _validate_task_qty(task_qty: int):
+    if task_qty < MIN_TASK_QTY or task_qty > MAX_TASK_QTY:
+        raise Exception('The task quantity must be between {} and {}'.format(MIN_TASK_QTY, MAX_TASK_QTY))
+
+
+def generate_chain(task_qty: int, seed: int=0)->list:
+    """Each `Task` depends on the previous one: `task-000000 <- task-000001 <- ...`
+    """
+    _validate_task_qty(task_qty=task_qty)
+    return [_create_task(task_number=n, dependency_task_numbers=[n-1,] if n > 0 else []) for n in range(task_qty)]
+
+
+def generate_fan_out(task_qty: int, seed: int=0)->list:
+    """All tasks depend on a single root `Task`
+    """
+    _validate_task_qty(task_qty=task_qty)
+    return [_create_task(task_number=n, dependency_task_numbers=[0,] if n > 0 else []) for n in range(task_qty)]
+
+
+def generate_diamond(task_qty: int, seed: int=0)->list:
+    """A root `Task`, with all tasks but the last depending on it, and the last `Task` depending on all the others
+    """
+    _validate_task_qty(task_qty=task_qty)
+    tasks = [_create_task(task_number=n, dependency_task_numbers=[0,] if n > 0 else []) for n in range(task_qty-1)]
+    tasks.append(_create_task(task_number=task_qty-1, dependency_task_numbers=list(range(1, task_qty-1))))
+    return tasks
+
+
+def generate_layered(task_qty: int, seed: int=0)->list:
+    """About `sqrt(task_qty)` layers of equal width, in which each `Task` depends on two tasks of the previous layer
+    """
+    _validate_task_qty(task_qty=task_qty)
+    layer_width = math.isqrt(task_qty)
+    tasks = list()
+    for n in range(task_qty):
+        dependency_task_numbers = list()
+        if n >= layer_width:
+            previous_layer_start = (n // layer_width - 1) * layer_width
+            position = n % layer_width
+            dependency_task_numbers = sorted({previous_layer_start + position, previous_layer_start + (position + 1) % layer_width})
+        tasks.append(_create_task(task_number=n, dependency_task_numbers=dependency_task_numbers))
+    return tasks
+
+
+def generate_random(task_qty: int, seed: int=0, max_dependencies: int=3)->list:
+    """Each `Task` depends on up to `max_dependencies` randomly selected earlier tasks. The same seed always produces
+    the same graph.
+    """
+    _validate_task_qty(task_qty=task_qty)
+    rng = random.Random(seed)
+    tasks = list()
+    for n in range(task_qty):
+        dependency_qty = rng.randint(0, min(n, max_dependencies))
+        tasks.append(_create_task(task_number=n, dependency_task_numbers=sorted(rng.sample(range(n), dependency_qty))))
+    return tasks
+
+
+DAG_GENERATORS = {
+    'chain': generate_chain,
+    'fan_out': generate_fan_out,
+    'diamond': generate_diamond,
+    'layered': generate_layered,
+    'random': generate_random,
+}
@@ -0,0 +1,309 @@
+"""Benchmarks the core workflow operations on synthetic dependency graphs.
+
+Examples:
+
+```shell
+# Run the default benchmarks and compare against the stored baseline
+python3 benchmarks/run_benchmarks.py
+
+# Run a larger benchmark without comparing, writing the results to a file
+python3 benchmarks/run_benchmarks.py --shapes chain random --sizes 10000 100000 --benchmarks get_task_names_in_order --baseline '' --output /tmp/bench_output.json
+
+# Store new baseline results after an intentional change in performance
+python3 benchmarks/run_benchmarks.py --update-baseline
+```
+
+Durations are measured in CPU time of the process, which is less affected by other load on the machine than the wall
+clock time. Each sample repeats a benchmark until at least `MIN_SAMPLE_SECONDS` were measured, and the median duration
+per iteration of all samples is reported.
+
+Only benchmarks with at least `--min-gated-size` tasks are compared with the baseline: the smaller sizes complete in a
+few milliseconds, where caches and the garbage collector cause differences well beyond any threshold. The exit code is
+1 when any compared benchmark is slower than its baseline by more than the threshold, and 0 otherwise.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../src")
+
+from dag_generators import BENCHMARK_API_VERSION, DAG_GENERATORS
+from magnum_opus.operarius import *
+
+
+DEFAULT_BASELINE_PATH = '{}{}baseline.json'.format(os.path.dirname(os.path.realpath(__file__)), os.sep)
+DEFAULT_SIZES = (10, 100, 1000,)
+DEFAULT_MIN_GATED_SIZE = 1000
+# Shorter samples are dominated by timer resolution and scheduling noise
+MIN_SAMPLE_SECONDS = 0.1
+# Differences smaller than this are considered measurement noise, regardless of the threshold
+NOISE_FLOOR_SECONDS = 0.005
+
+
+class InMemoryStatePersistence(StatePersistence):
+
+    def load(self, on_failure: object=False)->bool:
+        return True
+
+    def load_objects_state(self, object_identifiers: list)->dict:
+        return dict()
+
+    def commit(self):
+        pass
+
+
+class NoOpTaskProcessor(TaskProcessor):
+    """Creates nothing, but reports its output and state updates like any other `TaskProcessor`
+    """
+
+    def __init__(self, api_version: str=BENCHMARK_API_VERSION):
+        super().__init__(api_version)
+
+    def create_action(self, task: Task, persistence: StatePersistence=StatePersistence(), variable_store: VariableStore=VariableStore(), task_resolved_spec: dict=dict())->VariableStore:
+        variable_store.add_variable(variable_name=self.create_identifier(task=task, variable_name='OUTPUT'), value=task.task_id)
+        variable_store.add_variable(
+            variable_name=self.create_identifier(task=task, variable_name='TASK_STATE_UPDATES'),
+            value={
+                'resource_checksum': task.task_id,
+                'resolved_spec_applied': task_resolved_spec,
+                'state_changed': True,
+                'is_created': True,
+                'create_timestamp': 0,
+                'raw_spec': task.spec,
+                'metadata': task.metadata,
+            }
+        )
+        return variable_store
+
+
+def _create_tasks(task_list: list)->Tasks:
+    tasks = Tasks()
+    for task in task_list:
+        tasks.add_task(task=task)
+    return tasks
+
+
+def _create_output_variable_store(task_list: list)->VariableStore:
+    variable_store = VariableStore()
+    for task in task_list:
+        variable_store.add_variable(variable_name='{}:OUTPUT'.format(task.task_id), value=task.task_id)
+    return variable_store
+
+
+def benchmark_get_task_names_in_order(task_list: list)->float:
+    tasks = _create_tasks(task_list=task_list)
+    start = time.process_time()
+    tasks.get_task_names_in_order(command='create', context='default')
+    return time.process_time() - start
+
+
+def benchmark_resolve_spec_variables(task_list: list)->float:
+    hook = ResolveTaskSpecVariablesHook()
+    parameters = {'Command': 'create', 'Context': 'default'}
+    variable_store = _create_output_variable_store(task_list=task_list)
+    start = time.process_time()
+    for task in task_list:
+        hook.run(task=task, parameters=parameters, variable_store=variable_store)
+    return time.process_time() - start
+
+
+def benchmark_process_task(task_list: list)->float:
+    task_processor = NoOpTaskProcessor()
+    persistence = InMemoryStatePersistence()
+    start = time.process_time()
+    for task in task_list:
+        task_processor.process_task(task=task, persistence=persistence, variable_store=VariableStore(), action='CreateAction', task_resolved_spec=task.spec)
+    return time.process_time() - start
+
+
+def benchmark_execute_workflow(task_list: list)->float:
+    task_process_store = TaskProcessStore()
+    task_process_store.register_task_processor(task_processor=NoOpTaskProcessor(), lifecycle='Singleton')
+    workflow_executor = WorkflowExecutor(
+        persistence=InMemoryStatePersistence(),
+        variable_store=VariableStore(),
+        task_process_store=task_process_store,
+        event_journal=EventJournal(max_events=10)
+    )
+    for task in task_list:
+        workflow_executor.add_task(task=task)
+    workflow_executor.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+    workflow_executor.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+    workflow_executor.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+    start = time.process_time()
+    workflow_executor.execute_workflow(command='create', context='default')
+    return time.process_time() - start
+
+
+BENCHMARKS = {
+    'get_task_names_in_order': benchmark_get_task_names_in_order,
+    'resolve_spec_variables': benchmark_resolve_spec_variables,
+    'process_task': benchmark_process_task,
+    'execute_workflow': benchmark_execute_workflow,
+}
+
+
+def _measure_sample(benchmark_name: str, task_list: list)->tuple:
+    # Returns the seconds per iteration and the number of iterations of one sample
+    measured_seconds = 0.0
+    iterations = 0
+    while measured_seconds < MIN_SAMPLE_SECONDS:
+        measured_seconds += BENCHMARKS[benchmark_name](task_list=copy.deepcopy(task_list))
+        iterations += 1
+    return measured_seconds / iterations, iterations
+
+
+def run_benchmarks(shapes: list, sizes: list, benchmark_names: list, repeat: int=3, seed: int=0)->dict:
+    """Runs each benchmark on each shape and size combination
+
+    Returns:
+        A dict with the `Seconds` (median of `repeat` samples, per iteration), `MicrosecondsPerTask` and `Iterations`
+        (per sample) of each benchmark, keyed by `<shape>:<size>:<benchmark>`
+    """
+    results = dict()
+    for shape in shapes:
+        for size in sizes:
+            task_list = DAG_GENERATORS[shape](task_qty=size, seed=seed)
+            for benchmark_name in benchmark_names:
+                samples = [_measure_sample(benchmark_name=benchmark_name, task_list=task_list) for _ in range(repeat)]
+                seconds = statistics.median([sample_seconds for sample_seconds, _ in samples])
+                key = '{}:{}:{}'.format(shape, size, benchmark_name)
+                results[key] = {
+                    'Shape': shape,
+                    'TaskQty': size,
+                    'Benchmark': benchmark_name,
+                    'Seconds': seconds,
+                    'MicrosecondsPerTask': seconds / size * 1000000,
+                    'Iterations': max([iterations for _, iterations in samples]),
+                }
+                print('{:<60} {:>12.6f} s {:>12.2f} us/task'.format(key, results[key]['Seconds'], results[key]['MicrosecondsPerTask']))
+    return results
+
+
+def find_regressions(results: dict, baseline_results: dict, threshold: float, min_gated_size: int=DEFAULT_MIN_GATED_SIZE)->list:
+    """Compares results with baseline results of the same benchmarks with at least `min_gated_size` tasks
+
+    Returns:
+        A list of dicts, each with the `Key`, `Seconds`, `BaselineSeconds` and `Ratio` of a benchmark that is more than
+        `threshold` (a fraction) slower than its baseline
+    """
+    regressions = list()
+    for key, result in results.items():
+        if key not in baseline_results or result['TaskQty'] < min_gated_size:
+            continue
+        baseline_seconds = baseline_results[key]['Seconds']
+        if result['Seconds'] - baseline_seconds < NOISE_FLOOR_SECONDS:
+            continue
+        if result['Seconds'] > baseline_seconds * (1 + threshold):
+            regressions.append({
+                'Key': key,
+                'Seconds': result['Seconds'],
+                'BaselineSeconds': baseline_seconds,
+                'Ratio': result['Seconds'] / baseline_seconds,
+            })
+    return regressions
+
+
+def _write_json(path: str, data: dict):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(args: list=None)->int:
+    parser = argparse.ArgumentParser(description='Benchmarks the core workflow operations on synthetic dependency graphs')
+    parser.add_argument('--shapes', nargs='+', choices=tuple(DAG_GENERATORS.keys()), default=list(DAG_GENERATORS.keys()))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES), help='Task quantities, between 10 and 100000')
+    parser.add_argument('--benchmarks', nargs='+', choices=tuple(BENCHMARKS.keys()), default=list(BENCHMARKS.keys()))
+    parser.add_argument('--repeat', type=int, default=5, help='Samples per benchmark, of which the median is reported')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random graph shape')
+    parser.add_argument('--output', default=None, help='Path of the JSON file to write the results to')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='Path of the baseline JSON file. Use an empty string to skip the comparison')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Allowed slow down relative to the baseline, as a fraction')
+    parser.add_argument('--min-gated-size', type=int, default=DEFAULT_MIN_GATED_SIZE, help='Smallest task quantity compared with the baseline')
+    parser.add_argument('--confirmation-runs', type=int, default=2, help='Times to measure suspected regressions again before failing')
+    parser.add_argument('--update-baseline', action='store_true', help='Merge the results into the baseline file instead of comparing')
+    parsed_args = parser.parse_args(args)
+
+    logging.getLogger('magnum_opus.operarius').setLevel(logging.WARNING)
+
+    report = {
+        'Environment': {
+            'PythonVersion': platform.python_version(),
+            'Platform': platform.platform(),
+            'Timestamp': datetime.now(timezone.utc).isoformat(),
+        },
+        'Configuration': {
+            'Repeat': parsed_args.repeat,
+            'Seed': parsed_args.seed,
+            'MinSampleSeconds': MIN_SAMPLE_SECONDS,
+        },
+        'Results': run_benchmarks(
+            shapes=parsed_args.shapes,
+            sizes=parsed_args.sizes,
+            benchmark_names=parsed_args.benchmarks,
+            repeat=parsed_args.repeat,
+            seed=parsed_args.seed
+        ),
+    }
+    if parsed_args.update_baseline is True:
+        baseline = {'Results': dict()}
+        if os.path.exists(parsed_args.baseline) is True:
+            with open(parsed_args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline['Environment'] = report['Environment']
+        baseline['Configuration'] = report['Configuration']
+        baseline['Results'].update(report['Results'])
+        _write_json(path=parsed_args.baseline, data=baseline)
+        print('Baseline updated: {}'.format(parsed_args.baseline))
+        regressions = list()
+    elif len(parsed_args.baseline) == 0 or os.path.exists(parsed_args.baseline) is False:
+        print('No baseline to compare with')
+        regressions = list()
+    else:
+        with open(parsed_args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results=report['Results'], baseline_results=baseline['Results'], threshold=parsed_args.threshold, min_gated_size=parsed_args.min_gated_size)
+        # Timing noise seldom affects the same benchmark in consecutive runs, so suspected regressions are measured again
+        for _ in range(parsed_args.confirmation_runs):
+            if len(regressions) == 0:
+                break
+            for regression in regressions:
+                result = report['Results'][regression['Key']]
+                confirmation_result = run_benchmarks(
+                    shapes=[result['Shape'],],
+                    sizes=[result['TaskQty'],],
+                    benchmark_names=[result['Benchmark'],],
+                    repeat=parsed_args.repeat,
+                    seed=parsed_args.seed
+                )[regression['Key']]
+                if confirmation_result['Seconds'] < result['Seconds']:
+                    report['Results'][regression['Key']] = confirmation_result
+            regressions = find_regressions(results=report['Results'], baseline_results=baseline['Results'], threshold=parsed_args.threshold, min_gated_size=parsed_args.min_gated_size)
+    if parsed_args.output is not None:
+        report['Regressions'] = regressions
+        _write_json(path=parsed_args.output, data=report)
+
+    for regression in regressions:
+        print('REGRESSION {:<49} {:>12.6f} s (baseline {:.6f} s, x{:.2f})'.format(
+            regression['Key'],
+            regression['Seconds'],
+            regression['BaselineSeconds'],
+            regression['Ratio']
+        ))
+    if len(regressions) > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,31 @@
-from collections.abc import Sequence
+import asyncio
+import bisect
+from collections import deque
+from collections.abc import ItemsView, MutableMapping, Sequence, ValuesView
+import concurrent.futures
+import contextlib
+import contextvars
 import copy
+import csv
+import io
 import logging
+import math
+import multiprocessing
+import multiprocessing.util
+import os
+import pickle
+import queue
 import traceback
 import json
 import hashlib
+import http.server
 from datetime import datetime, timezone
 import re
+import socket
+import sqlite3
+import threading
+import time
+import uuid
 
 
 class LocalLogger:                                              # pragma: no cover
@@ -77,6 +97,498 @@ def produce_column_header_horizontal_line(with_checksums: bool=False, space_len:
     return '{}'.format(line_char)*final_len
 
 
+def produce_state_report(
+    task_states: list,
+    human_readable: bool=True,
+    with_checksums: bool=False,
+    current_resolved_specs: dict=None,
+    current_resource_checksums: dict=None,
+    space_len: int=2,
+    line_char: str='-'
+)->str:
+    """Produce a report of many `TaskState` instances in human readable column format, with the column headers.
+
+    Example:
+
+    ```python
+    print(produce_state_report(task_states=[task.state for task in list_of_tasks], with_checksums=True))
+    ```
+
+    Spec checksums are cached by each `TaskState`, so generating the report again only calculates the checksums of
+    specs that were changed in the mean time. For very large numbers of tasks, rather use `write_state_report()` to
+    write the report directly to a file.
+
+    Args:
+        task_states: An iterable of `TaskState` (or `Task`) instances
+        human_readable: Boolean (default=True). If set to True, values like booleans and nulls will be converted to more appropriate english descriptive terms
+        with_checksums: boolean (default=False) - If True. include checksum columns
+        current_resolved_specs: An optional dict with the current resolved spec for each `TaskState`, keyed by the `report_label`
+        current_resource_checksums: An optional dict with the current resource checksum for each `TaskState`, keyed by the `report_label`
+        space_len: int (default=2). The number of spaces between column boundaries
+        line_char: str (default='-'). The character to be used for the horizontal line below the column headers
+
+    Returns:
+        A string with the report
+    """
+    output = io.StringIO()
+    write_state_report(
+        task_states=task_states,
+        output=output,
+        output_format='columns',
+        human_readable=human_readable,
+        with_checksums=with_checksums,
+        current_resolved_specs=current_resolved_specs,
+        current_resource_checksums=current_resource_checksums,
+        space_len=space_len,
+        line_char=line_char
+    )
+    return output.getvalue().rstrip('\n')
+
+
+STATE_REPORT_FORMATS = ('columns', 'csv', 'ndjson',)
+
+
+def write_state_report(
+    task_states: object,
+    output: object,
+    output_format: str='columns',
+    human_readable: bool=True,
+    with_checksums: bool=False,
+    current_resolved_specs: dict=None,
+    current_resource_checksums: dict=None,
+    space_len: int=2,
+    line_char: str='-'
+)->int:
+    """Writes a state report of `TaskState` instances to a file like object, one line per `TaskState`.
+
+    The `task_states` are consumed one at a time and every line is written as soon as it is produced, so a generator can
+    be used to report on any number of tasks with bounded memory:
+
+    ```python
+    with open('drift-report.csv', 'w', newline='') as f:
+        write_state_report(task_states=(task.state for task in tasks_generator()), output=f, output_format='csv')
+    ```
+
+    The following formats are supported:
+
+    * `columns` - The human readable column format, with column headers (see `TaskState.column_str()`)
+    * `csv` - Comma separated values, with a header row containing the field names of `TaskState.to_dict()`
+    * `ndjson` - One JSON object per line, as produced by `TaskState.to_dict()`
+
+    Args:
+        task_states: An iterable of `TaskState` instances. Instances of `Task` are also accepted, in which case the `state` of each `Task` is reported.
+        output: A file like object (anything with a `write()` method accepting strings)
+        output_format: A string (default="columns") with the format. See `STATE_REPORT_FORMATS`
+        human_readable: Boolean (default=True). If set to True, values like booleans and nulls will be converted to more appropriate english descriptive terms
+        with_checksums: boolean (default=False) - If True. include checksums
+        current_resolved_specs: An optional dict with the current resolved spec for each `TaskState`, keyed by the `report_label`
+        current_resource_checksums: An optional dict with the current resource checksum for each `TaskState`, keyed by the `report_label`
+        space_len: int (default=2). The number of spaces between column boundaries (`columns` format only)
+        line_char: str (default='-'). The character to be used for the horizontal line below the column headers (`columns` format only)
+
+    Returns:
+        An integer with the number of `TaskState` instances written
+
+    Raises:
+        Exception: When the format is not supported
+    """
+    if output_format not in STATE_REPORT_FORMATS:
+        logger.error('Report format "{}" is not supported. Use one of: {}'.format(output_format, STATE_REPORT_FORMATS))
+        raise Exception('Unsupported report format')
+    if current_resolved_specs is None:
+        current_resolved_specs = dict()
+    if current_resource_checksums is None:
+        current_resource_checksums = dict()
+
+    csv_writer = None
+    if output_format == 'columns':
+        output.write('{}\n'.format(produce_column_headers(with_checksums=with_checksums, space_len=space_len)))
+        output.write('{}\n'.format(produce_column_header_horizontal_line(with_checksums=with_checksums, space_len=space_len, line_char=line_char)))
+    elif output_format == 'csv':
+        field_names = ['Label', 'IsCreated', 'CreatedTimestamp', 'SpecDrifted', 'ResourceDrifted',]
+        if with_checksums is True:
+            field_names += ['AppliedSpecChecksum', 'CurrentResolvedSpecChecksum', 'AppliedResourcesChecksum', 'CurrentResourceChecksum',]
+        csv_writer = csv.DictWriter(output, fieldnames=field_names, lineterminator='\n')
+        csv_writer.writeheader()
+
+    rows_written = 0
+    task_state: TaskState
+    for task_state in task_states:
+        if isinstance(task_state, Task) is True:
+            task_state = task_state.state
+        current_resolved_spec = current_resolved_specs.get(task_state.report_label)
+        current_resource_checksum = current_resource_checksums.get(task_state.report_label)
+        if output_format == 'columns':
+            output.write(
+                '{}\n'.format(
+                    task_state.column_str(
+                        human_readable=human_readable,
+                        current_resolved_spec=current_resolved_spec,
+                        current_resource_checksum=current_resource_checksum,
+                        with_checksums=with_checksums,
+                        space_len=space_len
+                    )
+                )
+            )
+        else:
+            data = task_state.to_dict(
+                human_readable=human_readable,
+                current_resolved_spec=current_resolved_spec,
+                current_resource_checksum=current_resource_checksum,
+                with_checksums=with_checksums
+            )
+            if csv_writer is not None:
+                csv_writer.writerow(data)
+            else:
+                output.write('{}\n'.format(json.dumps(data, default=str)))
+        rows_written += 1
+    return rows_written
+
+
+class ChecksumEngine:
+    """Calculates checksums of (nested) data structures, like `Task` specs and metadata.
+
+    By default, a canonical checksum is calculated. It does not depend on the insertion order of dict keys and values
+    are encoded with their type, so that for example the integer `1` and the string `"1"` yield different checksums.
+    Lists and tuples are both treated as sequences, since tuples do not survive a round trip through most forms of
+    persistence. Values of any other type are encoded by their type name and string representation.
+
+    Nested structures are hashed incrementally: every dict, list or set is reduced to a digest which is fed into the
+    digest of its parent. A `memo` dict may be supplied to `digest()` and `hexdigest()` to reuse the digests of nested
+    objects across calls. Objects are memoized by identity, so a memo must only be reused while the objects hashed with
+    it are not modified.
+
+    The following algorithms are supported:
+
+    * `blake2b` (default) - Canonical checksum using BLAKE2b with a 32 byte digest, which is faster than SHA256 on 64-bit platforms
+    * `sha256` - Canonical checksum for environments where only SHA2 algorithms are permitted
+    * `sha256-json` - SHA256 of the JSON encoding of the data, as calculated before this class was introduced. These
+      checksums depend on the insertion order of dict keys. The `memo` is not used.
+
+    NOTE: Checksums persisted before this class was introduced were calculated with `sha256-json`. Use `matches()` to
+    compare a persisted checksum with data: it also accepts the `sha256-json` checksum, so that existing state remains
+    valid. State written afterwards holds the checksum of the engine in use.
+
+    All checksums calculated in this module uses the module wide instance, which can be replaced with
+    `override_checksum_engine()`.
+
+    Attributes:
+        algorithm: A string with the name of the hashing algorithm
+    """
+
+    SUPPORTED_ALGORITHMS = ('sha256-json', 'blake2b', 'sha256',)
+
+    def __init__(self, algorithm: str='blake2b'):
+        """Initializes the engine
+
+        Args:
+            algorithm: A string (default="blake2b") with the hashing algorithm. See `SUPPORTED_ALGORITHMS`
+
+        Raises:
+            Exception: When the algorithm is not supported
+        """
+        if algorithm not in self.SUPPORTED_ALGORITHMS:
+            logger.error('Checksum algorithm "{}" is not supported. Use one of: {}'.format(algorithm, self.SUPPORTED_ALGORITHMS))
+            raise Exception('Unsupported checksum algorithm')
+        self.algorithm = algorithm
+
+    def _new_hasher(self):
+        if self.algorithm == 'blake2b':
+            return hashlib.blake2b(digest_size=32)
+        return hashlib.sha256()
+
+    def digest(self, data: object, memo: dict=None)->bytes:
+        """Calculates the checksum of the data
+
+        Args:
+            data: The data, typically a dict
+            memo: An optional dict in which the digests of nested objects are remembered
+
+        Returns:
+            The 32 byte digest
+        """
+        if self.algorithm == 'sha256-json':
+            return hashlib.sha256(json.dumps(data, default=str).encode('utf-8')).digest()
+        if memo is None:
+            memo = dict()
+        return self._digest_container(data=data, memo=memo)
+
+    def hexdigest(self, data: object, memo: dict=None)->str:
+        """Calculates the checksum of the data
+
+        Args:
+            data: The data, typically a dict
+            memo: An optional dict in which the digests of nested objects are remembered
+
+        Returns:
+            A string with the hex encoded digest
+        """
+        return self.digest(data=data, memo=memo).hex()
+
+    def matches(self, checksum: str, data: object, memo: dict=None)->bool:
+        """Determines if a (persisted) checksum is the checksum of the data
+
+        Args:
+            checksum: A string with a hex encoded checksum
+            data: The data, typically a dict
+            memo: An optional dict in which the digests of nested objects are remembered
+
+        Returns:
+            True if the checksum was calculated from the data, either with this engine or with the `sha256-json`
+            algorithm that was used before this class was introduced
+        """
+        if checksum is None:
+            return False
+        if checksum == self.hexdigest(data=data, memo=memo):
+            return True
+        if self.algorithm == 'sha256-json':
+            return False
+        return checksum == _legacy_checksum_engine.hexdigest(data=data)
+
+    def _digest_container(self, data: object, memo: dict)->bytes:
+        if id(data) in memo:
+            return memo[id(data)][1]
+        hasher = self._new_hasher()
+        if isinstance(data, dict) is True:
+            hasher.update(b'M%d:' % len(data))
+            encoded_items = [(self._encode(key, memo), self._encode(value, memo),) for key, value in data.items()]
+            # Keys are unique, so the encoded values never need to be compared
+            encoded_items.sort()
+            hasher.update(b''.join([encoded_key + encoded_value for encoded_key, encoded_value in encoded_items]))
+        elif isinstance(data, (list, tuple,)) is True:
+            hasher.update(b'L%d:' % len(data))
+            hasher.update(b''.join([self._encode(value, memo) for value in data]))
+        elif isinstance(data, (set, frozenset,)) is True:
+            hasher.update(b'E%d:' % len(data))
+            for encoded_value in sorted(self._encode(value=value, memo=memo) for value in data):
+                hasher.update(encoded_value)
+        else:
+            hasher.update(self._encode(value=data, memo=memo))
+            return hasher.digest()
+        digest = hasher.digest()
+        # The object is retained in the memo, so that its identity can not be reused by another object
+        memo[id(data)] = (data, digest,)
+        return digest
+
+    def _encode(self, value: object, memo: dict)->bytes:
+        value_type = type(value)
+        # Fast path for the most common types in specs
+        if value_type is str:
+            encoded_value = value.encode('utf-8')
+            return b'S%d:%s' % (len(encoded_value), encoded_value,)
+        if value_type is int:
+            return b'I%d;' % value
+        if value is None:
+            return b'N'
+        if value is True:
+            return b'T'
+        if value is False:
+            return b'F'
+        if isinstance(value, str) is True:
+            encoded_value = value.encode('utf-8')
+            return b'S%d:%s' % (len(encoded_value), encoded_value,)
+        if isinstance(value, int) is True:
+            return b'I%d;' % value
+        if isinstance(value, float) is True:
+            return b'D%s;' % repr(value).encode('utf-8')
+        if isinstance(value, bytes) is True:
+            return b'B%d:%s' % (len(value), value,)
+        if isinstance(value, (dict, list, tuple, set, frozenset,)) is True:
+            return b'H%s' % self._digest_container(data=value, memo=memo)
+        encoded_value = '{}:{}'.format(type(value).__name__, value).encode('utf-8')
+        return b'O%d:%s' % (len(encoded_value), encoded_value,)
+
+
+checksum_engine = ChecksumEngine()
+# Calculates the checksums persisted before the ChecksumEngine was introduced, which are still accepted by matches()
+_legacy_checksum_engine = ChecksumEngine(algorithm='sha256-json')
+# Blobs must never be shared by dicts with different content, which requires the typed canonical encoding
+_blob_checksum_engine = ChecksumEngine(algorithm='blake2b')
+
+
+def override_checksum_engine(engine: ChecksumEngine):
+    """Replaces the `ChecksumEngine` used for all checksums calculated in this module
+
+    Args:
+        engine: An instance of `ChecksumEngine`, for example `ChecksumEngine(algorithm='sha256')`
+    """
+    global checksum_engine
+    checksum_engine = engine
+
+
+def _refuse_change(self, *args, **kwargs):
+    raise Exception('{} is read only - use copy.deepcopy() to obtain a modifiable copy'.format(type(self).__name__))
+
+
+class _ReadOnlyDict(dict):
+    # A dict that refuses all changes. It is still a dict, so it can be serialized (for example with json.dumps()) like
+    # any other dict. Copies are ordinary modifiable dicts and lists.
+
+    __setitem__ = _refuse_change
+    __delitem__ = _refuse_change
+    __ior__ = _refuse_change
+    clear = _refuse_change
+    pop = _refuse_change
+    popitem = _refuse_change
+    setdefault = _refuse_change
+    update = _refuse_change
+
+    def copy(self)->dict:
+        return copy.deepcopy(self)
+
+    def __copy__(self)->dict:
+        return copy.deepcopy(self)
+
+    def __deepcopy__(self, memo)->dict:
+        new_dict = dict()
+        memo[id(self)] = new_dict
+        for key, value in self.items():
+            new_dict[key] = copy.deepcopy(value, memo)
+        return new_dict
+
+    def __reduce__(self):
+        return (_ReadOnlyDict, (dict(self.items()),),)
+
+
+class _ReadOnlyList(list):
+    # A list that refuses all changes, with the same copy and serialization behavior as _ReadOnlyDict
+
+    __setitem__ = _refuse_change
+    __delitem__ = _refuse_change
+    __iadd__ = _refuse_change
+    __imul__ = _refuse_change
+    append = _refuse_change
+    clear = _refuse_change
+    extend = _refuse_change
+    insert = _refuse_change
+    pop = _refuse_change
+    remove = _refuse_change
+    reverse = _refuse_change
+    sort = _refuse_change
+
+    def copy(self)->list:
+        return copy.deepcopy(self)
+
+    def __copy__(self)->list:
+        return copy.deepcopy(self)
+
+    def __deepcopy__(self, memo)->list:
+        new_list = list()
+        memo[id(self)] = new_list
+        for value in self:
+            new_list.append(copy.deepcopy(value, memo))
+        return new_list
+
+    def __reduce__(self):
+        return (_ReadOnlyList, (list(self),),)
+
+
+def _make_read_only(data: object)->object:
+    # Returns a read only copy of nested dicts and lists. Values of other types are shared, as specs and metadata
+    # normally only contain immutable scalar values.
+    if isinstance(data, (_ReadOnlyDict, _ReadOnlyList,)) is True:
+        return data
+    if isinstance(data, dict) is True:
+        return _ReadOnlyDict((key, _make_read_only(data=value),) for key, value in data.items())
+    if isinstance(data, list) is True:
+        return _ReadOnlyList(_make_read_only(data=value) for value in data)
+    return data
+
+
+class SpecBlobStore:
+    """A content addressed store for spec and metadata dicts that can be shared by many `TaskState` instances.
+
+    Each distinct dict is stored only once and is referenced by a 32 byte digest of its content. The digest is always
+    calculated with the canonical `blake2b` algorithm of `ChecksumEngine`, regardless of the module wide engine, so
+    that for example the integer `1` and the string `"1"` never share a blob. Dicts that still yield the same digest
+    without being equal (for example with a tuple in one and a list in the other) are stored under a derived digest.
+    When many tasks (or the same task in many contexts) carry identical specs, the `TaskState` instances only hold the
+    digests:
+
+    ```python
+    spec_blob_store = SpecBlobStore()
+    task_state = TaskState(manifest_spec={...}, report_label='some-task', spec_blob_store=spec_blob_store)
+    ```
+
+    `Tasks` holds the manifest spec and metadata of all its tasks in one store. Blobs are never removed, so the store
+    should only hold dicts that do not change with every workflow. Dicts are copied when they are added, and `get()`
+    returns the stored read only copy, which raises an `Exception` when changes are attempted. Use `copy.deepcopy()` to
+    obtain a modifiable copy.
+
+    The store is shared (not copied) when a deep copy is made of a `TaskState` referencing it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blobs = dict()
+
+    def put(self, data: dict)->bytes:
+        """Adds a dict to the store, if an identical dict is not already stored
+
+        Args:
+            data: The dict to add
+
+        Returns:
+            The 32 byte digest with which the dict can be retrieved
+        """
+        digest = _blob_checksum_engine.digest(data=data)
+        with self._lock:
+            while digest in self._blobs and self._blobs[digest] != data:
+                digest = hashlib.blake2b(digest, digest_size=32).digest()
+            if digest not in self._blobs:
+                self._blobs[digest] = _make_read_only(data=data)
+        return digest
+
+    def get(self, digest: bytes)->dict:
+        """Retrieves a previously added dict
+
+        Args:
+            digest: The digest returned by `put()`
+
+        Returns:
+            The read only dict
+
+        Raises:
+            Exception: When no dict with the digest is stored
+        """
+        if digest not in self._blobs:
+            logger.error('No blob with digest "{}" stored'.format(digest.hex()))
+            raise Exception('Blob not found')
+        return self._blobs[digest]
+
+    def __contains__(self, digest: bytes)->bool:
+        return digest in self._blobs
+
+    def __len__(self)->int:
+        return len(self._blobs)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self)->dict:
+        return {'_blobs': self._blobs}
+
+    def __setstate__(self, state: dict):
+        self._lock = threading.Lock()
+        self._blobs = state['_blobs']
+
+
+_SHA256_HEX_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _encode_checksum(checksum: str)->object:
+    # Hex encoded SHA256 checksums are held as 32 byte digests, which uses less than half the memory
+    if isinstance(checksum, str) is True and _SHA256_HEX_DIGEST_PATTERN.match(checksum) is not None:
+        return bytes.fromhex(checksum)
+    return checksum
+
+
+def _decode_checksum(checksum: object)->str:
+    if isinstance(checksum, bytes) is True:
+        return checksum.hex()
+    return checksum
+
+
 class TaskState:
     """A helper class to track state of various elements that may help to determine what kind of changes is required
     when executing task commands in a particular environment.
@@ -99,6 +611,21 @@ class TaskState:
     * Even through spec drift may be present, it does not necessarily mean changes are required for the resources. Each `TaskProcessor` may approach this differently when determining if changes should be applied.    
     * The exact changes required for resources might not be known until after changes were applied by the `TaskProcessor`.
 
+    ## Memory Use
+
+    A `TaskState` is held for every `Task` and is therefore kept compact: the class uses `__slots__`, hex encoded SHA256
+    checksums are held as 32 byte digests and the spec and metadata dicts are held by reference. When a `SpecBlobStore`
+    is supplied (`Tasks` does this for every `Task` it holds), the manifest spec and metadata dicts are held in the
+    shared store and the `TaskState` only holds their digests, so that identical dicts are stored only once. The
+    `raw_spec` and `raw_metadata` attributes then return the read only dicts from the store. The applied and resolved
+    specs change with every processed `Task` and are always held directly, so that the store does not grow with every
+    workflow. All attributes still return the same values (dicts and hex strings) as before.
+
+    The checksums of the applied and current resolved specs are calculated only once and are recalculated only after a
+    new spec is set, for example with `update_applied_spec()` or by passing a different `current_resolved_spec` to
+    `to_dict()`. Spec dicts must therefore not be modified in place - set a new dict instead. Use
+    `produce_state_report()` to report on many `TaskState` instances at once.
+
     Attributes:
         raw_spec: The current task raw spec, which may include dynamic variables which is not yet resolved.
         raw_metadata: The current task raw metadata dict
@@ -112,8 +639,24 @@ class TaskState:
         is_created: Boolean value to indicate if the spec is currently considered in a created/updated state
         applied_resources_checksum: A SHA256 checksum of the last known applied `applied_spec` dict.
         current_resource_checksum: A SHA256 string of the calculated deployed/created resource state after he previous applied spec. Future resource checksum calculation should yield the same result and any change in the calculated value typically translates to some drift detection.
+        spec_blob_store: The `SpecBlobStore` holding the manifest spec and metadata dicts, or `None` if the dicts are held directly
     """
 
+    __slots__ = (
+        '_raw_spec',
+        '_raw_metadata',
+        '_applied_spec',
+        '_current_resolved_spec',
+        '_applied_resources_checksum',
+        '_current_resource_checksum',
+        '_applied_spec_checksum',
+        '_current_resolved_spec_checksum',
+        'report_label',
+        'created_timestamp',
+        'is_created',
+        'spec_blob_store',
+    )
+
     def __init__(
         self,
         manifest_spec: dict=dict(),
@@ -123,7 +666,8 @@ class TaskState:
         report_label: str='',
         created_timestamp: int=0,
         applied_resources_checksum: str=None,
-        current_resource_checksum: str=None
+        current_resource_checksum: str=None,
+        spec_blob_store: SpecBlobStore=None
     ):
         """Initializes the instance with some optional initial attribute values.
 
@@ -136,7 +680,11 @@ class TaskState:
             created_timestamp: An integer with the Unix timestamp of when the resources were created. If resources were created, this value should be greater than 0
             applied_resources_checksum: A string with the SHA256 checksum after the initial resource creation process was completed
             current_resource_checksum: A string with the SHA256 checksum of the current state of running resources. A difference to the `applied_resources_checksum` could indicate some changes in the deployed resources that was not applied through task processing.
+            spec_blob_store: An optional `SpecBlobStore` in which the manifest spec and metadata dicts are held
         """
+        self.spec_blob_store = spec_blob_store
+        self._applied_spec = None
+        self._current_resolved_spec = None
         self.raw_spec = manifest_spec
         self.raw_metadata = manifest_metadata
         self.report_label = report_label
@@ -150,6 +698,102 @@ class TaskState:
         self.applied_resources_checksum = applied_resources_checksum
         self.current_resource_checksum = current_resource_checksum
 
+    def _store_dict(self, data: dict)->object:
+        if self.spec_blob_store is not None and isinstance(data, dict) is True:
+            return self.spec_blob_store.put(data)
+        return data
+
+    def _load_dict(self, data: object)->dict:
+        if isinstance(data, bytes) is True:
+            return self.spec_blob_store.get(data)
+        return data
+
+    def use_spec_blob_store(self, spec_blob_store: SpecBlobStore):
+        """Moves the manifest spec and metadata dicts into a `SpecBlobStore`, after which only their digests are held.
+
+        This is done by `Tasks` for the state of every `Task` it holds.
+
+        Args:
+            spec_blob_store: The `SpecBlobStore` to use
+        """
+        if spec_blob_store is self.spec_blob_store:
+            return
+        raw_spec = self.raw_spec
+        raw_metadata = self.raw_metadata
+        self.spec_blob_store = spec_blob_store
+        self._raw_spec = self._store_dict(raw_spec)
+        self._raw_metadata = self._store_dict(raw_metadata)
+
+    @property
+    def raw_spec(self)->dict:
+        return self._load_dict(self._raw_spec)
+
+    @raw_spec.setter
+    def raw_spec(self, value: dict):
+        self._raw_spec = self._store_dict(value)
+
+    @property
+    def raw_metadata(self)->dict:
+        return self._load_dict(self._raw_metadata)
+
+    @raw_metadata.setter
+    def raw_metadata(self, value: dict):
+        self._raw_metadata = self._store_dict(value)
+
+    @property
+    def applied_spec(self)->dict:
+        return self._applied_spec
+
+    @applied_spec.setter
+    def applied_spec(self, value: dict):
+        self._applied_spec = value
+        self._applied_spec_checksum = None
+
+    @property
+    def current_resolved_spec(self)->dict:
+        return self._current_resolved_spec
+
+    @current_resolved_spec.setter
+    def current_resolved_spec(self, value: dict):
+        self._current_resolved_spec = value
+        self._current_resolved_spec_checksum = None
+
+    @property
+    def applied_spec_checksum(self)->str:
+        """The checksum of the applied spec, or `None` if no spec was applied.
+
+        The checksum is calculated only once and is recalculated after the applied spec is set again.
+        """
+        if self._applied_spec_checksum is None and isinstance(self.applied_spec, dict) is True:
+            self._applied_spec_checksum = self.calculate_manifest_state_checksum(spec=self.applied_spec)
+        return self._applied_spec_checksum
+
+    @property
+    def current_resolved_spec_checksum(self)->str:
+        """The checksum of the current resolved spec, or `None` if there is no current resolved spec.
+
+        The checksum is calculated only once and is recalculated after the current resolved spec is set again.
+        """
+        if self._current_resolved_spec_checksum is None and isinstance(self.current_resolved_spec, dict) is True:
+            self._current_resolved_spec_checksum = self.calculate_manifest_state_checksum(spec=self.current_resolved_spec)
+        return self._current_resolved_spec_checksum
+
+    @property
+    def applied_resources_checksum(self)->str:
+        return _decode_checksum(self._applied_resources_checksum)
+
+    @applied_resources_checksum.setter
+    def applied_resources_checksum(self, value: str):
+        self._applied_resources_checksum = _encode_checksum(value)
+
+    @property
+    def current_resource_checksum(self)->str:
+        return _decode_checksum(self._current_resource_checksum)
+
+    @current_resource_checksum.setter
+    def current_resource_checksum(self, value: str):
+        self._current_resource_checksum = _encode_checksum(value)
+
     def update_applied_spec(self, new_applied_spec: dict, new_applied_resource_checksum: str, updated_timestamp: int):
         """Updates state variables after a resources were created/updated/deleted.
 
@@ -163,8 +807,8 @@ class TaskState:
         """
         self.applied_spec = copy.deepcopy(new_applied_spec)
         if new_applied_resource_checksum is not None:
-            self.applied_resources_checksum = copy.deepcopy(new_applied_resource_checksum)
-            self.current_resource_checksum = copy.deepcopy(new_applied_resource_checksum)
+            self.applied_resources_checksum = new_applied_resource_checksum
+            self.current_resource_checksum = new_applied_resource_checksum
         else:
             self.applied_resources_checksum = None
             self.current_resource_checksum = None
@@ -176,21 +820,40 @@ class TaskState:
                 self.is_created = True
 
     def calculate_manifest_state_checksum(self, spec: dict=dict(), metadata: dict=dict())->str:
-        """Helper class to calculate the SHA256 checksum of the provided
-        dictionaries
+        """Helper class to calculate the canonical checksum of the provided
+        dictionaries (see `ChecksumEngine`)
 
         Args:
             spec: A dictionary
             metadata: A dictionary
 
         Returns:
-            A string with the SHA256 checksum of the two provided dictionaries.
+            A string with the hex encoded checksum of the two provided dictionaries.
         """
         data = {
             'spec': spec,
             'metadata': metadata
         }
-        return hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+        return checksum_engine.hexdigest(data=data)
+
+    def applied_spec_checksum_matches(self, checksum: str)->bool:
+        """Determines if a persisted `AppliedSpecChecksum` is the checksum of the applied spec.
+
+        Checksums persisted before the `ChecksumEngine` was introduced are accepted as well (see
+        `ChecksumEngine.matches()`). The state persisted by the `TaskPostProcessingStateUpdateHook` afterwards holds the
+        checksum of the engine in use.
+
+        Args:
+            checksum: A string with the persisted checksum
+
+        Returns:
+            True if the checksum matches the applied spec
+        """
+        if isinstance(self.applied_spec, dict) is False:
+            return False
+        if checksum is not None and checksum == self.applied_spec_checksum:
+            return True
+        return checksum_engine.matches(checksum=checksum, data={'spec': self.applied_spec, 'metadata': dict()})
     
     def to_dict(
             self,
@@ -276,7 +939,7 @@ class TaskState:
             data['SpecDrifted'] = 'No'
         if self.is_created is True:
             if self.current_resolved_spec is not None and self.applied_spec is not None:
-                if self.calculate_manifest_state_checksum(spec=self.applied_spec) != self.calculate_manifest_state_checksum(spec=self.current_resolved_spec):
+                if self.applied_spec_checksum != self.current_resolved_spec_checksum:
                     data['SpecDrifted'] = True
                     if human_readable is True:
                         data['SpecDrifted'] = 'Yes'
@@ -318,11 +981,11 @@ class TaskState:
 
             if self.applied_spec is not None:
                 if isinstance(self.applied_spec, dict) is True and self.is_created is True:
-                    data['AppliedSpecChecksum'] = self.calculate_manifest_state_checksum(spec=self.applied_spec)
+                    data['AppliedSpecChecksum'] = self.applied_spec_checksum
 
             if self.current_resolved_spec is not None:
                 if isinstance(self.current_resolved_spec, dict) is True:
-                    data['CurrentResolvedSpecChecksum'] = self.calculate_manifest_state_checksum(spec=current_resolved_spec)
+                    data['CurrentResolvedSpecChecksum'] = self.current_resolved_spec_checksum
             
             if self.applied_resources_checksum is not None:
                 if isinstance(self.applied_resources_checksum, str) is True and self.is_created is True:
@@ -432,17 +1095,33 @@ class StatePersistence:
     This can be useful for the task processing steps to determine the exact actions to take. Updated state could then be
     persisted long term for future task processing runs.
 
+    ## Lazy Loading
+
+    By default, all persisted state is loaded up front by `load()`, and `get()` will reload all state when an identifier
+    is not found in the cache. For large amounts of state, the lazy mode can be enabled by setting `lazy` to True, in
+    which case:
+
+    * `load()` is not called on initialization, nor by the `WorkflowExecutor`
+    * `get()` only retrieves the requested identifier through `load_objects_state()` when it is not in the cache
+    * Identifiers that were not found are remembered, so they are not retrieved again until `update_object_state()` or `load()` is called for them
+    * `prefetch()` can be used to retrieve the state of many identifiers in one go. The `WorkflowExecutor` uses this to retrieve the state of all tasks to be processed.
+
+    A client implementation must implement `load_objects_state()` to support the lazy mode.
+
     Attributes:
         logger: An implementation of the `LoggerWrapper` class
         state_cache: A dict with the current state
         configuration: A dict holding configuration data, intended for use for client implementations of this class, for example DB credentials.
+        lazy: A boolean indicating if state is retrieved on demand
     """
 
-    def __init__(self, configuration: dict=dict(), load_on_init: bool=True):
+    def __init__(self, configuration: dict=dict(), load_on_init: bool=True, lazy: bool=False):
         self.logger = logger
         self.state_cache = dict()
         self.configuration = configuration
-        if load_on_init is True:
+        self.lazy = lazy
+        self._missing_object_identifiers = set()
+        if load_on_init is True and lazy is False:
             self.load()
 
     def load(self, on_failure: object=False)->bool:
@@ -489,11 +1168,49 @@ class StatePersistence:
         if object_identifier in self.state_cache:
             return copy.deepcopy(self.state_cache[object_identifier])
         elif refresh_cache_if_identifier_not_found is True:
-            self.load()
+            if self.lazy is True:
+                self.prefetch(object_identifiers=[object_identifier,])
+            else:
+                self.load()
             if object_identifier in self.state_cache:
                 return copy.deepcopy(self.state_cache[object_identifier])
         return dict()
 
+    def load_objects_state(self, object_identifiers: list)->dict:
+        """Retrieves the persisted state of specific identifiers, required for the lazy mode.
+
+        A client must implement this method with the logic to retrieve persisted data of the identifiers.
+
+        Args:
+            object_identifiers: A list of identifiers to retrieve
+
+        Returns:
+            A dict with the identifiers that were found as keys and their data as values.
+        """
+        logger.warning('StatePersistence.load_objects_state() NOT IMPLEMENTED. Override this function in your own class for lazy state loading.')
+        return dict()
+
+    def prefetch(self, object_identifiers: list):
+        """Retrieves the state of all identifiers not yet in the cache in one go.
+
+        Identifiers previously found to not exist will not be retrieved again.
+
+        Args:
+            object_identifiers: A list of identifiers to retrieve
+        """
+        object_identifiers_to_load = list()
+        for object_identifier in object_identifiers:
+            if object_identifier not in self.state_cache and object_identifier not in self._missing_object_identifiers:
+                object_identifiers_to_load.append(object_identifier)
+        if len(object_identifiers_to_load) == 0:
+            return
+        objects_state = self.load_objects_state(object_identifiers=object_identifiers_to_load)
+        for object_identifier in object_identifiers_to_load:
+            if object_identifier in objects_state:
+                self.state_cache[object_identifier] = objects_state[object_identifier]
+            else:
+                self._missing_object_identifiers.add(object_identifier)
+
     def update_object_state(self, object_identifier: str, data: dict):
         """Save a dict object with a given key
 
@@ -508,6 +1225,7 @@ class StatePersistence:
             data: A dict with the data. The client would typically convert this to a JSON string for saving.
         """
         self.state_cache[object_identifier] = copy.deepcopy(data)
+        self._missing_object_identifiers.discard(object_identifier)
 
     def commit(self):
         """Save all state in one go.
@@ -520,6 +1238,165 @@ class StatePersistence:
         """
         logger.warning('StatePersistence.commit() NOT IMPLEMENTED. Override this function in your own class for long term state storage.')
 
+    def flush(self):
+        """Ensures all outstanding state changes are persisted.
+
+        The `WorkflowExecutor` calls this method at the end of each workflow, and before a `Task` failure is handled.
+        Implementations that defer writes in `commit()` must override this method to write all outstanding changes.
+
+        The default action is to call `commit()`.
+        """
+        self.commit()
+
+
+class SqliteStatePersistence(StatePersistence):
+    """A `StatePersistence` implementation that stores state in a SQLite database.
+
+    The database is opened in WAL mode, which allows other connections (also from other processes) to read state while
+    a workflow is running. Each object identifier is stored in a separate row with the data as JSON, and only the
+    objects that changed since the last write are written, in a single transaction.
+
+    The following configuration is supported:
+
+    | Key               | Default         | Description                                                                                                   |
+    |-------------------|-----------------|---------------------------------------------------------------------------------------------------------------|
+    | `path`            | `:memory:`      | Path to the SQLite database file                                                                              |
+    | `table_name`      | `task_state`    | Name of the table holding the state                                                                           |
+    | `commit_interval` | `1`             | Write outstanding changes every N calls to `commit()`. With `0`, changes are only written by `flush()`        |
+    | `lazy`            | `False`         | Enables the lazy mode (see `StatePersistence`)                                                                |
+
+    By default, every call to `commit()` writes the outstanding changes. Batching writes is opt-in: since the
+    `TaskPostProcessingStateUpdateHook` calls `commit()` after each `Task`, a `commit_interval` greater than `1` defines
+    after how many processed tasks the changes are written. The `WorkflowExecutor` calls `flush()` at the end of the
+    workflow and before a `Task` failure is handled. Clients using batching outside of a `WorkflowExecutor` must call
+    `flush()` (or `close()`) themselves, or the outstanding changes are lost when the process exits.
+
+    Data is converted to JSON with `str()` as a fallback for values that can not be represented in JSON.
+
+    Attributes:
+        logger: An implementation of the `LoggerWrapper` class
+        state_cache: A dict with the current state
+        configuration: A dict holding configuration data
+        commit_interval: An integer with the number of `commit()` calls after which outstanding changes are written
+    """
+
+    def __init__(self, configuration: dict=dict(), load_on_init: bool=True):
+        self._lock = threading.RLock()
+        self._dirty_object_identifiers = set()
+        self._commit_request_qty = 0
+        self.commit_interval = int(configuration.get('commit_interval', 1))
+        if re.fullmatch(r'\w+', configuration.get('table_name', 'task_state')) is None:
+            raise Exception('Invalid table name "{}"'.format(configuration.get('table_name')))
+        self._table_name = configuration.get('table_name', 'task_state')
+        self._connection = sqlite3.connect(configuration.get('path', ':memory:'), check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS {} (object_identifier TEXT PRIMARY KEY NOT NULL, data TEXT NOT NULL)'.format(self._table_name)
+        )
+        self._connection.commit()
+        super().__init__(configuration=configuration, load_on_init=load_on_init, lazy=bool(configuration.get('lazy', False)))
+
+    def load(self, on_failure: object=False)->bool:
+        """Loads all persisted state into the local cache. Local changes not yet written are retained.
+
+        Args:
+            on_failure: An object to return (or Exception to be thrown) on failure to retrieve the persisted data.
+
+        Returns:
+            A boolean to state the success (True) or the value of `on_failure`, provided the type of `on_failure` is not 
+            an Exception.
+
+        Raises:
+            Exception: If retrieval of data failed and `on_failure` is of type `Exception`
+        """
+        try:
+            with self._lock:
+                self._missing_object_identifiers = set()
+                for object_identifier, data in self._connection.execute('SELECT object_identifier, data FROM {}'.format(self._table_name)):
+                    if object_identifier not in self._dirty_object_identifiers:
+                        self.state_cache[object_identifier] = json.loads(data)
+        except:
+            logger.error('Failed to load state: {}'.format(traceback.format_exc()))
+            if isinstance(on_failure, Exception):
+                raise on_failure
+            return on_failure
+        return True
+
+    def get(self, object_identifier: str, refresh_cache_if_identifier_not_found: bool=True)->dict:
+        """Retrieves state of a given identifier from the cache.
+
+        If the identifier is not found in the cache, only the row for the identifier is retrieved from the database.
+
+        Args:
+            object_identifier: The identifier of the data to retrieve.
+
+        Returns:
+            A dict with data is returned. If no data is found, the dict will be empty.
+        """
+        with self._lock:
+            if object_identifier not in self.state_cache and refresh_cache_if_identifier_not_found is True:
+                self.prefetch(object_identifiers=[object_identifier,])
+            if object_identifier in self.state_cache:
+                return copy.deepcopy(self.state_cache[object_identifier])
+        return dict()
+
+    def load_objects_state(self, object_identifiers: list)->dict:
+        objects_state = dict()
+        with self._lock:
+            # Stay well below the SQLite limit of host parameters per statement
+            for chunk_start in range(0, len(object_identifiers), 500):
+                chunk = object_identifiers[chunk_start:chunk_start+500]
+                rows = self._connection.execute(
+                    'SELECT object_identifier, data FROM {} WHERE object_identifier IN ({})'.format(self._table_name, ','.join('?'*len(chunk))),
+                    chunk
+                )
+                for object_identifier, data in rows:
+                    objects_state[object_identifier] = json.loads(data)
+        return objects_state
+
+    def prefetch(self, object_identifiers: list):
+        with self._lock:
+            super().prefetch(object_identifiers=object_identifiers)
+
+    def update_object_state(self, object_identifier: str, data: dict):
+        with self._lock:
+            super().update_object_state(object_identifier=object_identifier, data=data)
+            self._dirty_object_identifiers.add(object_identifier)
+
+    def commit(self):
+        """Writes the outstanding changes to the database, depending on the configured `commit_interval`
+        """
+        with self._lock:
+            self._commit_request_qty += 1
+            if self.commit_interval > 0 and self._commit_request_qty >= self.commit_interval:
+                self.flush()
+
+    def flush(self):
+        """Writes all outstanding changes to the database in a single transaction
+        """
+        with self._lock:
+            self._commit_request_qty = 0
+            if len(self._dirty_object_identifiers) == 0:
+                return
+            rows = list()
+            for object_identifier in self._dirty_object_identifiers:
+                rows.append((object_identifier, json.dumps(self.state_cache[object_identifier], default=str),))
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT INTO {} (object_identifier, data) VALUES (?, ?) ON CONFLICT(object_identifier) DO UPDATE SET data = excluded.data'.format(self._table_name),
+                    rows
+                )
+            logger.info('Persisted state of {} objects'.format(len(rows)))
+            self._dirty_object_identifiers = set()
+
+    def close(self):
+        """Writes all outstanding changes and closes the database connection
+        """
+        with self._lock:
+            self.flush()
+            self._connection.close()
+
 
 class ParameterValidation:
     """A base class that can be extended to validate parameters
@@ -671,15 +1548,243 @@ class TaskProcessingActionParameterValidation(ParameterValidation):
         return True
 
 
-class VariableStore:
+_IMMUTABLE_SCALAR_TYPES = (str, int, float, bool, bytes, complex, type(None), datetime,)
 
-    def __init__(self) -> None:
-        self.variable_store = dict()
 
-    def add_variable(self, variable_name: str, value: object):
-        self.variable_store[variable_name] = copy.deepcopy(value)
-        return self
-    
+def _is_immutable_value(value: object)->bool:
+    if isinstance(value, _IMMUTABLE_SCALAR_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset,)):
+        for item in value:
+            if _is_immutable_value(value=item) is False:
+                return False
+        return True
+    return False
+
+
+class CopyOnWriteDict(dict):
+    """A dict that can be deep copied cheaply.
+
+    A deep copy is a shallow copy of the dict, of which the values are shared with the original. A mutable value is
+    only deep copied when it is read for the first time after a copy. The result is that each copy behaves exactly like
+    an independent deep copy of the original dict, while the cost of deep copying values is only paid for the values
+    that are actually read.
+
+    Values that were handed out by reference, by reading or assigning them, may still be changed by the client that
+    holds the reference. When a copy of the dict is made, each of those values is deep copied once into a snapshot that
+    is shared by both dicts, so that neither of them is affected by such changes. References handed out before the copy
+    was made are therefore no longer part of either dict. Values that were not handed out are never copied when the
+    dict is copied, so that a copy only costs a shallow copy of the dict plus one deep copy per value handed out since
+    the previous copy.
+
+    Being a `dict`, the instance can be used wherever a `dict` is expected, for example with `json.dumps()`, `dict()`
+    or `{**data}`. All of these read the values through `__getitem__()`, so that only copies of shared values are
+    handed out.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, data: dict=None):
+        super().__init__()
+        # A plain dict with the same content, since CPython can only copy the storage of a plain dict quickly
+        self._values = dict()
+        # Keys of the values that are not shared with any copy and may therefore be changed in place
+        self._owned = set()
+        # Keys of the owned values that were handed out by reference
+        self._exposed = set()
+        if data is not None:
+            for key, value in data.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if _is_immutable_value(value=value) is True:
+            return value
+        if key not in self._owned:
+            value = copy.deepcopy(value)
+            dict.__setitem__(self, key, value)
+            self._values[key] = value
+            self._owned.add(key)
+        self._exposed.add(key)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._values[key] = value
+        self._owned.add(key)
+        self._exposed.add(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        del self._values[key]
+        self._owned.discard(key)
+        self._exposed.discard(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if len(args) > 0:
+            return args[0]
+        raise KeyError(key)
+
+    def popitem(self)->tuple:
+        if len(self) == 0:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        MutableMapping.update(self, *args, **kwargs)
+
+    def clear(self):
+        dict.clear(self)
+        self._values = dict()
+        self._owned = set()
+        self._exposed = set()
+
+    def __iter__(self):
+        # Any override of __iter__ prevents CPython from merging this dict into another dict (for example with dict()
+        # or {**data}) by reading its storage directly, which would hand out the shared values
+        return dict.__iter__(self)
+
+    def __or__(self, other):
+        if isinstance(other, dict) is False:
+            return NotImplemented
+        new_dict = dict(self)
+        new_dict.update(other)
+        return new_dict
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def copy(self):
+        return self.__deepcopy__(memo=dict())
+
+    def __copy__(self):
+        return self.__deepcopy__(memo=dict())
+
+    def __deepcopy__(self, memo):
+        new_dict = CopyOnWriteDict()
+        memo[id(self)] = new_dict
+        for key in self._exposed:
+            # The snapshot replaces the value handed out, so that the value is not copied again by the next copy
+            value = copy.deepcopy(self._values[key], memo)
+            dict.__setitem__(self, key, value)
+            self._values[key] = value
+        # Unlike copy(), update() compacts a dict from which items were deleted, which keeps later copies fast
+        dict.update(new_dict._values, self._values)
+        dict.update(new_dict, new_dict._values)
+        # All values are now reachable from both dicts, so neither of them may change those values in place
+        self._owned = set()
+        self._exposed = set()
+        return new_dict
+
+    def __reduce__(self):
+        return (CopyOnWriteDict, (dict(self.items()),),)
+
+    def get_shared_value(self, key)->object:
+        """Returns the stored value without copying it. The returned value must be treated as read only.
+
+        Args:
+            key: The key of the value to retrieve
+
+        Returns:
+            The value as stored
+
+        Raises:
+            KeyError: When the key does not exist
+        """
+        return dict.__getitem__(self, key)
+
+    def set_shared_value(self, key, value: object):
+        """Stores a value without taking ownership of it. The value will be copied when it is read for the first time,
+        which makes it safe to store a value that is also referenced elsewhere, as long as it is not mutated.
+
+        Args:
+            key: The key of the value to set
+            value: The value to store
+        """
+        dict.__setitem__(self, key, value)
+        self._values[key] = value
+        self._owned.discard(key)
+        self._exposed.discard(key)
+
+    def set_owned_value(self, key, value: object):
+        """Stores a value that is not referenced anywhere else, for example a fresh copy. Unlike assigning the value,
+        this allows copies of the dict to share the value until it is read.
+
+        Args:
+            key: The key of the value to set
+            value: The value to store
+        """
+        dict.__setitem__(self, key, value)
+        self._values[key] = value
+        self._owned.add(key)
+        self._exposed.discard(key)
+
+
+class VariableStore:
+    """Holds variables shared between tasks and hooks during processing.
+
+    The variables are held in a `CopyOnWriteDict`, which means that a deep copy of a `VariableStore` only copies the
+    values of the variables when they are read. The `variable_store` attribute is a `dict`, and setting it to a plain
+    dict is also supported.
+
+    Attributes:
+        variable_store: A `CopyOnWriteDict` with the variables
+    """
+
+    def __init__(self) -> None:
+        self.variable_store = CopyOnWriteDict()
+
+    @property
+    def variable_store(self)->CopyOnWriteDict:
+        return self._variable_store
+
+    @variable_store.setter
+    def variable_store(self, value: dict):
+        if isinstance(value, CopyOnWriteDict) is False:
+            value = CopyOnWriteDict(data=value)
+        self._variable_store = value
+
+    def add_variable(self, variable_name: str, value: object, copy_value: bool=True):
+        """Adds or replaces a variable
+
+        Args:
+            variable_name: The name of the variable
+            value: The value of the variable
+            copy_value: When True (default), a deep copy of the value is stored. When False, the value itself is stored and only copied when it is read, in which case the caller must not mutate the value afterwards.
+
+        Returns:
+            The `VariableStore` itself
+        """
+        if copy_value is True:
+            self.variable_store.set_owned_value(variable_name, copy.deepcopy(value))
+        else:
+            self.variable_store.set_shared_value(variable_name, value)
+        return self
+    
     def get_variable(self, variable_name: str, pop_item: bool=False)->object:
         result = None
         if variable_name not in self.variable_store:
@@ -687,9 +1792,166 @@ class VariableStore:
         if pop_item is True:
             result = self.variable_store.pop(variable_name)
         else:
-            result = copy.deepcopy(self.variable_store[variable_name])
+            result = copy.deepcopy(self.variable_store.get_shared_value(variable_name))
         return result
 
+    def resolve_variable(self, task_id: str, variable_name: str, command: str, context: str, default: object='')->object:
+        """Resolves a variable that may be bound to a specific command and/or context.
+
+        Variables are looked up by their exact name, in the following order of precedence:
+
+        | Order | Variable Name                           | Binding                      |
+        |:-----:|-----------------------------------------|------------------------------|
+        |   1   | `task_id:command:context:variable_name` | Bound to command and context |
+        |   2   | `task_id:command::variable_name`        | Bound to command only        |
+        |   3   | `task_id::context:variable_name`        | Bound to context only        |
+        |   4   | `task_id:variable_name`                 | Not bound                    |
+
+        Args:
+            task_id: The task identifier that is the first part of the variable name
+            variable_name: The remainder of the variable name, for example `SubKey1:SubKey2`
+            command: The command being processed
+            context: The context being processed
+            default: The value to return when no variable could be found
+
+        Returns:
+            A copy of the value of the first matching variable, or the default value.
+        """
+        for candidate_variable_name in (
+            '{}:{}:{}:{}'.format(task_id, command, context, variable_name),
+            '{}:{}::{}'.format(task_id, command, variable_name),
+            '{}::{}:{}'.format(task_id, context, variable_name),
+            '{}:{}'.format(task_id, variable_name),
+        ):
+            if candidate_variable_name in self.variable_store:
+                return copy.deepcopy(self.variable_store.get_shared_value(candidate_variable_name))
+        return default
+
+
+def _is_json_safe_value(value: object)->bool:
+    if value is None or type(value) in (str, bool, int,):
+        return True
+    if type(value) is float:
+        return math.isfinite(value)
+    if type(value) is list:
+        for item in value:
+            if _is_json_safe_value(value=item) is False:
+                return False
+        return True
+    if isinstance(value, dict) is True:
+        for key, item in value.items():
+            if isinstance(key, str) is False or _is_json_safe_value(value=item) is False:
+                return False
+        return True
+    return False
+
+
+def _parse_variable_placeholder(raw_key: str)->tuple:
+    # ${VAR:MyId:SubKey1:SubKey2} -> ('MyId', 'SubKey1:SubKey2')
+    key_parts = raw_key.split(':')
+    return key_parts[1], ':'.join(key_parts[2:]).replace('}', '')
+
+
+class SpecTemplate:
+    """A pre-parsed `Task.spec` that can be rendered with resolved variable values in an efficient way.
+
+    When the template is created, a private copy of the spec is made and the locations of all variable placeholders,
+    like `${VAR:MyId:SubKey1:SubKey2}`, are recorded. Rendering will only rebuild the parts of the spec along the paths to
+    the recorded placeholders, while all other parts of the spec are shared between the template and the rendered
+    result. A spec without any placeholders is therefore returned as is.
+
+    Iterables in the spec, other than strings and dicts, will be converted to lists, as has always been the case with
+    variable resolution.
+
+    NOTE: The rendered spec shares data with the template and must be treated as read only. Use `copy.deepcopy()` on the
+    rendered spec if it needs to be modified.
+
+    Attributes:
+        spec: The private copy of the spec
+        placeholder_qty: An integer with the number of placeholders found in the spec
+        placeholder_names: A set with the distinct placeholders found in the spec, for example `${VAR:MyId:SubKey1}`
+    """
+
+    PLACEHOLDER_PATTERN = re.compile(r'(\$\{VAR:[\w|\-|\s|:|.|;|_]+\})')
+
+    def __init__(self, spec: object):
+        self.placeholder_qty = 0
+        self.placeholder_names = set()
+        self.spec, self._placeholders = self._compile(data=spec)
+
+    def _compile(self, data: object)->tuple:
+        if isinstance(data, str) is True:
+            spans = list()
+            for match in self.PLACEHOLDER_PATTERN.finditer(data):
+                spans.append((match.start(), match.end(), match.group(0),))
+                self.placeholder_names.add(match.group(0))
+            self.placeholder_qty += len(spans)
+            if len(spans) > 0:
+                return data, spans
+            return data, None
+        if isinstance(data, dict) is True:
+            compiled_data = dict()
+            placeholders = dict()
+            for key, val in data.items():
+                compiled_data[key], child_placeholders = self._compile(data=val)
+                if child_placeholders is not None:
+                    placeholders[key] = child_placeholders
+        elif data is not None and hasattr(data, '__iter__') is True:
+            compiled_data = list()
+            placeholders = dict()
+            for val in data:
+                compiled_val, child_placeholders = self._compile(data=val)
+                if child_placeholders is not None:
+                    placeholders[len(compiled_data)] = child_placeholders
+                compiled_data.append(compiled_val)
+        else:
+            return copy.deepcopy(data), None
+        if len(placeholders) > 0:
+            return compiled_data, placeholders
+        return compiled_data, None
+
+    def _render(self, data: object, placeholders: object, resolved_values: dict, resolve_placeholder: object)->object:
+        if isinstance(placeholders, list) is True:
+            parts = list()
+            position = 0
+            for start, end, raw_key in placeholders:
+                if raw_key not in resolved_values:
+                    resolved_values[raw_key] = resolve_placeholder(raw_key)
+                parts.append(data[position:start])
+                parts.append(resolved_values[raw_key])
+                position = end
+            parts.append(data[position:])
+            return ''.join(parts)
+        if isinstance(data, dict) is True:
+            rendered_data = dict(data)
+        else:
+            rendered_data = list(data)
+        for key, child_placeholders in placeholders.items():
+            rendered_data[key] = self._render(
+                data=data[key],
+                placeholders=child_placeholders,
+                resolved_values=resolved_values,
+                resolve_placeholder=resolve_placeholder
+            )
+        return rendered_data
+
+    def render(self, resolve_placeholder: object)->object:
+        """Renders the spec with the placeholders replaced by their values.
+
+        Args:
+            resolve_placeholder: A callable that accepts the placeholder string (for example `${VAR:MyId:SubKey1}`) and returns the string value to substitute. Each distinct placeholder is only resolved once per render.
+
+        Returns:
+            The rendered spec, which must be treated as read only.
+        """
+        if self._placeholders is None:
+            return self.spec
+        return self._render(data=self.spec, placeholders=self._placeholders, resolved_values=dict(), resolve_placeholder=resolve_placeholder)
+
+    def __deepcopy__(self, memo):
+        # A template is never modified after it was created
+        return self
+
 
 class Task:
     """A `Task` defines some work to be done according to supplied `spec` values.
@@ -775,6 +2037,13 @@ class Task:
     is assumed to be able to handle a rollback operation, but this should not be assumed - check the implementation on
     a case-by0case basis for each type of `TaskProcessor` implementation.
 
+    ## Read Only Tasks
+
+    Once a `Task` is added to `Tasks`, the copy held by `Tasks` is frozen and references to this copy is handed out
+    without copying. Assigning any attribute of a frozen `Task`, or changing any part of its `metadata` or `spec`, will
+    raise an `Exception`. Use `clone()` (or `copy.deepcopy()`) to obtain a modifiable copy. Copies of the read only
+    `metadata` and `spec` dicts are ordinary dicts again.
+
     Attributes:
         api_version: A string defining the target `TaskProcessor` that must process this task.
         kind: A descriptor of the kind of task, that a `TaskProcessor` can use to make further decisions as to how to process the `Task`
@@ -793,9 +2062,11 @@ class Task:
             spec: A dict with fields required by the `TaskProcessor` to successfully process the task.
             task_state_class: A `TaskState` class (not instantiated) that will use by default `TaskState` class for state
         """
+        self._frozen = False
         self.api_version = api_version
         self.kind = kind
         self.metadata = self._validate_dict(input_object=metadata)
+        self._spec_template = None
         self.spec = self._validate_dict(input_object=spec)
         self.task_id = self._create_task_id(metadata=metadata)
         self.state = task_state_class(
@@ -804,11 +2075,81 @@ class Task:
             report_label=self.task_id
         )
 
+    def __setattr__(self, name: str, value: object):
+        if getattr(self, '_frozen', False) is True:
+            raise Exception('Task "{}" is read only - use clone() to obtain a modifiable copy'.format(self.task_id))
+        super().__setattr__(name, value)
+
+    def __deepcopy__(self, memo):
+        cloned_task = self.__class__.__new__(self.__class__)
+        memo[id(self)] = cloned_task
+        for name, value in self.__dict__.items():
+            object.__setattr__(cloned_task, name, copy.deepcopy(value, memo))
+        object.__setattr__(cloned_task, '_frozen', False)
+        return cloned_task
+
+    def clone(self, state_only: bool=False):
+        """Creates a modifiable copy of the `Task`
+
+        Args:
+            state_only: A boolean (default=False). When `True` and the `Task` is frozen, only the `state` is copied
+                and the copy shares the read only `metadata` and `spec` of this `Task`, which is much cheaper than a
+                deep copy. A deep copy is always made of a `Task` that is not frozen.
+
+        Returns:
+            A copy of the `Task`, which is never frozen.
+        """
+        if state_only is False or self._frozen is False:
+            return copy.deepcopy(self)
+        cloned_task = self.__class__.__new__(self.__class__)
+        cloned_task.__dict__.update(self.__dict__)
+        object.__setattr__(cloned_task, '_frozen', False)
+        cloned_task.state = copy.deepcopy(self.state)
+        return cloned_task
+
+    def freeze(self):
+        """Makes the `Task` read only. This is done by `Tasks` for the copy of each `Task` it holds.
+
+        The `metadata` and `spec` are replaced with read only copies, of which all nested dicts and lists will also
+        raise an `Exception` when changes are attempted.
+
+        Returns:
+            A copy of self
+        """
+        object.__setattr__(self, 'metadata', _make_read_only(data=self.metadata))
+        object.__setattr__(self, '_spec', _make_read_only(data=self._spec))
+        object.__setattr__(self, '_frozen', True)
+        return self
+
+    @property
+    def spec(self)->dict:
+        return self._spec
+
+    @spec.setter
+    def spec(self, value: dict):
+        self._spec = value
+        self._spec_template = None
+
+    def get_spec_template(self)->SpecTemplate:
+        """Returns the `SpecTemplate` for the `spec` of this `Task`, which is only created once.
+
+        The template is discarded when a new `spec` is assigned. However, changes made directly to the content of the
+        `spec` dict after the template was created will not be detected.
+
+        Returns:
+            An instance of `SpecTemplate`
+        """
+        if self._spec_template is None:
+            # The template is only a cache, so it may be set on a frozen Task
+            object.__setattr__(self, '_spec_template', SpecTemplate(spec=self._spec))
+        return self._spec_template
+
     def _create_task_id(self, metadata: dict)->str:
         if metadata is not None:
             if isinstance(metadata, dict):
                 if 'name' in metadata:
                     return metadata['name']
+        # Independent of the checksum engine, so that the names of unnamed tasks never change
         return hashlib.sha256(json.dumps(self.spec, default=str).encode('utf-8')).hexdigest()[0:16]
 
     def _validate_dict(self, input_object: dict=dict()):
@@ -840,16 +2181,33 @@ class Tasks(Sequence):
     Once tasks are added, the `Tasks` instance can be treated as a list:
 
     * `len(tasks)` will give the number of tasks
-    * `for task in tasks` will loop through each task as an instance of `Task`, which will be a true copy of the actual `Task` instance
+    * `for task in tasks` will loop through each task as an instance of `Task`, sorted by task name
+
+    A copy of each `Task` is made when it is added, after which the copy is frozen (see `Task`). All methods returning a
+    `Task` return a reference to this read only copy. Use `Task.clone()` to obtain a modifiable copy.
+
+    The spec and metadata dicts in the `TaskState` of every `Task` are held in a shared `SpecBlobStore`, so that
+    identical dicts are stored only once.
 
     Attributes:
         tasks: A dictionary containing the collection of `Task` instances
+        task_dependency_graphs: A dictionary caching the dependency graph per command and context combination
+        spec_blob_store: The `SpecBlobStore` holding the state dicts of all tasks
     """
 
     def __init__(self):
         """Initializes `Tasks`
         """
         self.tasks = dict()
+        self.task_dependency_graphs = dict()
+        self._sorted_task_names = None
+        self._unscoped_task_names = set()
+        self._irregular_scoped_task_names = set()
+        self._scope_index = dict()
+        self._scoped_task_names_cache = dict()
+        self._dependants_index = dict()
+        self._task_positions = None
+        self.spec_blob_store = SpecBlobStore()
 
     def add_task(self, task: Task):
         """Adds a valid `Task` instance to the collection of tasks.
@@ -864,10 +2222,154 @@ class Tasks(Sequence):
         """
         if task is not None:
             if isinstance(task, Task):
-                self.tasks[task.task_id] = dict()
-                self.tasks[task.task_id]['TaskInstance'] = copy.deepcopy(task)
+                if task.task_id in self.tasks:
+                    self._remove_task_from_scope_index(task_name=task.task_id)
+                    self._remove_task_from_dependency_index(task_name=task.task_id)
+                else:
+                    self.tasks[task.task_id] = dict()
+                self.tasks[task.task_id]['TaskInstance'] = task.clone().freeze()
+                if isinstance(self.tasks[task.task_id]['TaskInstance'].state, TaskState) is True:
+                    self.tasks[task.task_id]['TaskInstance'].state.use_spec_blob_store(spec_blob_store=self.spec_blob_store)
                 self.tasks[task.task_id]['TaskDependencies'] = self._extract_task_dependencies(metadata=task.metadata)
                 self.tasks[task.task_id]['TaskProcessingScopes'] = self._extract_task_processing_scopes(metadata=task.metadata)
+                self.tasks[task.task_id]['TaskScopeIndexKeys'] = self._add_task_to_scope_index(task=self.tasks[task.task_id]['TaskInstance'])
+                self._add_task_to_dependency_index(task_name=task.task_id)
+                self._task_positions = None
+                self.task_dependency_graphs = dict()
+                self._sorted_task_names = None
+                self._scoped_task_names_cache = dict()
+
+    def _add_task_to_scope_index(self, task: Task)->list:
+        # Returns the keys of the index entries the task was added to. The key (command, None) represents a scope
+        # without contexts, (None, context) a scope without commands and None tasks that are always in scope.
+        scope_index_keys = list()
+        processing_scopes = task.metadata.get('processingScope')
+        if processing_scopes is None or isinstance(processing_scopes, list) is False:
+            if 'processingScope' in task.metadata:
+                logger.warning('[task={}] processingScope present in task metadata, but not a list - task scoped for all commands and contexts'.format(task.task_id))
+            scope_index_keys.append(None)
+        else:
+            processing_scope: dict
+            for processing_scope in processing_scopes:
+                if isinstance(processing_scope, dict) is False:
+                    logger.warning('[task={}] Processing scope item expected to be a dict but found a "{}" - skipping'.format(task.task_id, type(processing_scope)))
+                    continue
+                scope_index_keys += self._compile_scope_index_keys(scope=processing_scope)
+        for scope_index_key in dict.fromkeys(scope_index_keys):
+            if scope_index_key is None:
+                self._unscoped_task_names.add(task.task_id)
+            elif scope_index_key == 'Irregular':
+                self._irregular_scoped_task_names.add(task.task_id)
+            else:
+                if scope_index_key not in self._scope_index:
+                    self._scope_index[scope_index_key] = set()
+                self._scope_index[scope_index_key].add(task.task_id)
+        return list(dict.fromkeys(scope_index_keys))
+
+    def _compile_scope_index_keys(self, scope: dict)->list:
+        # Converts the commands and contexts of a processing scope or dependency definition to index keys
+        if 'commands' not in scope and 'contexts' not in scope:
+            return [None,]
+        commands = scope.get('commands', list())
+        contexts = scope.get('contexts', list())
+        if self._is_indexable_scope_values(values=commands) is False or self._is_indexable_scope_values(values=contexts) is False:
+            # Definitions that are not lists of strings are evaluated one by one when queried
+            return ['Irregular',]
+        if 'commands' not in scope:
+            commands = [None,]
+        if 'contexts' not in scope:
+            contexts = [None,]
+        scope_index_keys = list()
+        for command in commands:
+            for context in contexts:
+                scope_index_keys.append((command, context,))
+        return scope_index_keys
+
+    def _scope_definition_matches(self, scope: dict, command: str, context: str)->bool:
+        if 'commands' not in scope and 'contexts' not in scope:
+            return True
+        elif 'commands' in scope and 'contexts' not in scope:
+            return command in scope['commands']
+        elif 'commands' not in scope and 'contexts' in scope:
+            return context in scope['contexts']
+        return command in scope['commands'] and context in scope['contexts']
+
+    def _add_task_to_dependency_index(self, task_name: str):
+        # Dependency definitions are numbered, so that the dependencies can be returned in the order they were defined
+        dependency_index = {
+            'Definitions': list(),
+            'DefinitionNumbersByIndexKey': dict(),
+            'IrregularDefinitionNumbers': list(),
+            'AllDependencyTaskNames': list(),
+        }
+        task_defined_dependency: dict
+        for task_defined_dependency in self.tasks[task_name]['TaskDependencies']:
+            if isinstance(task_defined_dependency, dict) is False or 'tasks' not in task_defined_dependency:
+                continue
+            definition_number = len(dependency_index['Definitions'])
+            dependency_index['Definitions'].append(task_defined_dependency)
+            dependency_index['AllDependencyTaskNames'] += task_defined_dependency['tasks']
+            for index_key in self._compile_scope_index_keys(scope=task_defined_dependency):
+                if index_key == 'Irregular':
+                    dependency_index['IrregularDefinitionNumbers'].append(definition_number)
+                else:
+                    if index_key not in dependency_index['DefinitionNumbersByIndexKey']:
+                        dependency_index['DefinitionNumbersByIndexKey'][index_key] = list()
+                    dependency_index['DefinitionNumbersByIndexKey'][index_key].append(definition_number)
+                # Irregular definitions are indexed in reverse as well, but must be evaluated when queried
+                for dependency_task_name in task_defined_dependency['tasks']:
+                    if dependency_task_name not in self._dependants_index:
+                        self._dependants_index[dependency_task_name] = dict()
+                    if index_key not in self._dependants_index[dependency_task_name]:
+                        self._dependants_index[dependency_task_name][index_key] = dict()
+                    self._dependants_index[dependency_task_name][index_key][task_name] = None
+        self.tasks[task_name]['TaskDependencyIndex'] = dependency_index
+
+    def _remove_task_from_dependency_index(self, task_name: str):
+        dependency_index = self.tasks[task_name]['TaskDependencyIndex']
+        for dependency_task_name in dependency_index['AllDependencyTaskNames']:
+            if dependency_task_name in self._dependants_index:
+                for dependants in self._dependants_index[dependency_task_name].values():
+                    dependants.pop(task_name, None)
+
+    def _is_indexable_scope_values(self, values: object)->bool:
+        if isinstance(values, list) is False:
+            return False
+        for value in values:
+            if isinstance(value, str) is False:
+                return False
+        return True
+
+    def _remove_task_from_scope_index(self, task_name: str):
+        self._unscoped_task_names.discard(task_name)
+        self._irregular_scoped_task_names.discard(task_name)
+        for scope_index_key in self.tasks[task_name]['TaskScopeIndexKeys']:
+            if isinstance(scope_index_key, tuple) is True:
+                self._scope_index[scope_index_key].discard(task_name)
+
+    def get_task_names_scoped_for_processing(self, command: str, context: str)->set:
+        """Returns the names of all tasks in scope for processing given the execution scope (command and context)
+
+        The result is calculated from an index maintained by `add_task()` and cached until the next `Task` is added.
+
+        Args:
+            command: A string with the command of the execution scope
+            context: A string with the context of the execution scope
+
+        Returns:
+            A set of task names, which must be treated as read only.
+        """
+        cache_key = (command, context,)
+        if cache_key not in self._scoped_task_names_cache:
+            task_names = set(self._unscoped_task_names)
+            for scope_index_key in ((command, context,), (command, None,), (None, context,),):
+                if scope_index_key in self._scope_index:
+                    task_names.update(self._scope_index[scope_index_key])
+            for task_name in self._irregular_scoped_task_names:
+                if self._task_scoped_by_definition(task=self.tasks[task_name]['TaskInstance'], command=command, context=context) is True:
+                    task_names.add(task_name)
+            self._scoped_task_names_cache[cache_key] = task_names
+        return self._scoped_task_names_cache[cache_key]
 
     def get_task_instance_by_name(self, task_name: str)->Task:
         """Returns a `Task` instance matching the `task_name`
@@ -876,10 +2378,10 @@ class Tasks(Sequence):
             task_name: A string with the task name to lookup and return
 
         Returns:
-            A true copy of the found tasks. If the task is not found, a NoneType will be returned.
+            A reference to the read only `Task`. If the task is not found, a NoneType will be returned.
         """
         if task_name in self.tasks:
-            return copy.deepcopy(self.tasks[task_name]['TaskInstance'])
+            return self.tasks[task_name]['TaskInstance']
         
     def get_task_dependencies_as_list_of_task_names(self, task_name: str, command: str, context: str)->list:
         """Determine the dependant tasks of the given task within a certain processing scope (command and context
@@ -898,29 +2400,63 @@ class Tasks(Sequence):
         """
         dependencies = list()
         if task_name in self.tasks:
-            task_defined_dependencies = self.tasks[task_name]['TaskDependencies']
-            task_defined_dependency: dict
-            for task_defined_dependency in task_defined_dependencies:
-                if 'tasks' in task_defined_dependency:
-
-                    for dependant_task_name in task_defined_dependency['tasks']:
-                        if self.task_scoped_for_processing(task_name=dependant_task_name, command=command, context=context) is False:
-                            logger.critical('Task "{}" depends on task "{}", but th dependant task is NOT scoped for this command and/or context. Unable to determine how to proceed - please resolve dependencies and scopes.'.format(task_name, dependant_task_name))
-                            raise Exception('Task "{}" depends on task "{}", but th dependant task is NOT scoped for this command and/or context. Unable to determine how to proceed - please resolve dependencies and scopes.'.format(task_name, dependant_task_name))
-
-                    if 'commands' not in task_defined_dependency and 'contexts' not in task_defined_dependency:
-                        dependencies += task_defined_dependency['tasks']
-                    elif 'commands' not in task_defined_dependency and 'contexts' in task_defined_dependency:
-                        if context in task_defined_dependency['contexts']:
-                            dependencies += task_defined_dependency['tasks']
-                    elif 'commands' in task_defined_dependency and 'contexts' not in task_defined_dependency:
-                        if command in task_defined_dependency['commands']:
-                            dependencies += task_defined_dependency['tasks']
-                    elif 'commands' in task_defined_dependency and 'contexts' in task_defined_dependency:
-                        if command in task_defined_dependency['commands'] and context in task_defined_dependency['contexts']:
-                            dependencies += task_defined_dependency['tasks']
+            dependency_index = self.tasks[task_name]['TaskDependencyIndex']
+            scoped_task_names = self.get_task_names_scoped_for_processing(command=command, context=context)
+            for dependant_task_name in dependency_index['AllDependencyTaskNames']:
+                if dependant_task_name not in scoped_task_names:
+                    if dependant_task_name not in self.tasks:
+                        logger.critical('Task "{}" depends on task "{}", but the dependant task does not exist.'.format(task_name, dependant_task_name))
+                        raise Exception('Task "{}" depends on task "{}", but the dependant task does not exist.'.format(task_name, dependant_task_name))
+                    logger.critical('Task "{}" depends on task "{}", but th dependant task is NOT scoped for this command and/or context. Unable to determine how to proceed - please resolve dependencies and scopes.'.format(task_name, dependant_task_name))
+                    raise Exception('Task "{}" depends on task "{}", but th dependant task is NOT scoped for this command and/or context. Unable to determine how to proceed - please resolve dependencies and scopes.'.format(task_name, dependant_task_name))
+
+            definition_numbers = set()
+            for index_key in ((command, context,), (command, None,), (None, context,), None,):
+                definition_numbers.update(dependency_index['DefinitionNumbersByIndexKey'].get(index_key, list()))
+            for definition_number in dependency_index['IrregularDefinitionNumbers']:
+                if self._scope_definition_matches(scope=dependency_index['Definitions'][definition_number], command=command, context=context) is True:
+                    definition_numbers.add(definition_number)
+            for definition_number in sorted(definition_numbers):
+                dependencies += dependency_index['Definitions'][definition_number]['tasks']
         return dependencies
 
+    def get_task_dependants_as_list_of_task_names(self, task_name: str, command: str, context: str)->list:
+        """Determine the tasks depending on the given task within a certain processing scope (command and context
+        combination). This is the reverse of `get_task_dependencies_as_list_of_task_names()`.
+
+        Args:
+            task_name: A string with the task name
+            command: A string with the command of the execution scope
+            context: A string with the context of the execution scope
+
+        Returns:
+            A list of strings with the names of the tasks in scope for processing that depend on the given task, in the
+            order the tasks were added.
+        """
+        dependants = dict()
+        if task_name in self._dependants_index:
+            dependants_by_index_key = self._dependants_index[task_name]
+            for index_key in ((command, context,), (command, None,), (None, context,), None,):
+                if index_key in dependants_by_index_key:
+                    dependants.update(dependants_by_index_key[index_key])
+            for dependant_task_name in dependants_by_index_key.get('Irregular', dict()):
+                if dependant_task_name not in dependants:
+                    dependency_index = self.tasks[dependant_task_name]['TaskDependencyIndex']
+                    for definition_number in dependency_index['IrregularDefinitionNumbers']:
+                        definition = dependency_index['Definitions'][definition_number]
+                        if task_name in definition['tasks'] and self._scope_definition_matches(scope=definition, command=command, context=context) is True:
+                            dependants[dependant_task_name] = None
+        scoped_task_names = self.get_task_names_scoped_for_processing(command=command, context=context)
+        task_positions = self._get_task_positions()
+        return sorted([dependant_task_name for dependant_task_name in dependants if dependant_task_name in scoped_task_names], key=lambda dependant_task_name: task_positions[dependant_task_name])
+
+    def _get_task_positions(self)->dict:
+        if self._task_positions is None:
+            self._task_positions = dict()
+            for task_name in self.tasks:
+                self._task_positions[task_name] = len(self._task_positions)
+        return self._task_positions
+
     def _extract_task_dependencies(self, metadata: dict)->list:
         """
             metadata:
@@ -1030,193 +2566,1217 @@ class Tasks(Sequence):
         Returns:
             Boolean `True` if the given task is in scope for processing.
         """
-        task = self.get_task_instance_by_name(task_name=task_name)
-        if 'processingScope' not in task.metadata:
-            logger.info('[task={}] processingScope not present in task metadata - task scoped for command "{}" and context "{}"'.format(task_name, command, context))
-            return True
-        if task.metadata['processingScope'] is None:
-            logger.warning('[task={}] processingScope present in task metadata, but NoneType - task scoped for command "{}" and context "{}"'.format(task_name, command, context))
-            return True
-        if isinstance(task.metadata['processingScope'], list) is False:
-            logger.warning('[task={}] processingScope present in task metadata, but not a list type - task scoped for command "{}" and context "{}"'.format(task_name, command, context))
-            return True
-        
-        logger.debug('[task={}] Command         : {}'.format(task_name, command))
-        logger.debug('[task={}] Context         : {}'.format(task_name, command))
+        if task_name not in self.tasks:
+            logger.critical('Task "{}" not found'.format(task_name))
+            raise Exception('Task "{}" not found'.format(task_name))
+        return task_name in self.get_task_names_scoped_for_processing(command=command, context=context)
 
+    def _task_scoped_by_definition(self, task: Task, command: str, context: str)->bool:
         processing_scope: dict
         for processing_scope in task.metadata['processingScope']:
+            if isinstance(processing_scope, dict) is True:
+                if self._scope_definition_matches(scope=processing_scope, command=command, context=context) is True:
+                    return True
+        return False
 
-            if processing_scope is None:
-                logger.warning('[task={}] Processing scope item expected to be a dict but is NoneType - skipping'.format(task_name))
-                continue
+    def get_task_dependency_graph(self, command: str, context: str, reverse: bool=False)->dict:
+        """Builds (or retrieves from cache) the dependency graph of all tasks in scope for the given execution scope
+        (command and context).
 
-            if isinstance(processing_scope, dict)is False:
-                logger.warning('[task={}] Processing scope item expected to be a dict but found a "{}" - skipping'.format(task_name, type(processing_scope)))
-                continue
+        The graph is an adjacency list representation in both directions and includes the processing order, which is
+        calculated with a depth first search in O(V+E) time: starting from each `Task` in the order they were added,
+        the dependencies of a `Task` are listed before the `Task` itself, in the order in which they were defined. The
+        graph is cached per command and context combination and the cache is cleared whenever a new `Task` is added.
 
-            logger.debug('[task={}] processingScope : {}'.format(task_name, json.dumps(processing_scope, default=str)))
+        The returned dict has the following keys:
 
-            if 'commands' not in processing_scope and 'contexts' not in processing_scope:
-                logger.warning('[task={}] Neither command or context was defined - returning True...'.format(task_name))
-                return True
-            elif 'commands' in processing_scope and 'contexts' not in processing_scope:
-                if command in processing_scope['commands']:
-                    logger.info('[task={}] Command matches and no contexts defined - returning True'.format(task_name))
-                    return True
-            elif 'commands' not in processing_scope and 'contexts' in processing_scope:
-                if context in processing_scope['contexts']:
-                    logger.info('[task={}] No commands defined but contexts matches - returning True'.format(task_name))
-                    return True
-            elif 'commands' in processing_scope and 'contexts' in processing_scope:
-                if command in processing_scope['commands'] and context in processing_scope['contexts']:
-                    logger.info('[task={}] Command and context matches - returning True'.format(task_name))
-                    return True
-        return False
+        * `TaskNamesInOrder` - A list of task names, in processing order (dependencies first)
+        * `Dependencies` - A dict where the key is a task name and the value a list of task names the task depends on
+        * `Dependants` - A dict where the key is a task name and the value a list of task names that depend on the task
 
-    def _task_ordering(self, current_processing_order: list, candidate_task_name: str, command: str, context: str)->list:
-        task_names_in_preferred_processing_order = list()
-        task_names_in_preferred_processing_order += copy.deepcopy(current_processing_order)
-
-        if self.task_scoped_for_processing(task_name=candidate_task_name, command=command, context=context) is True:
-            for dependant_task_name in self.get_task_dependencies_as_list_of_task_names(task_name=candidate_task_name, command=command, context=context):
-                if self.task_scoped_for_processing(task_name=dependant_task_name, command=command, context=context) is True:
-                    if dependant_task_name not in task_names_in_preferred_processing_order:
-                        task_names_in_preferred_processing_order += self._task_ordering(
-                            current_processing_order=copy.deepcopy(task_names_in_preferred_processing_order),
-                            candidate_task_name=dependant_task_name,
-                            command=command,
-                            context=context
-                        )
-            if candidate_task_name not in task_names_in_preferred_processing_order:
-                task_names_in_preferred_processing_order.append(candidate_task_name)
+        When `reverse` is True, the graph for teardown is returned, in which the direction of all dependencies is
+        reversed: tasks are listed before the tasks they depend on, and `Dependencies` and `Dependants` are swapped.
+
+        NOTE: The returned graph is shared with the cache and must be treated as read-only.
+
+        Args:
+            command: A string with the command of the execution scope
+            context: A string with the context of the execution scope
+            reverse: A boolean (default=False). If True, the reversed graph is returned
+
+        Returns:
+            A dict with the graph data
+
+        Raises:
+            Exception: In scenarios where a dependant task may specifically excluded from the given scope (command and context combination), or when a circular dependency is detected
+        """
+        graph_key = (command, context, reverse,)
+        if graph_key in self.task_dependency_graphs:
+            return self.task_dependency_graphs[graph_key]
+        if reverse is True:
+            graph = self.get_task_dependency_graph(command=command, context=context)
+            # The reverse of a topological order is a topological order of the reversed graph
+            self.task_dependency_graphs[graph_key] = {
+                'TaskNamesInOrder': list(reversed(graph['TaskNamesInOrder'])),
+                'Dependencies': graph['Dependants'],
+                'Dependants': graph['Dependencies'],
+            }
+            return self.task_dependency_graphs[graph_key]
+
+        task_names = list()
+        dependencies = dict()
+        dependants = dict()
+        scoped_task_names = self.get_task_names_scoped_for_processing(command=command, context=context)
+        for task_name in self.tasks:
+            if task_name in scoped_task_names:
+                task_names.append(task_name)
+                dependencies[task_name] = list()
+                dependants[task_name] = list()
+        for task_name in task_names:
+            for dependency_task_name in dict.fromkeys(self.get_task_dependencies_as_list_of_task_names(task_name=task_name, command=command, context=context)):
+                if dependency_task_name in dependants:
+                    dependencies[task_name].append(dependency_task_name)
+                    dependants[dependency_task_name].append(task_name)
+
+        task_names_in_order = self._order_task_names_depth_first(
+            dependencies=dependencies,
+            candidate_task_names=task_names,
+            task_names_in_order=list(),
+            ordered_task_names=set()
+        )
+
+        self.task_dependency_graphs[graph_key] = {
+            'TaskNamesInOrder': task_names_in_order,
+            'Dependencies': dependencies,
+            'Dependants': dependants,
+        }
+        return self.task_dependency_graphs[graph_key]
+
+    def _order_task_names_depth_first(self, dependencies: dict, candidate_task_names: list, task_names_in_order: list, ordered_task_names: set)->list:
+        # Iterative post-order depth first search, producing the same order as the former recursive implementation
+        # without its recursion depth limit
+        for candidate_task_name in candidate_task_names:
+            if candidate_task_name in ordered_task_names:
+                continue
+            path = [candidate_task_name,]
+            position_in_path = {candidate_task_name: 0}
+            dependency_iterators = [iter(dependencies[candidate_task_name]),]
+            while len(path) > 0:
+                for dependency_task_name in dependency_iterators[-1]:
+                    if dependency_task_name in ordered_task_names:
+                        continue
+                    if dependency_task_name in position_in_path:
+                        cycle = path[position_in_path[dependency_task_name]:] + [dependency_task_name,]
+                        logger.critical('Circular dependency detected between tasks: {}'.format(' -> '.join(cycle)))
+                        raise Exception('Circular dependency detected between tasks: {}'.format(' -> '.join(cycle)))
+                    position_in_path[dependency_task_name] = len(path)
+                    path.append(dependency_task_name)
+                    dependency_iterators.append(iter(dependencies[dependency_task_name]))
+                    break
+                else:
+                    task_name = path.pop()
+                    dependency_iterators.pop()
+                    del position_in_path[task_name]
+                    ordered_task_names.add(task_name)
+                    task_names_in_order.append(task_name)
+        return task_names_in_order
 
-        return task_names_in_preferred_processing_order
+    def _task_ordering(self, current_processing_order: list, candidate_task_name: str, command: str, context: str)->list:
+        task_names_in_preferred_processing_order = list(current_processing_order)
+        graph = self.get_task_dependency_graph(command=command, context=context)
+        if candidate_task_name not in graph['Dependencies']:
+            return task_names_in_preferred_processing_order
+        return self._order_task_names_depth_first(
+            dependencies=graph['Dependencies'],
+            candidate_task_names=[candidate_task_name,],
+            task_names_in_order=task_names_in_preferred_processing_order,
+            ordered_task_names=set(task_names_in_preferred_processing_order)
+        )
 
-    def get_task_names_in_order(self, command: str, context: str)->list:
+    def get_task_names_in_order(self, command: str, context: str, reverse: bool=False)->list:
         """Determines the correct order of task processing given an execution scope (command and context)
 
+        The order is calculated from the cached dependency graph (see `get_task_dependency_graph()`). Dependencies are
+        always listed before the tasks that depend on them and tasks that are otherwise independent are listed in the
+        order they were added. When `reverse` is True, the order is reversed, which is the order required for teardown.
+
         Args:
             command: A string with the command of the execution scope
             context: A string with the context of the execution scope
+            reverse: A boolean (default=False). If True, the tasks depending on other tasks are listed first
 
         Returns:
             A list of strings, where each string is the task name. The order of the list is important as it is determined by task dependencies such that the dependant tasks are listed first.
 
         Raises:
-            Exception: In scenarios where a dependant task may specifically excluded from the given scope (command and context combination)
+            Exception: In scenarios where a dependant task may specifically excluded from the given scope (command and context combination), or when a circular dependency is detected
         """
-        task_names_in_preferred_processing_order = list()
-        for task_name in list(self.tasks.keys()):
-            if task_name not in task_names_in_preferred_processing_order:
-                for task_name_in_order in  self._task_ordering(
-                    current_processing_order=copy.deepcopy(task_names_in_preferred_processing_order),
-                    candidate_task_name=task_name,
-                    command=command,
-                    context=context
-                ):
-                    if task_name_in_order not in task_names_in_preferred_processing_order:
-                        task_names_in_preferred_processing_order.append(task_name_in_order)
-                
-        return task_names_in_preferred_processing_order
+        return list(self.get_task_dependency_graph(command=command, context=context, reverse=reverse)['TaskNamesInOrder'])
     
     def __getitem__(self, index):
-        keys = list(self.tasks.keys())
-        keys.sort()
-        return copy.deepcopy(self.get_task_instance_by_name(task_name=keys[index]))
+        if self._sorted_task_names is None:
+            self._sorted_task_names = sorted(self.tasks.keys())
+        return self.get_task_instance_by_name(task_name=self._sorted_task_names[index])
     
     def __len__(self) -> int:
         return len(self.tasks)
 
 
-class TaskProcessor:
-    """The `TaskProcessor` is a type of base class that must implement common functions to be performed on a `Task`.
+class EventJournal:
+    """An append-only journal of `Task` processing events, held in a bounded ring buffer.
 
-    The default `TaskProcessor` must implement the following functions for each `Task`:
+    The `WorkflowExecutor` records all events added by `TaskProcessor.add_event()` during workflow execution in its
+    journal. Events can be retrieved for all tasks or for a specific task:
 
-    | Function           | Class Method            | Description                                                                                                                                                                |
-    |--------------------|-------------------------|----------------------------------------------------------------------------------------------------------------------------------------------------------------------------|
-    | Create resources   | `create_action()`       | Creates new resources as defined in the `spec` of a `Task`                                                                                                                 |
-    | Delete resources   | `delete_action()`       | Deletes resources as was defined in the `spec` of a `Task`                                                                                                                 |
-    | Update resources   | `update_action()`       | Updates resources, typically after a previous "create" action but with an updated `spec` of a `Task`                                                                       |
-    | Rollback           | `rollback_action()`     | Should be called after an exception in one of the prior actions in an attempt to get resources back to the prior state.                                                    |
-    | Drift Detection    | `detect_drift_action()` | Compares the `Task` specification against the current resources associated with the task to determine if there are any deviations that may require using the update action |
-    | Describe resources | `describe_action()`     | Describes resources that was created by a `Task`                                                                                                                           |
+    ```python
+    for event in workflow_executor.event_journal.get_events(task_id='my-task'):
+        print('{} {}'.format(event['EventLabel'], event['EventDescription']))
+    ```
 
-    The various function described above must by implemented by the client. When the `TaskProcessor` implementation is
-    initiated, an `api_version` is supplied. And `Task` targeting this API version must be able to be processed by the
-    `TaskProcessor` implementation.
+    Each event is a dict with the keys `EventSequence`, `EventTimestamp`, `EventLabel`, `EventDescription` and `TaskId`.
 
-    Also, the functions defined above can be directly called, but typically the `process_task()` method already contain
-    the required logic to coordinate the execution of the functions and automatically call the rollback function when
-    required.
+    When the journal holds `max_events` events, the oldest event is evicted for each new event. If a `spill_path` is
+    configured, evicted events are appended to that file as JSON, one event per line.
+
+    Adding an event is a constant time operation. The journal is thread safe and is shared (not copied) when a deep copy
+    is made.
 
     Attributes:
-        api_version: A string defining the implementation's API version.
+        max_events: An integer with the maximum number of events held in memory
+        spill_path: A string with the path of the file evicted events are appended to, or `None`
     """
 
-    def __init__(self, api_version: str) -> None:
-        self.api_version = api_version
-
-    def create_identifier(self, task: Task, variable_name: str)->str:
-        """Helper method to create a variable identifier.
+    def __init__(self, max_events: int=10000, spill_path: str=None):
+        """Initializes the journal
 
         Args:
-            task: A `Task` being processed
-            variable_name: The variable name to use in the final identifier string
+            max_events: An integer (default=10000) with the maximum number of events held in memory
+            spill_path: An optional string with the path of the file evicted events are appended to
 
-        Returns:
-            A string with the identifier.
+        Raises:
+            Exception: When `max_events` is less than 1
         """
-        return '{}:{}'.format(task.task_id, variable_name)
-
-    def add_event(self, variable_store: VariableStore, task: Task, event_label: str='INFO_EVENT', event_description: str='No Details Provided')->VariableStore:
-        """Adds an event entry to the `VariableStore` and ensures the event is captured in a consistent format.
-
-        The `VariableStore` instance supplied as input may already contain prior events and many other variables. The 
-        new event will simply be added.
-
-        In addition to the updated `VariableStore`, log entries of the event will also be generated.
-
-        If the `TaskProcessor` is invoked by the `process_task()` method, some standards events will already be added
-        as a `Task` is processed.
+        if max_events is None or max_events < 1:
+            raise Exception('max_events must be at least 1')
+        self.max_events = max_events
+        self.spill_path = spill_path
+        self._lock = threading.Lock()
+        self._events = deque()
+        self._events_by_task_id = dict()
+        self._next_event_sequence = 0
+        self._spill_file = None
+
+    def add_event(self, task_id: str, event_label: str, event_description: str, event_timestamp: datetime=None)->dict:
+        """Adds an event
 
         Args:
-            variable_store: An instance of `VariableStore` to which the new event will be added
-            task: A `Task` being processed
+            task_id: The identifier of the `Task` the event relates to
             event_label: A string describing the event.
             event_description: A string describing the event.
+            event_timestamp: An optional `datetime` of when the event occurred. By default, the current time is used.
 
         Returns:
-            The event will be created in a consistent data structure and be added to the `VariableStore`. The updated 
-            `VariableStore` is returned.
-
-            All events for a task will have the relevant `PROCESSING_EVENTS` key, as generated by the 
-            `create_identifier()` method, where the value of the `variable_name` is `PROCESSING_EVENTS`.
+            The event
         """
-        event_variable_name = self.create_identifier(task=task, variable_name='PROCESSING_EVENTS')
-        updated_variable_store = VariableStore()
-        updated_variable_store.variable_store = copy.deepcopy(variable_store.variable_store)
-        if event_variable_name not in variable_store.variable_store:
-            updated_variable_store = self.init_event_variable(variable_store=copy.deepcopy(updated_variable_store), task=task)
-        events: list
-        events = updated_variable_store.get_variable(variable_name=event_variable_name)
-        event_data = {
-            'EventTimestamp': datetime.now(timezone.utc),
-            'EventLabel': event_label,
-            'EventDescription': event_description,
-            'TaskId': task.task_id,
-        }
-        events.append(event_data)
-        logger.info('EVENT: {}'.format(json.dumps(event_data, default=str)))
-        updated_variable_store = updated_variable_store.add_variable(
-            variable_name=event_variable_name,
-            value=copy.deepcopy(events)
-        )
-        return updated_variable_store
+        if event_timestamp is None:
+            event_timestamp = datetime.now(timezone.utc)
+        with self._lock:
+            event = {
+                'EventSequence': self._next_event_sequence,
+                'EventTimestamp': event_timestamp,
+                'EventLabel': event_label,
+                'EventDescription': event_description,
+                'TaskId': task_id,
+            }
+            self._next_event_sequence += 1
+            if len(self._events) >= self.max_events:
+                self._evict_oldest_event()
+            self._events.append(event)
+            if task_id not in self._events_by_task_id:
+                self._events_by_task_id[task_id] = deque()
+            self._events_by_task_id[task_id].append(event)
+        return event
+
+    def _evict_oldest_event(self):
+        event = self._events.popleft()
+        # Events of a task are kept in the same order as in the journal, so the evicted event is always the first one
+        task_events = self._events_by_task_id[event['TaskId']]
+        task_events.popleft()
+        if len(task_events) == 0:
+            self._events_by_task_id.pop(event['TaskId'])
+        if self.spill_path is not None:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+            self._spill_file.write('{}\n'.format(json.dumps(event, default=str)))
+
+    def get_events(self, task_id: str=None, since_event_sequence: int=0)->list:
+        """Retrieves events still held in memory, oldest first
 
-    def init_event_variable(self, variable_store: VariableStore, task: Task)->VariableStore:
-        """Initializes the `VariableStore` for accepting new events for `Task` processing.
+        Args:
+            task_id: An optional `Task` identifier to only retrieve the events of that `Task`
+            since_event_sequence: An optional integer to only retrieve events with this or a later sequence number (see `next_event_sequence`)
+
+        Returns:
+            A list of events
+        """
+        with self._lock:
+            events = self._events
+            if task_id is not None:
+                events = self._events_by_task_id.get(task_id, list())
+            return [dict(event) for event in events if event['EventSequence'] >= since_event_sequence]
+
+    @property
+    def next_event_sequence(self)->int:
+        """The sequence number the next event will receive"""
+        return self._next_event_sequence
+
+    def flush(self):
+        """Flushes evicted events to the spill file"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+
+    def close(self):
+        """Closes the spill file"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def __len__(self)->int:
+        return len(self._events)
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_active_event_journal = contextvars.ContextVar('active_event_journal', default=None)
+
+
+class _TraceSpan:
+
+    __slots__ = ('tracer', 'name', 'category', 'task_id', 'thread_id', 'start_ns',)
+
+    def __init__(self, tracer: object, name: str, category: str, task_id: str=None):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.task_id = task_id
+        self.thread_id = None
+        self.start_ns = None
+
+    def __enter__(self):
+        self.thread_id = _get_trace_thread_id()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.tracer.add_span(
+            name=self.name,
+            category=self.category,
+            start_ns=self.start_ns,
+            duration_ns=time.perf_counter_ns() - self.start_ns,
+            thread_id=self.thread_id,
+            task_id=self.task_id,
+            failed=exc_type is not None
+        )
+        return False
+
+
+def _get_trace_thread_id()->int:
+    # Tasks running concurrently on an event loop are given their own track, as their spans do not nest
+    try:
+        asyncio_task = asyncio.current_task()
+    except RuntimeError:
+        asyncio_task = None
+    if asyncio_task is not None:
+        return id(asyncio_task)
+    return threading.get_ident()
+
+
+TRACE_SPAN_CATEGORIES = ('Workflow', 'Ordering', 'Task', 'Hook', 'Action', 'Copy',)
+
+
+class Tracer:
+    """Records timed spans of workflow executions, to show where the time goes.
+
+    Pass a `Tracer` to the `WorkflowExecutor` to record a span for each of the following (see `TRACE_SPAN_CATEGORIES`):
+
+    * `Workflow` - The complete `execute_workflow()` call
+    * `Ordering` - Determining the processing order of the tasks
+    * `Task` - Running all hooks on a `Task`
+    * `Hook` - Running a single `Hook` on a `Task`
+    * `Action` - The `TaskProcessor.process_task()` call made by the `TaskProcessingHook`
+    * `Copy` - Copies made of the `VariableStore` in between hooks
+
+    The spans can be exported in the Chrome trace event format, which can be opened in trace viewers like
+    `chrome://tracing` or Perfetto, and summarized:
+
+    ```python
+    tracer = Tracer()
+    workflow_executor = WorkflowExecutor(task_process_store=task_process_store, tracer=tracer)
+    ...
+    workflow_executor.execute_workflow(command='create', context='default')
+    with open('trace.json', 'w') as f:
+        tracer.write_chrome_trace(output=f)
+    print(tracer.produce_summary())
+    ```
+
+    Without a `Tracer`, no spans are recorded and the cost of the instrumentation is a single context variable lookup
+    per span.
+
+    Each span is a dict with the keys `Name`, `Category`, `TaskId`, `StartTime` (seconds since the `Tracer` was
+    created), `Duration` (seconds), `ThreadId`, `ProcessId` and `Failed`. When the `Tracer` holds `max_spans` spans, the
+    oldest span is dropped for each new span. The `Tracer` is thread safe and is shared (not copied) when a deep copy is
+    made.
+
+    Attributes:
+        max_spans: An integer with the maximum number of spans held in memory
+        dropped_spans_qty: An integer with the number of spans dropped so far
+    """
+
+    def __init__(self, max_spans: int=100000):
+        """Initializes the tracer
+
+        Args:
+            max_spans: An integer (default=100000) with the maximum number of spans held in memory
+
+        Raises:
+            Exception: When `max_spans` is less than 1
+        """
+        if max_spans is None or max_spans < 1:
+            raise Exception('max_spans must be at least 1')
+        self.max_spans = max_spans
+        self.dropped_spans_qty = 0
+        self._lock = threading.Lock()
+        self._spans = deque()
+        self._origin_ns = time.perf_counter_ns()
+        self._process_id = os.getpid()
+
+    def span(self, name: str, category: str, task_id: str=None)->_TraceSpan:
+        """Creates a span, which is recorded when the `with` block using it exits:
+
+        ```python
+        with tracer.span(name='LoadValues', category='Client'):
+            load_values()
+        ```
+
+        Args:
+            name: A string with the name of the span
+            category: A string with the category of the span
+            task_id: An optional identifier of the `Task` the span relates to
+
+        Returns:
+            A context manager
+        """
+        return _TraceSpan(tracer=self, name=name, category=category, task_id=task_id)
+
+    def add_span(self, name: str, category: str, start_ns: int, duration_ns: int, thread_id: int, task_id: str=None, failed: bool=False):
+        """Records a span that was timed by the caller
+
+        Args:
+            name: A string with the name of the span
+            category: A string with the category of the span
+            start_ns: An integer with the start time as returned by `time.perf_counter_ns()`
+            duration_ns: An integer with the duration in nanoseconds
+            thread_id: An integer identifying the thread (or track) the span belongs to
+            task_id: An optional identifier of the `Task` the span relates to
+            failed: A boolean (default=False) indicating if an exception was raised during the span
+        """
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self._spans.popleft()
+                self.dropped_spans_qty += 1
+            self._spans.append((name, category, task_id, start_ns - self._origin_ns, duration_ns, thread_id, failed,))
+
+    def get_spans(self, category: str=None)->list:
+        """Retrieves the spans held in memory, in the order they ended
+
+        Args:
+            category: An optional string to only retrieve spans of this category
+
+        Returns:
+            A list of spans
+        """
+        with self._lock:
+            spans = list(self._spans)
+        return [
+            {
+                'Name': name,
+                'Category': span_category,
+                'TaskId': task_id,
+                'StartTime': start_ns / 1000000000,
+                'Duration': duration_ns / 1000000000,
+                'ThreadId': thread_id,
+                'ProcessId': self._process_id,
+                'Failed': failed,
+            }
+            for name, span_category, task_id, start_ns, duration_ns, thread_id, failed in spans
+            if category is None or span_category == category
+        ]
+
+    def to_chrome_trace(self)->dict:
+        """Produces the spans in the Chrome trace event format
+
+        Returns:
+            A dict that can be serialized with `json.dump()`
+        """
+        trace_events = list()
+        for span in self.get_spans():
+            args = {'Failed': span['Failed']}
+            if span['TaskId'] is not None:
+                args['TaskId'] = span['TaskId']
+            trace_events.append({
+                'name': span['Name'],
+                'cat': span['Category'],
+                'ph': 'X',
+                'ts': span['StartTime'] * 1000000,
+                'dur': span['Duration'] * 1000000,
+                'pid': span['ProcessId'],
+                'tid': span['ThreadId'],
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, output: object)->int:
+        """Writes the spans in the Chrome trace event format to a file like object
+
+        Args:
+            output: A file like object (anything with a `write()` method accepting strings)
+
+        Returns:
+            An integer with the number of spans written
+        """
+        chrome_trace = self.to_chrome_trace()
+        json.dump(chrome_trace, output)
+        return len(chrome_trace['traceEvents'])
+
+    def produce_summary(self, top_n: int=10, space_len: int=2, line_char: str='-')->str:
+        """Produces a summary of the slowest tasks, and of the hooks, actions and other steps taking the most time
+        in total
+
+        Args:
+            top_n: An integer (default=10) with the number of rows in each table
+            space_len: int (default=2). The number of spaces between column boundaries
+            line_char: str (default='-'). The character to be used for the horizontal line below the column headers
+
+        Returns:
+            A string with the summary
+        """
+        task_rows = list()
+        for span in sorted(self.get_spans(category='Task'), key=lambda span: span['Duration'], reverse=True)[0:top_n]:
+            task_rows.append((span['Name'], '{:.3f}'.format(span['Duration'] * 1000),))
+
+        totals = dict()
+        for span in self.get_spans():
+            if span['Category'] in ('Workflow', 'Task',):
+                continue
+            key = (span['Category'], span['Name'],)
+            if key not in totals:
+                totals[key] = list()
+            totals[key].append(span['Duration'])
+        step_rows = list()
+        for key, durations in sorted(totals.items(), key=lambda item: sum(item[1]), reverse=True)[0:top_n]:
+            step_rows.append((
+                key[0],
+                key[1],
+                '{}'.format(len(durations)),
+                '{:.3f}'.format(sum(durations) * 1000),
+                '{:.3f}'.format(sum(durations) / len(durations) * 1000),
+                '{:.3f}'.format(max(durations) * 1000),
+            ))
+
+        lines = ['Slowest Tasks', '']
+        lines += self._produce_table(headers=('Task', 'Duration (ms)',), rows=task_rows, numeric_columns_qty=1, space_len=space_len, line_char=line_char)
+        lines += ['', 'Slowest Hooks and Steps (Total Time)', '']
+        lines += self._produce_table(
+            headers=('Category', 'Name', 'Calls', 'Total (ms)', 'Mean (ms)', 'Max (ms)',),
+            rows=step_rows,
+            numeric_columns_qty=4,
+            space_len=space_len,
+            line_char=line_char
+        )
+        return '\n'.join(lines)
+
+    def _produce_table(self, headers: tuple, rows: list, numeric_columns_qty: int, space_len: int, line_char: str)->list:
+        column_widths = [len(header) for header in headers]
+        for row in rows:
+            column_widths = [max(column_width, len(value)) for column_width, value in zip(column_widths, row)]
+        # Text columns are aligned left and the numeric columns at the end are aligned right
+        alignments = ['<']*(len(headers) - numeric_columns_qty) + ['>']*numeric_columns_qty
+        space = ' '*space_len
+        lines = list()
+        for row in [headers,] + rows:
+            lines.append(space.join(
+                '{0:{1}{2}}'.format(value, alignment, column_width) for value, alignment, column_width in zip(row, alignments, column_widths)
+            ).rstrip())
+        lines.insert(1, line_char*(sum(column_widths) + space_len*(len(column_widths)-1)))
+        return lines
+
+    def clear(self):
+        """Removes all spans"""
+        with self._lock:
+            self._spans.clear()
+            self.dropped_spans_qty = 0
+
+    def __len__(self)->int:
+        return len(self._spans)
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_active_tracer = contextvars.ContextVar('active_tracer', default=None)
+_DISABLED_TRACE_SPAN = contextlib.nullcontext()
+
+
+def _trace_span(name: str, category: str, task_id: str=None)->object:
+    tracer: Tracer
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return _DISABLED_TRACE_SPAN
+    return tracer.span(name=name, category=category, task_id=task_id)
+
+
+DEFAULT_HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,)
+
+
+def _format_metric_value(value: float)->str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if isinstance(value, int) is True:
+        return '{}'.format(value)
+    return repr(float(value))
+
+
+def _format_metric_labels(label_names: tuple, label_values: tuple)->str:
+    if len(label_names) == 0:
+        return ''
+    return '{{{}}}'.format(','.join(
+        '{}="{}"'.format(label_name, '{}'.format(label_value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for label_name, label_value in zip(label_names, label_values)
+    ))
+
+
+class Metric:
+    """Base class of the metrics held by a `MetricsRegistry`.
+
+    A metric has a value for every combination of label values it was updated with. Labels are supplied as a dict with
+    exactly the `label_names` of the metric as keys. Metrics are thread safe.
+
+    Attributes:
+        name: A string with the name of the metric, for example `magnum_opus_tasks_processed_total`
+        documentation: A string describing the metric
+        label_names: A tuple with the names of the labels
+    """
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: tuple=tuple()):
+        if re.fullmatch(r'[a-zA-Z_:][a-zA-Z0-9_:]*', name) is None:
+            raise Exception('Invalid metric name "{}"'.format(name))
+        for label_name in label_names:
+            if re.fullmatch(r'[a-zA-Z_][a-zA-Z0-9_]*', label_name) is None or label_name.startswith('__') is True:
+                raise Exception('Invalid label name "{}"'.format(label_name))
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = dict()
+
+    def _get_label_values(self, labels: dict)->tuple:
+        if labels is None:
+            labels = dict()
+        if len(labels) != len(self.label_names):
+            raise Exception('Metric "{}" requires the labels {}'.format(self.name, self.label_names))
+        try:
+            return tuple('{}'.format(labels[label_name]) for label_name in self.label_names)
+        except KeyError:
+            raise Exception('Metric "{}" requires the labels {}'.format(self.name, self.label_names))
+
+    def get_value(self, labels: dict=None)->object:
+        """Retrieves the current value
+
+        Args:
+            labels: A dict with the value of each label
+
+        Returns:
+            The value, or `None` if no value was recorded for the labels
+        """
+        label_values = self._get_label_values(labels=labels)
+        with self._lock:
+            return copy.deepcopy(self._values.get(label_values))
+
+    def write_prometheus_text(self, output: object):
+        """Writes the metric in the Prometheus text exposition format
+
+        Args:
+            output: A file like object (anything with a `write()` method accepting strings)
+        """
+        output.write('# HELP {} {}\n'.format(self.name, self.documentation.replace('\\', '\\\\').replace('\n', '\\n')))
+        output.write('# TYPE {} {}\n'.format(self.name, self.metric_type))
+        with self._lock:
+            samples = [(label_values, copy.deepcopy(value),) for label_values, value in self._values.items()]
+        for label_values, value in sorted(samples, key=lambda sample: sample[0]):
+            self._write_samples(output=output, label_values=label_values, value=value)
+
+    def _write_samples(self, output: object, label_values: tuple, value: object):
+        output.write('{}{} {}\n'.format(self.name, _format_metric_labels(label_names=self.label_names, label_values=label_values), _format_metric_value(value=value)))
+
+
+class Counter(Metric):
+    """A `Metric` with a value that only increases, like the number of tasks processed"""
+
+    metric_type = 'counter'
+
+    def increment(self, amount: float=1, labels: dict=None):
+        """Increases the value
+
+        Args:
+            amount: A number (default=1) to add, which may not be negative
+            labels: A dict with the value of each label
+
+        Raises:
+            Exception: When the amount is negative
+        """
+        if amount < 0:
+            raise Exception('Counter "{}" can not be decreased'.format(self.name))
+        label_values = self._get_label_values(labels=labels)
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    """A `Metric` with a value that can go up and down, like the number of queued tasks"""
+
+    metric_type = 'gauge'
+
+    def set(self, value: float, labels: dict=None):
+        """Sets the value
+
+        Args:
+            value: A number
+            labels: A dict with the value of each label
+        """
+        label_values = self._get_label_values(labels=labels)
+        with self._lock:
+            self._values[label_values] = value
+
+    def increment(self, amount: float=1, labels: dict=None):
+        """Increases (or with a negative amount, decreases) the value
+
+        Args:
+            amount: A number (default=1) to add
+            labels: A dict with the value of each label
+        """
+        label_values = self._get_label_values(labels=labels)
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Histogram(Metric):
+    """A `Metric` that counts observations, like latencies, in buckets.
+
+    The value for each combination of label values is a dict with the keys `Buckets` (the cumulative count of
+    observations less than or equal to each upper bound, keyed by the upper bound), `Sum` and `Count`.
+
+    Attributes:
+        buckets: A tuple with the upper bounds of the buckets, in increasing order
+    """
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: tuple=tuple(), buckets: tuple=DEFAULT_HISTOGRAM_BUCKETS):
+        if 'le' in label_names:
+            raise Exception('The label name "le" is reserved for histogram buckets')
+        if len(buckets) == 0 or list(buckets) != sorted(set(buckets)):
+            raise Exception('Histogram buckets must be unique and in increasing order')
+        super().__init__(name=name, documentation=documentation, label_names=label_names)
+        self.buckets = tuple(float(bucket) for bucket in buckets if bucket != float('inf'))
+
+    def observe(self, value: float, labels: dict=None):
+        """Records an observation
+
+        Args:
+            value: A number, for example a duration in seconds
+            labels: A dict with the value of each label
+        """
+        label_values = self._get_label_values(labels=labels)
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if label_values not in self._values:
+                # Observations are counted in their own bucket only; the counts are accumulated when read
+                self._values[label_values] = [[0]*(len(self.buckets) + 1), 0.0, 0]
+            bucket_counts, observed_sum, observed_qty = self._values[label_values]
+            bucket_counts[bucket_index] += 1
+            self._values[label_values][1] = observed_sum + value
+            self._values[label_values][2] = observed_qty + 1
+
+    def get_value(self, labels: dict=None)->dict:
+        value = super().get_value(labels=labels)
+        if value is None:
+            return None
+        return self._get_cumulative_value(value=value)
+
+    def _get_cumulative_value(self, value: list)->dict:
+        bucket_counts, observed_sum, observed_qty = value
+        buckets = dict()
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+            cumulative_count += bucket_count
+            buckets[upper_bound] = cumulative_count
+        return {'Buckets': buckets, 'Sum': observed_sum, 'Count': observed_qty}
+
+    def _write_samples(self, output: object, label_values: tuple, value: object):
+        value = self._get_cumulative_value(value=value)
+        for upper_bound, cumulative_count in value['Buckets'].items():
+            output.write('{}_bucket{} {}\n'.format(
+                self.name,
+                _format_metric_labels(label_names=self.label_names + ('le',), label_values=label_values + (_format_metric_value(value=upper_bound),)),
+                cumulative_count
+            ))
+        labels = _format_metric_labels(label_names=self.label_names, label_values=label_values)
+        output.write('{}_sum{} {}\n'.format(self.name, labels, _format_metric_value(value=value['Sum'])))
+        output.write('{}_count{} {}\n'.format(self.name, labels, value['Count']))
+
+
+class MetricsRegistry:
+    """Holds the metrics of the workflow engine and any metrics added by the client, and exposes them in the
+    Prometheus text exposition format.
+
+    Pass a `MetricsRegistry` to the `WorkflowExecutor` to record the following metrics (keyed by the name used in
+    `engine_metrics`):
+
+    | Key                   | Metric                                          | Type      | Labels                  |
+    |-----------------------|-------------------------------------------------|-----------|-------------------------|
+    | `WorkflowDuration`    | `magnum_opus_workflow_duration_seconds`         | Histogram | `command`, `outcome`    |
+    | `TasksProcessed`      | `magnum_opus_tasks_processed_total`             | Counter   | `action`, `outcome`     |
+    | `ActionDuration`      | `magnum_opus_action_duration_seconds`           | Histogram | `action`, `api_version` |
+    | `HookDuration`        | `magnum_opus_hook_duration_seconds`             | Histogram | `hook`                  |
+    | `StateCommitDuration` | `magnum_opus_state_commit_duration_seconds`     | Histogram | `operation`             |
+    | `VariableStoreSize`   | `magnum_opus_variable_store_variables`          | Gauge     |                         |
+    | `TasksInFlight`       | `magnum_opus_tasks_in_flight`                   | Gauge     |                         |
+    | `QueuedTasks`         | `magnum_opus_queued_tasks`                      | Gauge     |                         |
+
+    The task `outcome` is one of `Succeeded`, `Failed` or `Skipped` (see "Incremental Processing" in the
+    `WorkflowExecutor`), and the workflow `outcome` is either `Succeeded` or `Failed`. The state commit `operation` is
+    either `commit` (after each `Task`) or `flush` (at the end of a workflow). `TasksInFlight` counts the tasks
+    dispatched to the workers in the concurrent execution modes and `QueuedTasks` those still waiting for a free worker.
+
+    After each workflow execution, the registry calls `export()` on every exporter added with `add_exporter()`:
+
+    ```python
+    metrics_registry = MetricsRegistry()
+    metrics_registry.add_exporter(exporter=FileMetricsExporter(configuration={'path': '/var/lib/node_exporter/magnum_opus.prom'}))
+    workflow_executor = WorkflowExecutor(task_process_store=task_process_store, metrics_registry=metrics_registry)
+    ```
+
+    The registry is shared (not copied) when a deep copy is made.
+
+    Attributes:
+        engine_metrics: A dict with the metrics recorded by the workflow engine
+        exporters: A list of `MetricsExporter` instances
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = dict()
+        self.exporters = list()
+        self.engine_metrics = {
+            'WorkflowDuration': self.histogram(name='magnum_opus_workflow_duration_seconds', documentation='Duration of workflow executions', label_names=('command', 'outcome',)),
+            'TasksProcessed': self.counter(name='magnum_opus_tasks_processed_total', documentation='Tasks processed', label_names=('action', 'outcome',)),
+            'ActionDuration': self.histogram(name='magnum_opus_action_duration_seconds', documentation='Duration of task processor actions', label_names=('action', 'api_version',)),
+            'HookDuration': self.histogram(name='magnum_opus_hook_duration_seconds', documentation='Duration of hooks run on a task', label_names=('hook',)),
+            'StateCommitDuration': self.histogram(name='magnum_opus_state_commit_duration_seconds', documentation='Duration of state persistence commits', label_names=('operation',)),
+            'VariableStoreSize': self.gauge(name='magnum_opus_variable_store_variables', documentation='Variables in the workflow variable store'),
+            'TasksInFlight': self.gauge(name='magnum_opus_tasks_in_flight', documentation='Tasks dispatched for concurrent processing and not yet completed'),
+            'QueuedTasks': self.gauge(name='magnum_opus_queued_tasks', documentation='Tasks dispatched for concurrent processing and waiting for a worker'),
+        }
+
+    def _register_metric(self, metric_class: object, name: str, **kwargs)->Metric:
+        with self._lock:
+            if name in self._metrics:
+                metric = self._metrics[name]
+                if type(metric) is not metric_class or metric.label_names != tuple(kwargs.get('label_names', tuple())):
+                    raise Exception('Metric "{}" is already registered with a different type or labels'.format(name))
+                return metric
+            metric = metric_class(name=name, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple=tuple())->Counter:
+        """Registers a `Counter`, or returns the `Counter` already registered with the name
+
+        Args:
+            name: A string with the name of the metric
+            documentation: A string describing the metric
+            label_names: A tuple with the names of the labels
+
+        Returns:
+            The `Counter`
+
+        Raises:
+            Exception: When a metric with a different type or labels is registered with the name
+        """
+        return self._register_metric(metric_class=Counter, name=name, documentation=documentation, label_names=label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: tuple=tuple())->Gauge:
+        """Registers a `Gauge`, or returns the `Gauge` already registered with the name
+
+        Args:
+            name: A string with the name of the metric
+            documentation: A string describing the metric
+            label_names: A tuple with the names of the labels
+
+        Returns:
+            The `Gauge`
+
+        Raises:
+            Exception: When a metric with a different type or labels is registered with the name
+        """
+        return self._register_metric(metric_class=Gauge, name=name, documentation=documentation, label_names=label_names)
+
+    def histogram(self, name: str, documentation: str, label_names: tuple=tuple(), buckets: tuple=DEFAULT_HISTOGRAM_BUCKETS)->Histogram:
+        """Registers a `Histogram`, or returns the `Histogram` already registered with the name
+
+        Args:
+            name: A string with the name of the metric
+            documentation: A string describing the metric
+            label_names: A tuple with the names of the labels
+            buckets: A tuple with the upper bounds of the buckets (default=`DEFAULT_HISTOGRAM_BUCKETS`)
+
+        Returns:
+            The `Histogram`
+
+        Raises:
+            Exception: When a metric with a different type or labels is registered with the name
+        """
+        return self._register_metric(metric_class=Histogram, name=name, documentation=documentation, label_names=label_names, buckets=buckets)
+
+    def get_metric(self, name: str)->Metric:
+        """Retrieves a registered metric
+
+        Args:
+            name: A string with the name of the metric
+
+        Returns:
+            The `Metric`, or `None` if no metric is registered with the name
+        """
+        with self._lock:
+            return self._metrics.get(name)
+
+    def write_prometheus_text(self, output: object):
+        """Writes all metrics in the Prometheus text exposition format
+
+        Args:
+            output: A file like object (anything with a `write()` method accepting strings)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            metric.write_prometheus_text(output=output)
+
+    def produce_prometheus_text(self)->str:
+        """Produces all metrics in the Prometheus text exposition format
+
+        Returns:
+            A string with the metrics
+        """
+        output = io.StringIO()
+        self.write_prometheus_text(output=output)
+        return output.getvalue()
+
+    def add_exporter(self, exporter: object):
+        """Adds an exporter, which will be called by `export()`
+
+        Args:
+            exporter: An instance of `MetricsExporter`
+        """
+        exporter.metrics_registry = self
+        self.exporters.append(exporter)
+
+    def export(self):
+        """Calls `export()` on every exporter. Failures are logged, so that they do not affect workflow processing.
+        """
+        exporter: MetricsExporter
+        for exporter in self.exporters:
+            try:
+                exporter.export()
+            except:
+                logger.error('Metrics export failed: {}'.format(traceback.format_exc()))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class MetricsExporter:
+    """Exposes the metrics of a `MetricsRegistry`. Implementations are added to the registry with
+    `MetricsRegistry.add_exporter()`, after which `export()` is called at the end of every workflow execution.
+
+    Attributes:
+        configuration: A dict holding configuration data
+        metrics_registry: The `MetricsRegistry` the exporter was added to
+    """
+
+    def __init__(self, configuration: dict=dict()):
+        self.configuration = configuration
+        self.metrics_registry = None
+
+    def export(self):
+        """Exports the current metrics"""
+        raise Exception('Must be implemented/extended by client')
+
+    def close(self):
+        """Releases any resources held by the exporter"""
+        pass
+
+
+class FileMetricsExporter(MetricsExporter):
+    """Writes the metrics in the Prometheus text exposition format to a file, for example for the textfile collector of
+    the Prometheus node exporter. The file is replaced atomically, so that it is never read while partially written.
+
+    The following configuration is supported:
+
+    | Key    | Default    | Description                        |
+    |--------|------------|------------------------------------|
+    | `path` | (required) | Path of the file to write to       |
+    """
+
+    def __init__(self, configuration: dict=dict()):
+        super().__init__(configuration=configuration)
+        if 'path' not in configuration:
+            raise Exception('The path of the metrics file is required')
+
+    def export(self):
+        temporary_path = '{}.{}.tmp'.format(self.configuration['path'], os.getpid())
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            self.metrics_registry.write_prometheus_text(output=f)
+        os.replace(temporary_path, self.configuration['path'])
+
+
+class HttpMetricsExporter(MetricsExporter):
+    """Serves the metrics in the Prometheus text exposition format over HTTP, so that they can be scraped by
+    Prometheus. The metrics are produced on each request, so `export()` does nothing.
+
+    The server runs in a background thread from `start()` until `close()`. By default, it only listens on the loopback
+    interface.
+
+    The following configuration is supported:
+
+    | Key    | Default     | Description                                            |
+    |--------|-------------|--------------------------------------------------------|
+    | `host` | `127.0.0.1` | Address to listen on                                   |
+    | `port` | `9464`      | Port to listen on. Use `0` to select any free port     |
+    | `path` | `/metrics`  | Path the metrics are served on                         |
+
+    Attributes:
+        port: An integer with the port the server listens on, once started
+    """
+
+    def __init__(self, configuration: dict=dict()):
+        super().__init__(configuration=configuration)
+        self.port = None
+        self._server = None
+        self._server_thread = None
+
+    def start(self):
+        """Starts serving the metrics
+
+        Raises:
+            Exception: When the exporter was not added to a `MetricsRegistry`
+        """
+        if self.metrics_registry is None:
+            raise Exception('The exporter must be added to a MetricsRegistry before it is started')
+        if self._server is not None:
+            return
+        metrics_path = self.configuration.get('path', '/metrics')
+        metrics_registry = self.metrics_registry
+
+        class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split('?')[0] != metrics_path:
+                    self.send_error(404)
+                    return
+                body = metrics_registry.produce_prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', '{}'.format(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug('Metrics request: {}'.format(format % args))
+
+        self._server = http.server.ThreadingHTTPServer(
+            (self.configuration.get('host', '127.0.0.1'), int(self.configuration.get('port', 9464)),),
+            MetricsRequestHandler
+        )
+        self.port = self._server.server_address[1]
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+        logger.info('Serving metrics on http://{}:{}{}'.format(self.configuration.get('host', '127.0.0.1'), self.port, metrics_path))
+
+    def export(self):
+        pass
+
+    def close(self):
+        """Stops serving the metrics"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server_thread.join()
+        self._server = None
+        self._server_thread = None
+
+
+class _MetricsTimer:
+
+    __slots__ = ('histogram', 'labels', 'start',)
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.histogram.observe(value=time.perf_counter() - self.start, labels=self.labels)
+        return False
+
+
+_active_metrics_registry = contextvars.ContextVar('active_metrics_registry', default=None)
+
+
+def _measure_duration(metric_key: str, **labels)->object:
+    metrics_registry: MetricsRegistry
+    metrics_registry = _active_metrics_registry.get()
+    if metrics_registry is None:
+        return _DISABLED_TRACE_SPAN
+    return _MetricsTimer(histogram=metrics_registry.engine_metrics[metric_key], labels=labels)
+
+
+class TaskProcessor:
+    """The `TaskProcessor` is a type of base class that must implement common functions to be performed on a `Task`.
+
+    The default `TaskProcessor` must implement the following functions for each `Task`:
+
+    | Function           | Class Method            | Description                                                                                                                                                                |
+    |--------------------|-------------------------|----------------------------------------------------------------------------------------------------------------------------------------------------------------------------|
+    | Create resources   | `create_action()`       | Creates new resources as defined in the `spec` of a `Task`                                                                                                                 |
+    | Delete resources   | `delete_action()`       | Deletes resources as was defined in the `spec` of a `Task`                                                                                                                 |
+    | Update resources   | `update_action()`       | Updates resources, typically after a previous "create" action but with an updated `spec` of a `Task`                                                                       |
+    | Rollback           | `rollback_action()`     | Should be called after an exception in one of the prior actions in an attempt to get resources back to the prior state.                                                    |
+    | Drift Detection    | `detect_drift_action()` | Compares the `Task` specification against the current resources associated with the task to determine if there are any deviations that may require using the update action |
+    | Describe resources | `describe_action()`     | Describes resources that was created by a `Task`                                                                                                                           |
+
+    The various function described above must by implemented by the client. When the `TaskProcessor` implementation is
+    initiated, an `api_version` is supplied. And `Task` targeting this API version must be able to be processed by the
+    `TaskProcessor` implementation.
+
+    Also, the functions defined above can be directly called, but typically the `process_task()` method already contain
+    the required logic to coordinate the execution of the functions and automatically call the rollback function when
+    required.
+
+    For use with the `AsyncWorkflowExecutor`, each of the action methods also has an asynchronous variant (for example
+    `create_action_async()`) that is called by `process_task_async()`. By default these run the synchronous method in a
+    separate thread, so existing implementations keep working. Implementations performing I/O can override the
+    asynchronous variants with native coroutines to process many tasks concurrently on a single event loop.
+
+    Expensive resources, like client sessions or connection pools, can be created in `warm_up()` and released in
+    `shut_down()`. When these methods are called depends on the lifecycle with which the `TaskProcessor` is registered
+    with the `TaskProcessStore`.
+
+    Attributes:
+        api_version: A string defining the implementation's API version.
+    """
+
+    def __init__(self, api_version: str) -> None:
+        self.api_version = api_version
+
+    def warm_up(self):
+        """Called once before the instance processes its first `Task`. Override to create expensive resources."""
+        pass
+
+    def shut_down(self):
+        """Called once after the instance will no longer be used. Override to release resources created in `warm_up()`."""
+        pass
+
+    def create_identifier(self, task: Task, variable_name: str)->str:
+        """Helper method to create a variable identifier.
+
+        Args:
+            task: A `Task` being processed
+            variable_name: The variable name to use in the final identifier string
+
+        Returns:
+            A string with the identifier.
+        """
+        return '{}:{}'.format(task.task_id, variable_name)
+
+    def add_event(self, variable_store: VariableStore, task: Task, event_label: str='INFO_EVENT', event_description: str='No Details Provided')->VariableStore:
+        """Adds an event entry to the `VariableStore` and ensures the event is captured in a consistent format.
+
+        The `VariableStore` instance supplied as input may already contain prior events and many other variables. The 
+        new event will simply be added.
+
+        In addition to the updated `VariableStore`, log entries of the event will also be generated.
+
+        If the `TaskProcessor` is invoked by the `process_task()` method, some standards events will already be added
+        as a `Task` is processed.
+
+        During workflow execution, the event is recorded in the `EventJournal` of the `WorkflowExecutor` instead, and the
+        `VariableStore` is returned unchanged.
+
+        Args:
+            variable_store: An instance of `VariableStore` to which the new event will be added
+            task: A `Task` being processed
+            event_label: A string describing the event.
+            event_description: A string describing the event.
+
+        Returns:
+            The event will be created in a consistent data structure and be added to the `VariableStore`. The updated 
+            `VariableStore` is returned.
+
+            All events for a task will have the relevant `PROCESSING_EVENTS` key, as generated by the 
+            `create_identifier()` method, where the value of the `variable_name` is `PROCESSING_EVENTS`.
+        """
+        event_journal: EventJournal
+        event_journal = _active_event_journal.get()
+        if event_journal is not None:
+            event_journal.add_event(task_id=task.task_id, event_label=event_label, event_description=event_description)
+            logger.info('EVENT: [{}] {}: {}'.format(task.task_id, event_label, event_description))
+            return variable_store
+        event_variable_name = self.create_identifier(task=task, variable_name='PROCESSING_EVENTS')
+        updated_variable_store = VariableStore()
+        updated_variable_store.variable_store = copy.deepcopy(variable_store.variable_store)
+        if event_variable_name not in variable_store.variable_store:
+            updated_variable_store = self.init_event_variable(variable_store=copy.deepcopy(updated_variable_store), task=task)
+        events: list
+        events = updated_variable_store.get_variable(variable_name=event_variable_name)
+        event_data = {
+            'EventTimestamp': datetime.now(timezone.utc),
+            'EventLabel': event_label,
+            'EventDescription': event_description,
+            'TaskId': task.task_id,
+        }
+        events.append(event_data)
+        logger.info('EVENT: {}'.format(json.dumps(event_data, default=str)))
+        updated_variable_store = updated_variable_store.add_variable(
+            variable_name=event_variable_name,
+            value=events,
+            copy_value=False
+        )
+        return updated_variable_store
+
+    def init_event_variable(self, variable_store: VariableStore, task: Task)->VariableStore:
+        """Initializes the `VariableStore` for accepting new events for `Task` processing.
 
         Normally this method does not have to be called directly. When a new event is generated via a call to the 
         `add_event()` method, logic in that method will already handle the timely calling of this method. 
@@ -1280,74 +3840,112 @@ class TaskProcessor:
         Raises:
             Exception: Any exceptions raised in processing will be passed back to the client.
         """
+        steps = self._process_task_steps(task=task, persistence=persistence, variable_store=variable_store, action=action, task_resolved_spec=task_resolved_spec)
+        try:
+            action_method_name, kwargs = next(steps)
+            while True:
+                try:
+                    result = getattr(self, action_method_name)(**kwargs)
+                except BaseException as exception:
+                    action_method_name, kwargs = steps.throw(exception)
+                else:
+                    action_method_name, kwargs = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def process_task_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        action: str='CreateAction',
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        """Asynchronous variant of `process_task()`, used by the `AsyncWorkflowExecutor`.
+
+        The events, exception handling and rollback behavior is the same as for `process_task()`, but the asynchronous
+        variants of the action methods (for example `create_action_async()`) will be awaited.
+
+        Args:
+            task: A `Task` being processed
+            persistence: An instance of `StatePersistence`. The implementation is passed on to the various methods implementation functional logic for `Task` processing. By default a new `StatePersistence` is created.
+            variable_store: An instance of `VariableStore` to which the new event will be added
+            action: A string defining the action to be performed.
+            task_resolved_spec: A dict containing the fully resolved `spec` of a `Task` to be processed.
+
+        Returns:
+            An updated `VariableStore` with `Task` processing event entries and variables created during the processing
+            of the `Task`
+
+        Raises:
+            Exception: Any exceptions raised in processing will be passed back to the client.
+        """
+        if persistence is None:
+            persistence = StatePersistence()
+        steps = self._process_task_steps(task=task, persistence=persistence, variable_store=variable_store, action=action, task_resolved_spec=task_resolved_spec)
+        try:
+            action_method_name, kwargs = next(steps)
+            while True:
+                try:
+                    result = await getattr(self, '{}_async'.format(action_method_name))(**kwargs)
+                except BaseException as exception:
+                    action_method_name, kwargs = steps.throw(exception)
+                else:
+                    action_method_name, kwargs = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def _process_task_steps(self, task: Task, persistence: StatePersistence, variable_store: VariableStore, action: str, task_resolved_spec: dict):
+        # The processing logic shared by process_task() and process_task_async(). Each action method call is yielded as
+        # a tuple with the method name and its arguments, after which the caller sends back the result of calling the
+        # synchronous or asynchronous variant of the method, or throws the exception it raised. The final variable
+        # store is returned, or an exception is raised when processing failed.
+        action_methods = {
+            'CreateAction': ('create_action', 'CREATE_ACTION', True,),
+            'DeleteAction': ('delete_action', 'DELETE_ACTION', True,),
+            'UpdateAction': ('update_action', 'UPDATE_ACTION', True,),
+            'DescribeAction': ('describe_action', 'DESCRIBE_ACTION', False,),
+            'DetectDriftAction': ('detect_drift_action', 'DETECT_DRIFT_ACTION', False,),
+        }
         variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='PROCESS_TASK_CALLED', event_description='Ready For Processing')
         auto_rollback = task.auto_rollback_enabled()
         exception_raised = False
         final_exception_message = 'Unrecognized action "{}" provided'.format(action)
-        if action == 'CreateAction':
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='CREATE_ACTION_START', event_description='Start of processing')
-            try:
-                variable_store = self.create_action(task=task, persistence=persistence, variable_store=copy.deepcopy(variable_store), task_resolved_spec=task_resolved_spec)
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='CREATE_ACTION_DONE', event_description='Start of processing')
-                return variable_store
-            except:
-                exception_text = traceback.format_exc()
-                logger.error('EXCEPTION: {}'.format(exception_text))
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='CREATE_ACTION_ERROR', event_description='EXCEPTION: {}'.format(exception_text))
-                variable_store = variable_store.add_variable(variable_name='__GLOBAL__:PROCESS_TASK_EXCEPTION_RAISED_FOR_ACTION', value='CreateAction')
-                exception_raised = True
-                final_exception_message = 'Action "CreateAction" failed with exception - please see logs for details.'
-        elif action == 'DeleteAction':
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DELETE_ACTION_START', event_description='Start of processing')
+        if action in action_methods:
+            action_method_name, event_label_prefix, rollback_on_exception = action_methods[action]
+            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='{}_START'.format(event_label_prefix), event_description='Start of processing')
+            action_variable_store = variable_store
+            if action == 'CreateAction':
+                action_variable_store = copy.deepcopy(variable_store)
             try:
-                variable_store = self.delete_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DELETE_ACTION_DONE', event_description='End of processing')
+                variable_store = yield action_method_name, {'task': task, 'persistence': persistence, 'variable_store': action_variable_store, 'task_resolved_spec': task_resolved_spec}
+                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='{}_DONE'.format(event_label_prefix), event_description='End of processing')
                 return variable_store
             except:
+                if rollback_on_exception is False:
+                    raise
                 exception_text = traceback.format_exc()
                 logger.error('EXCEPTION: {}'.format(exception_text))
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DELETE_ACTION_ERROR', event_description='EXCEPTION: {}'.format(exception_text))
-                variable_store = variable_store.add_variable(variable_name='__GLOBAL__:PROCESS_TASK_EXCEPTION_RAISED_FOR_ACTION', value='DeleteAction')
+                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='{}_ERROR'.format(event_label_prefix), event_description='EXCEPTION: {}'.format(exception_text))
+                variable_store = variable_store.add_variable(variable_name='__GLOBAL__:PROCESS_TASK_EXCEPTION_RAISED_FOR_ACTION', value=action)
                 exception_raised = True
-                final_exception_message = 'Action "DeleteAction" failed with exception - please see logs for details.'
-        elif action == 'UpdateAction':
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='UPDATE_ACTION_START', event_description='Start of processing')
-            try:
-                variable_store = self.update_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='UPDATE_ACTION_DONE', event_description='End of processing')
-                return variable_store
-            except:
-                exception_text = traceback.format_exc()
-                logger.error('EXCEPTION: {}'.format(exception_text))
-                variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='UPDATE_ACTION_ERROR', event_description='EXCEPTION: {}'.format(exception_text))
-                variable_store = variable_store.add_variable(variable_name='__GLOBAL__:PROCESS_TASK_EXCEPTION_RAISED_FOR_ACTION', value='UpdateAction')
-                exception_raised = True
-                final_exception_message = 'Action "UpdateAction" failed with exception - please see logs for details.'
-        elif action == 'DescribeAction':
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DESCRIBE_ACTION_START', event_description='Start of processing')
-            variable_store = self.describe_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DESCRIBE_ACTION_DONE', event_description='End of processing')
-            return variable_store
-        elif action == 'DetectDriftAction':
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DETECT_DRIFT_ACTION_START', event_description='Start of processing')
-            variable_store = self.detect_drift_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
-            variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='DETECT_DRIFT_ACTION_DONE', event_description='End of processing')
-            return variable_store
-        
+                final_exception_message = 'Action "{}" failed with exception - please see logs for details.'.format(action)
+
+        rollback_kwargs = {'task': task, 'persistence': persistence, 'task_resolved_spec': task_resolved_spec}
         if action == 'RollbackAction' and exception_raised is False:
             variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='ROLLBACK_ACTION_START', event_description='Start of processing')
-            variable_store = self.rollback_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+            variable_store = yield 'rollback_action', dict(rollback_kwargs, variable_store=variable_store)
             variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='ROLLBACK_ACTION_DONE', event_description='End of processing')
             return variable_store
         elif auto_rollback is True and action != 'RollbackAction' and exception_raised is True:
             variable_store = variable_store.add_variable(variable_name='{}:RollbackFrom'.format(task.task_id), value=action)
             variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='ROLLBACK_ACTION_START', event_description='Start of processing')
-            variable_store = self.rollback_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+            variable_store = yield 'rollback_action', dict(rollback_kwargs, variable_store=variable_store)
             variable_store = self.add_event(variable_store=copy.deepcopy(variable_store), task=task, event_label='ROLLBACK_ACTION_DONE', event_description='End of processing')
-            final_exception_message = '{} Auto Rollback action was attempted.'
+            final_exception_message = '{} Auto Rollback action was attempted.'.format(final_exception_message)
 
         raise Exception(final_exception_message)
-    
+
     def create_action(
         self,
         task: Task,
@@ -1387,28 +3985,502 @@ class TaskProcessor:
     def describe_action(
         self,
         task: Task,
-        persistence: StatePersistence=StatePersistence(),
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        raise Exception('Must be implemented/extended by client')
+    
+    def detect_drift_action(
+        self,
+        task: Task,
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        raise Exception('Must be implemented/extended by client')
+
+    async def create_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.create_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+    async def rollback_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.rollback_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+    async def delete_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.delete_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+    async def update_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.update_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+    async def describe_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.describe_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+    async def detect_drift_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(self.detect_drift_action, task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+
+class ResourcePool:
+    """A thread safe, bounded pool of reusable resources, like HTTP sessions or database connections.
+
+    Resources are created on demand up to `max_size`. A released resource is kept for reuse, and resources that were not
+    used for `idle_timeout` seconds are closed. If a `health_check` is supplied, every idle resource is checked before it
+    is handed out again and is replaced when the check fails.
+
+    ```python
+    pool = ResourcePool(create_resource=requests.Session, close_resource=lambda session: session.close(), max_size=8)
+    resource = pool.acquire()
+    try:
+        ...
+    finally:
+        pool.release(resource=resource)
+    ```
+
+    A deep copy of a pool is a new and empty pool with the same configuration - resources are never copied.
+
+    Attributes:
+        max_size: An integer with the maximum number of resources (leased and idle)
+        idle_timeout: A float with the number of seconds after which an unused resource is closed
+        acquire_timeout: A float with the number of seconds to wait for a resource when all resources are leased, or `None` to wait indefinitely
+    """
+
+    def __init__(
+        self,
+        create_resource: object,
+        close_resource: object=None,
+        health_check: object=None,
+        max_size: int=10,
+        idle_timeout: float=300.0,
+        acquire_timeout: float=None
+    ):
+        """Initializes the pool
+
+        Args:
+            create_resource: A callable without arguments that returns a new resource
+            close_resource: An optional callable that closes a resource, given as the only argument
+            health_check: An optional callable that returns `True` if the resource given as the only argument may still be used
+            max_size: An integer (default=10) with the maximum number of resources (leased and idle)
+            idle_timeout: A float (default=300.0) with the number of seconds after which an unused resource is closed
+            acquire_timeout: An optional float with the number of seconds to wait for a resource when all resources are leased
+
+        Raises:
+            Exception: When `max_size` is less than 1
+        """
+        if max_size is None or max_size < 1:
+            raise Exception('max_size must be at least 1')
+        self.create_resource = create_resource
+        self.close_resource = close_resource
+        self.health_check = health_check
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self._condition = threading.Condition()
+        self._idle_resources = deque()
+        self._leased_qty = 0
+        self._closed = False
+
+    def acquire(self)->object:
+        """Leases a resource, which must be returned with `release()`
+
+        Returns:
+            The resource
+
+        Raises:
+            Exception: When the pool is closed, or no resource became available within `acquire_timeout` seconds
+        """
+        deadline = None
+        if self.acquire_timeout is not None:
+            deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            expired_resources = list()
+            resource = None
+            create = False
+            with self._condition:
+                while True:
+                    if self._closed is True:
+                        raise Exception('Resource pool is closed')
+                    expired_resources += self._remove_expired_idle_resources()
+                    if len(self._idle_resources) > 0:
+                        # The most recently used resource is reused first, so that surplus resources become idle
+                        resource, _ = self._idle_resources.pop()
+                        break
+                    if self._leased_qty < self.max_size:
+                        create = True
+                        break
+                    remaining_time = None
+                    if deadline is not None:
+                        remaining_time = deadline - time.monotonic()
+                        if remaining_time <= 0:
+                            logger.error('No resource became available within {} seconds'.format(self.acquire_timeout))
+                            raise Exception('Timeout waiting for a pooled resource')
+                    self._condition.wait(timeout=remaining_time)
+                self._leased_qty += 1
+            self._close_resources(resources=expired_resources)
+            if create is True:
+                try:
+                    return self.create_resource()
+                except:
+                    self._return_capacity()
+                    raise
+            if self._resource_is_healthy(resource=resource) is True:
+                return resource
+            self._close_resources(resources=[resource,])
+            self._return_capacity()
+
+    def release(self, resource: object, discard: bool=False):
+        """Returns a leased resource to the pool
+
+        Args:
+            resource: The resource obtained from `acquire()`
+            discard: A boolean (default=False). If True, the resource is closed instead of being reused
+        """
+        with self._condition:
+            self._leased_qty -= 1
+            if discard is False and self._closed is False:
+                self._idle_resources.append((resource, time.monotonic(),))
+                self._condition.notify()
+                return
+            self._condition.notify()
+        self._close_resources(resources=[resource,])
+
+    def evict_idle_resources(self)->int:
+        """Closes all idle resources that were not used for `idle_timeout` seconds
+
+        Returns:
+            An integer with the number of resources closed
+        """
+        with self._condition:
+            expired_resources = self._remove_expired_idle_resources()
+        self._close_resources(resources=expired_resources)
+        return len(expired_resources)
+
+    def close(self):
+        """Closes all idle resources. Leased resources are closed when they are released."""
+        with self._condition:
+            self._closed = True
+            idle_resources = [resource for resource, _ in self._idle_resources]
+            self._idle_resources.clear()
+            self._condition.notify_all()
+        self._close_resources(resources=idle_resources)
+
+    @property
+    def idle_qty(self)->int:
+        """The number of idle resources"""
+        return len(self._idle_resources)
+
+    @property
+    def leased_qty(self)->int:
+        """The number of leased resources"""
+        return self._leased_qty
+
+    def _remove_expired_idle_resources(self)->list:
+        expired_resources = list()
+        if self.idle_timeout is None:
+            return expired_resources
+        expiry_time = time.monotonic() - self.idle_timeout
+        # Idle resources are ordered from least to most recently used
+        while len(self._idle_resources) > 0 and self._idle_resources[0][1] <= expiry_time:
+            expired_resources.append(self._idle_resources.popleft()[0])
+        return expired_resources
+
+    def _resource_is_healthy(self, resource: object)->bool:
+        if self.health_check is None:
+            return True
+        try:
+            return self.health_check(resource) is True
+        except:
+            logger.warning('Health check of pooled resource failed: {}'.format(traceback.format_exc()))
+            return False
+
+    def _return_capacity(self):
+        with self._condition:
+            self._leased_qty -= 1
+            self._condition.notify()
+
+    def _close_resources(self, resources: list):
+        if self.close_resource is None:
+            return
+        for resource in resources:
+            try:
+                self.close_resource(resource)
+            except:
+                logger.warning('Closing of pooled resource failed: {}'.format(traceback.format_exc()))
+
+    def __deepcopy__(self, memo):
+        return ResourcePool(
+            create_resource=self.create_resource,
+            close_resource=self.close_resource,
+            health_check=self.health_check,
+            max_size=self.max_size,
+            idle_timeout=self.idle_timeout,
+            acquire_timeout=self.acquire_timeout
+        )
+
+
+_leased_resource = contextvars.ContextVar('leased_resource', default=None)
+
+
+class PooledTaskProcessor(TaskProcessor):
+    """A `TaskProcessor` that leases a resource from a managed `ResourcePool` for every `Task` it processes.
+
+    Implementations override `create_resource()` and, optionally, `close_resource()` and `check_resource_health()`. The
+    action methods obtain the leased resource with `get_leased_resource()`:
+
+    ```python
+    class ApiTaskProcessor(PooledTaskProcessor):
+
+        def __init__(self):
+            super().__init__(api_version='ApiTaskProcessor/v1', max_pool_size=8)
+
+        def create_resource(self):
+            return requests.Session()
+
+        def close_resource(self, resource):
+            resource.close()
+
+        def create_action(self, task, persistence, variable_store, task_resolved_spec):
+            session = self.get_leased_resource()
+            ...
+    ```
+
+    The resource is leased by `process_task()` (and `process_task_async()`) before the action method is called and is
+    returned to the pool afterwards, including when a rollback was performed. The same resource is therefore used for
+    the action and its rollback.
+
+    The pool is created in `warm_up()` and closed in `shut_down()`, so the processor is best registered with the
+    `Singleton` or `PerWorkflow` lifecycle (see `TaskProcessStore`), in which case all tasks share the pool. Each copy
+    of the processor has its own pool.
+
+    Attributes:
+        resource_pool: The `ResourcePool`, or `None` before `warm_up()` was called
+    """
+
+    def __init__(self, api_version: str, max_pool_size: int=10, idle_timeout: float=300.0, acquire_timeout: float=None) -> None:
+        """Initializes the processor
+
+        Args:
+            api_version: A string defining the implementation's API version.
+            max_pool_size: An integer (default=10) with the maximum number of resources
+            idle_timeout: A float (default=300.0) with the number of seconds after which an unused resource is closed
+            acquire_timeout: An optional float with the number of seconds to wait for a resource when all resources are leased
+        """
+        super().__init__(api_version)
+        self.max_pool_size = max_pool_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.resource_pool = None
+        self._resource_pool_lock = threading.Lock()
+
+    def create_resource(self)->object:
+        """Must be implemented by the client to create a new resource, for example a client session.
+
+        Returns:
+            The resource
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def close_resource(self, resource: object):
+        """May be implemented by the client to close a resource
+
+        Args:
+            resource: The resource to close
+        """
+        pass
+
+    def check_resource_health(self, resource: object)->bool:
+        """May be implemented by the client to verify that an idle resource can still be used
+
+        Args:
+            resource: The resource to check
+
+        Returns:
+            A boolean `True` (default) if the resource is healthy
+        """
+        return True
+
+    def get_leased_resource(self)->object:
+        """Retrieves the resource leased for the `Task` currently being processed
+
+        Returns:
+            The resource
+
+        Raises:
+            Exception: When called outside of `process_task()` or `process_task_async()`
+        """
+        resource = _leased_resource.get()
+        if resource is None:
+            raise Exception('No resource leased - resources are only available while a Task is processed')
+        return resource
+
+    def warm_up(self):
+        with self._resource_pool_lock:
+            if self.resource_pool is None:
+                self.resource_pool = ResourcePool(
+                    create_resource=self.create_resource,
+                    close_resource=self.close_resource,
+                    health_check=self.check_resource_health,
+                    max_size=self.max_pool_size,
+                    idle_timeout=self.idle_timeout,
+                    acquire_timeout=self.acquire_timeout
+                )
+
+    def shut_down(self):
+        with self._resource_pool_lock:
+            resource_pool = self.resource_pool
+            self.resource_pool = None
+        if resource_pool is not None:
+            resource_pool.close()
+
+    def process_task(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
         variable_store: VariableStore=VariableStore(),
+        action: str='CreateAction',
         task_resolved_spec: dict=dict()
     )->VariableStore:
-        raise Exception('Must be implemented/extended by client')
-    
-    def detect_drift_action(
+        if persistence is None:
+            persistence = StatePersistence()
+        self.warm_up()
+        resource_pool = self.resource_pool
+        resource = resource_pool.acquire()
+        token = _leased_resource.set(resource)
+        try:
+            return super().process_task(task=task, persistence=persistence, variable_store=variable_store, action=action, task_resolved_spec=task_resolved_spec)
+        finally:
+            _leased_resource.reset(token)
+            resource_pool.release(resource=resource)
+
+    async def process_task_async(
         self,
         task: Task,
-        persistence: StatePersistence=StatePersistence(),
+        persistence: StatePersistence=None,
         variable_store: VariableStore=VariableStore(),
+        action: str='CreateAction',
         task_resolved_spec: dict=dict()
     )->VariableStore:
-        raise Exception('Must be implemented/extended by client')
+        if persistence is None:
+            persistence = StatePersistence()
+        self.warm_up()
+        resource_pool = self.resource_pool
+        # Waiting for a resource must not block the event loop
+        resource = await asyncio.to_thread(resource_pool.acquire)
+        token = _leased_resource.set(resource)
+        try:
+            return await super().process_task_async(task=task, persistence=persistence, variable_store=variable_store, action=action, task_resolved_spec=task_resolved_spec)
+        finally:
+            _leased_resource.reset(token)
+            resource_pool.release(resource=resource)
+
+    def __deepcopy__(self, memo):
+        copied_task_processor = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied_task_processor
+        for name, value in self.__dict__.items():
+            if name in ('resource_pool', '_resource_pool_lock',):
+                continue
+            setattr(copied_task_processor, name, copy.deepcopy(value, memo))
+        copied_task_processor.resource_pool = None
+        copied_task_processor._resource_pool_lock = threading.Lock()
+        return copied_task_processor
+
+    def __getstate__(self)->dict:
+        state = dict(self.__dict__)
+        state.pop('resource_pool', None)
+        state.pop('_resource_pool_lock', None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.resource_pool = None
+        self._resource_pool_lock = threading.Lock()
+
+
+TASK_PROCESSOR_LIFECYCLES = ('Singleton', 'PerWorkflow', 'PerTask',)
 
 
 class TaskProcessStore:
     """A class that retains a collection of `TaskProcessor` instances with methods for quickly retrieving an appropriate
     `TaskProcessor` instance for processing a given `Task`
 
+    ## Lifecycles
+
+    Each `TaskProcessor` is registered with one of the following lifecycles, which determines which instance is handed
+    out to process a `Task`:
+
+    | Lifecycle     | Instance handed out                                                                                   |
+    |---------------|-------------------------------------------------------------------------------------------------------|
+    | `PerTask`     | (default) A new copy of the registered instance for every `Task`                                      |
+    | `PerWorkflow` | A copy of the registered instance created for each workflow execution and shared by all its tasks     |
+    | `Singleton`   | The registered instance itself (it is not copied when registered), shared by all workflow executions  |
+
+    `Singleton` and `PerWorkflow` instances are shared by all tasks, and must therefore be thread safe when used with the
+    `ThreadPool` execution mode of the `WorkflowExecutor`.
+
+    The `warm_up()` method of each instance is called before it processes its first `Task`. The `shut_down()` method is
+    called after the `Task` was processed (`PerTask`), at the end of the workflow execution (`PerWorkflow`) or when the
+    `shut_down()` method of the `TaskProcessStore` is called (`Singleton`):
+
+    ```python
+    task_process_store = TaskProcessStore()
+    task_process_store.register_task_processor(task_processor=ApiClientTaskProcessor(), lifecycle='Singleton')
+    task_process_store.warm_up()        # Optional - otherwise warm up happens when the first Task is processed
+    ...
+    task_process_store.shut_down()
+    ```
+
+    The `WorkflowExecutor` calls `start_workflow()` and `end_workflow()` around each workflow execution, and the
+    `TaskProcessingHook` calls `release_task_processor()` after processing a `Task`.
+
     Attributes:
         task_processor_register: A dict that holds `TaskProcessor` instances
+        task_processor_lifecycles: A dict with the lifecycle of each registered `TaskProcessor`
     """
 
     def __init__(self) -> None:
@@ -1418,52 +4490,779 @@ class TaskProcessStore:
         instances of this class.
         """
         self.task_processor_register = dict()
+        self.task_processor_lifecycles = dict()
+        self._lock = threading.RLock()
+        self._warmed_up_singleton_api_versions = set()
+        self._workflow_task_processors = dict()
+        self._active_workflows_qty = 0
 
-    def register_task_processor(self, task_processor: TaskProcessor):
+    def register_task_processor(self, task_processor: TaskProcessor, lifecycle: str='PerTask'):
         """Method to add a `TaskProcessor` instance to the collection
 
         Args:
             task_processor: a `TaskProcessor` instance
+            lifecycle: A string (default="PerTask") with the lifecycle. See `TASK_PROCESSOR_LIFECYCLES`
 
         Returns:
             An updated instance of self
-        """
 
+        Raises:
+            Exception: When the lifecycle is not supported
+        """
+        if lifecycle not in TASK_PROCESSOR_LIFECYCLES:
+            logger.error('Task processor lifecycle "{}" is not supported. Use one of: {}'.format(lifecycle, TASK_PROCESSOR_LIFECYCLES))
+            raise Exception('Unsupported task processor lifecycle')
         if task_processor.api_version not in self.task_processor_register:
-            self.task_processor_register[task_processor.api_version] = copy.deepcopy(task_processor)
+            if lifecycle == 'Singleton':
+                self.task_processor_register[task_processor.api_version] = task_processor
+            else:
+                self.task_processor_register[task_processor.api_version] = copy.deepcopy(task_processor)
+            self.task_processor_lifecycles[task_processor.api_version] = lifecycle
         return self
     
     def get_task_processor(self, api_version: str)->TaskProcessor:
         """Method to get a `TaskProcessor` instance from the collection
 
+        The instance returned depends on the lifecycle with which the `TaskProcessor` was registered. Instances
+        obtained by this method should be passed to `release_task_processor()` when they are no longer required.
+
+        Args:
+            api_version: a string containing the desired API version
+
+        Returns:
+            An instance of the `TaskProcessor` matching the API version string
+
+        Raises:
+            Exception: Should no suitable `TaskProcessor` matching the API version string be found
+        """
+        if api_version not in self.task_processor_register:
+            raise Exception('No processor found for API "{}"'.format(api_version))
+        lifecycle = self.task_processor_lifecycles[api_version]
+        if lifecycle == 'Singleton':
+            return self._get_singleton_task_processor(api_version=api_version)
+        if lifecycle == 'PerWorkflow':
+            with self._lock:
+                if self._active_workflows_qty > 0:
+                    if api_version not in self._workflow_task_processors:
+                        task_processor = copy.deepcopy(self.task_processor_register[api_version])
+                        task_processor.warm_up()
+                        self._workflow_task_processors[api_version] = task_processor
+                    return self._workflow_task_processors[api_version]
+            # Outside of a workflow execution the instance is treated as a PerTask instance
+        task_processor = copy.deepcopy(self.task_processor_register[api_version])
+        task_processor.warm_up()
+        return task_processor
+    
+    def get_task_processor_for_task(self, task: Task)->TaskProcessor:
+        """Method to get a `TaskProcessor` instance from the collection
+
+        Args:
+            task: An instance of a `Task`
+
+        Returns:
+            An instance of the `TaskProcessor` matching the API version string from the `Task`
+
+        Raises:
+            Exception: Should no suitable `TaskProcessor` matching the API version be found
+        """
+        return self.get_task_processor(api_version=task.api_version)
+
+    def release_task_processor(self, task_processor: TaskProcessor):
+        """Releases an instance obtained from `get_task_processor()` or `get_task_processor_for_task()`
+
+        Only instances that are not shared (`PerTask` instances) are shut down.
+
+        Args:
+            task_processor: The `TaskProcessor` instance
+        """
+        with self._lock:
+            if task_processor is self.task_processor_register.get(task_processor.api_version):
+                return
+            if task_processor is self._workflow_task_processors.get(task_processor.api_version):
+                return
+        task_processor.shut_down()
+
+    def _get_singleton_task_processor(self, api_version: str)->TaskProcessor:
+        task_processor = self.task_processor_register[api_version]
+        if api_version not in self._warmed_up_singleton_api_versions:
+            with self._lock:
+                if api_version not in self._warmed_up_singleton_api_versions:
+                    task_processor.warm_up()
+                    self._warmed_up_singleton_api_versions.add(api_version)
+        return task_processor
+
+    def warm_up(self):
+        """Warms up all `Singleton` instances that were not yet warmed up
+
+        Returns:
+            An updated instance of self
+        """
+        for api_version, lifecycle in list(self.task_processor_lifecycles.items()):
+            if lifecycle == 'Singleton':
+                self._get_singleton_task_processor(api_version=api_version)
+        return self
+
+    def start_workflow(self):
+        """Marks the start of a workflow execution. `PerWorkflow` instances are created as they are needed."""
+        with self._lock:
+            self._active_workflows_qty += 1
+
+    def end_workflow(self):
+        """Marks the end of a workflow execution.
+
+        Once no workflow execution is active anymore, all `PerWorkflow` instances are shut down.
+        """
+        with self._lock:
+            self._active_workflows_qty = max(0, self._active_workflows_qty - 1)
+            if self._active_workflows_qty > 0:
+                return
+            workflow_task_processors = list(self._workflow_task_processors.values())
+            self._workflow_task_processors = dict()
+        self._shut_down_task_processors(task_processors=workflow_task_processors)
+
+    def shut_down(self):
+        """Shuts down all `Singleton` and `PerWorkflow` instances that were warmed up
+
+        Singletons will be warmed up again when they are next used.
+
+        Returns:
+            An updated instance of self
+        """
+        with self._lock:
+            task_processors = list(self._workflow_task_processors.values())
+            self._workflow_task_processors = dict()
+            for api_version in self._warmed_up_singleton_api_versions:
+                task_processors.append(self.task_processor_register[api_version])
+            self._warmed_up_singleton_api_versions = set()
+        self._shut_down_task_processors(task_processors=task_processors)
+        return self
+
+    def _shut_down_task_processors(self, task_processors: list):
+        task_processor: TaskProcessor
+        for task_processor in task_processors:
+            try:
+                task_processor.shut_down()
+            except:
+                logger.error('Shut down of task processor "{}" failed: {}'.format(task_processor.api_version, traceback.format_exc()))
+
+    def __getstate__(self)->dict:
+        # Only the registrations are transferred (for example to process pool workers) - never any live instances
+        return {
+            'task_processor_register': self.task_processor_register,
+            'task_processor_lifecycles': self.task_processor_lifecycles,
+        }
+
+    def __setstate__(self, state: dict):
+        self.__init__()
+        self.task_processor_register = state['task_processor_register']
+        self.task_processor_lifecycles = state['task_processor_lifecycles']
+
+
+class _RemoteStatePersistence(StatePersistence):
+    # Holds a snapshot of the state of a single Task where the Task is processed remotely
+
+    def __init__(self, state: dict):
+        super().__init__(load_on_init=False)
+        self.state_cache = state
+
+    def load(self, on_failure: object=False)->bool:
+        return True
+
+    def load_objects_state(self, object_identifiers: list)->dict:
+        return dict()
+
+    def commit(self):
+        pass
+
+
+def _process_work(task_process_store: TaskProcessStore, work: dict)->dict:
+    # Processes a Task prepared by _RemoteTaskProcessor in a worker process or on a worker node
+    persistence = _RemoteStatePersistence(state=work['PersistenceState'])
+    variable_store = VariableStore()
+    variable_store.variable_store = work['Variables']
+    event_journal = EventJournal()
+    event_journal_token = _active_event_journal.set(event_journal)
+    task_processor = task_process_store.get_task_processor_for_task(task=work['Task'])
+    try:
+        variable_store = task_processor.process_task(
+            task=work['Task'],
+            persistence=persistence,
+            variable_store=variable_store,
+            action=work['Action'],
+            task_resolved_spec=work['TaskResolvedSpec']
+        )
+    finally:
+        task_process_store.release_task_processor(task_processor=task_processor)
+        _active_event_journal.reset(event_journal_token)
+    return {
+        'Variables': {variable_name: variable_store.variable_store.get_shared_value(variable_name) for variable_name in variable_store.variable_store},
+        'State': persistence.state_cache,
+        'Events': event_journal.get_events(),
+    }
+
+
+_process_pool_worker_task_process_store = None
+
+
+def _initialize_process_pool_worker(task_process_store: TaskProcessStore):
+    global _process_pool_worker_task_process_store
+    _process_pool_worker_task_process_store = task_process_store
+    # PerWorkflow instances live for as long as the worker process
+    task_process_store.start_workflow()
+    task_process_store.warm_up()
+    multiprocessing.util.Finalize(None, _shut_down_process_pool_worker, exitpriority=10)
+
+
+def _shut_down_process_pool_worker():
+    _process_pool_worker_task_process_store.end_workflow()
+    _process_pool_worker_task_process_store.shut_down()
+
+
+def _process_work_in_process_pool_worker(work: dict)->dict:
+    return _process_work(task_process_store=_process_pool_worker_task_process_store, work=work)
+
+
+class _RemoteTaskProcessor(TaskProcessor):
+    # Stands in for the registered TaskProcessor in the WorkflowExecutor and has the Task processed elsewhere. Only the
+    # data the Task requires is sent, and the variables, state and events produced are merged on return.
+
+    def process_task(
+        self,
+        task: Task,
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        action: str='CreateAction',
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        variable_name_prefixes = {'{}:'.format(task.task_id),}
+        for raw_key in task.get_spec_template().placeholder_names:
+            variable_name_prefixes.add('{}:'.format(_parse_variable_placeholder(raw_key=raw_key)[0]))
+        variable_name_prefixes = tuple(variable_name_prefixes)
+        resolved_spec_variable_name = 'ResolvedSpec:{}'.format(task.task_id)
+        variables = dict()
+        for variable_name in variable_store.variable_store:
+            if variable_name.startswith(variable_name_prefixes) is True or variable_name == resolved_spec_variable_name:
+                variables[variable_name] = variable_store.variable_store.get_shared_value(variable_name)
+        state_prefix = '{}:'.format(task.task_id)
+        persistence_state = dict()
+        for object_identifier in list(persistence.state_cache.keys()):
+            if object_identifier.startswith(state_prefix) is True:
+                persistence_state[object_identifier] = persistence.state_cache[object_identifier]
+
+        result = self._process_work_remotely(
+            task=task,
+            work={
+                'Task': self._get_transferable_task(task=task),
+                'PersistenceState': persistence_state,
+                'Variables': variables,
+                'Action': action,
+                'TaskResolvedSpec': task_resolved_spec,
+            }
+        )
+
+        updated_variable_store = copy.deepcopy(variable_store)
+        for variable_name in variables:
+            if variable_name not in result['Variables']:
+                del updated_variable_store.variable_store[variable_name]
+        for variable_name, value in result['Variables'].items():
+            updated_variable_store.add_variable(variable_name=variable_name, value=value, copy_value=False)
+        for object_identifier, data in result['State'].items():
+            if persistence_state.get(object_identifier) != data:
+                persistence.update_object_state(object_identifier=object_identifier, data=data)
+        event_journal: EventJournal
+        event_journal = _active_event_journal.get()
+        if event_journal is not None:
+            for event in result['Events']:
+                event_journal.add_event(
+                    task_id=event['TaskId'],
+                    event_label=event['EventLabel'],
+                    event_description=event['EventDescription'],
+                    event_timestamp=event['EventTimestamp']
+                )
+        return updated_variable_store
+
+    def _process_work_remotely(self, task: Task, work: dict)->dict:
+        raise Exception('Must be implemented')
+
+    def _get_transferable_task(self, task: Task)->Task:
+        if getattr(task.state, 'spec_blob_store', None) is None:
+            return task
+        # Avoid transferring the complete shared blob store with every Task
+        transferable_task = task.clone(state_only=True)
+        transferable_task.state = TaskState(
+            manifest_spec=task.state.raw_spec,
+            applied_spec=task.state.applied_spec,
+            resolved_spec=task.state.current_resolved_spec,
+            manifest_metadata=task.state.raw_metadata,
+            report_label=task.state.report_label,
+            created_timestamp=task.state.created_timestamp,
+            applied_resources_checksum=task.state.applied_resources_checksum,
+            current_resource_checksum=task.state.current_resource_checksum
+        )
+        return transferable_task
+
+
+class _ProcessPoolTaskProcessor(_RemoteTaskProcessor):
+
+    def __init__(self, api_version: str, process_pool: concurrent.futures.ProcessPoolExecutor):
+        super().__init__(api_version)
+        self.process_pool = process_pool
+
+    def _process_work_remotely(self, task: Task, work: dict)->dict:
+        return self.process_pool.submit(_process_work_in_process_pool_worker, work).result()
+
+
+class _WorkQueueTaskProcessor(_RemoteTaskProcessor):
+
+    def __init__(self, api_version: str, work_queue: object, workflow_execution_id: str):
+        super().__init__(api_version)
+        self.work_queue = work_queue
+        self.workflow_execution_id = workflow_execution_id
+
+    def _process_work_remotely(self, task: Task, work: dict)->dict:
+        work_item_id = '{}:{}'.format(self.workflow_execution_id, task.task_id)
+        self.work_queue.publish(work_item_id=work_item_id, payload=work)
+        deadline = None
+        if self.work_queue.outcome_timeout is not None:
+            deadline = time.monotonic() + self.work_queue.outcome_timeout
+        outcome = self.work_queue.get_outcome(work_item_id=work_item_id)
+        while outcome is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                # Without the work item, a worker that still picks it up can not record an outcome
+                self.work_queue.remove(work_item_id=work_item_id)
+                logger.error('Task "{}" timed out after {} seconds waiting for a worker to complete it'.format(task.task_id, self.work_queue.outcome_timeout))
+                raise Exception('Task "{}" timed out waiting for a worker'.format(task.task_id))
+            time.sleep(self.work_queue.poll_interval)
+            self.work_queue.requeue_expired_leases()
+            outcome = self.work_queue.get_outcome(work_item_id=work_item_id)
+        self.work_queue.remove(work_item_id=work_item_id)
+        if outcome['Status'] != 'Completed':
+            logger.error('Task "{}" failed on worker "{}": {}'.format(task.task_id, outcome['WorkerId'], outcome['Error']))
+            raise Exception('Task "{}" failed on worker "{}"'.format(task.task_id, outcome['WorkerId']))
+        return outcome['Result']
+
+
+class _RemoteTaskProcessStore(TaskProcessStore):
+    # Hands out stand in processors that have tasks processed elsewhere
+
+    def __init__(self, task_process_store: TaskProcessStore, create_task_processor: object):
+        super().__init__()
+        self.task_processor_register = task_process_store.task_processor_register
+        self.task_processor_lifecycles = task_process_store.task_processor_lifecycles
+        self.create_task_processor = create_task_processor
+
+    def get_task_processor(self, api_version: str)->TaskProcessor:
+        if api_version not in self.task_processor_register:
+            raise Exception('No processor found for API "{}"'.format(api_version))
+        return self.create_task_processor(api_version)
+
+    def release_task_processor(self, task_processor: TaskProcessor):
+        pass
+
+
+class WorkQueue:
+    """A queue of `Task` work items, shared by the `WorkflowExecutor` and any number of `WorkQueueWorker` instances,
+    typically on other nodes.
+
+    This class defines the interface that a work queue (or message broker) implementation must provide. The
+    `SqliteWorkQueue` is a complete implementation for workers that can access a shared file system, for example on a
+    single host.
+
+    Each work item is leased by one worker at a time. A lease expires after the lease duration, unless the worker
+    extends it with a heartbeat. Work items of which the lease expired are made available to other workers again, until
+    the work item was leased `max_attempts` times, after which it is failed.
+
+    The `WorkflowExecutor` waits at most `outcome_timeout` seconds for the outcome of a work item, after which the work
+    item is removed and the `Task` is failed. This ensures a workflow execution ends when no workers are running. The
+    timeout must therefore exceed the longest time a `Task` may wait for a worker plus its processing time.
+
+    Work item outcomes are dicts with the following keys:
+
+    * `Status` - Either `Completed` or `Failed`
+    * `Result` - The result supplied by the worker when the work item was completed
+    * `Error` - A string describing the failure
+    * `WorkerId` - The identifier of the worker that last leased the work item
+
+    Attributes:
+        configuration: A dict holding configuration data
+        poll_interval: A float with the number of seconds to wait before checking for work or outcomes again
+        max_attempts: An integer with the number of times a work item may be leased
+        outcome_timeout: A float with the number of seconds to wait for the outcome of a work item, or `None` to wait indefinitely
+    """
+
+    def __init__(self, configuration: dict=dict()):
+        self.configuration = configuration
+        self.poll_interval = float(configuration.get('poll_interval', 0.5))
+        self.max_attempts = int(configuration.get('max_attempts', 3))
+        self.outcome_timeout = configuration.get('outcome_timeout', 3600.0)
+        if self.outcome_timeout is not None:
+            self.outcome_timeout = float(self.outcome_timeout)
+
+    def publish(self, work_item_id: str, payload: dict):
+        """Adds a work item to the queue
+
+        Args:
+            work_item_id: A string with the unique identifier of the work item
+            payload: A dict with the work to be done
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def lease(self, worker_id: str, lease_duration: float)->dict:
+        """Leases the oldest available work item
+
+        Args:
+            worker_id: A string identifying the worker
+            lease_duration: A float with the number of seconds after which the lease expires
+
+        Returns:
+            A dict with the keys `WorkItemId`, `Payload` and `Attempts`, or `None` if no work item is available
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def heartbeat(self, work_item_id: str, worker_id: str, lease_duration: float)->bool:
+        """Extends the lease of a work item
+
+        Args:
+            work_item_id: A string with the identifier of the work item
+            worker_id: A string identifying the worker holding the lease
+            lease_duration: A float with the number of seconds from now after which the lease expires
+
+        Returns:
+            A boolean `True` if the worker still holds the lease
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def complete(self, work_item_id: str, worker_id: str, result: dict)->bool:
+        """Records the successful outcome of a leased work item
+
+        Args:
+            work_item_id: A string with the identifier of the work item
+            worker_id: A string identifying the worker holding the lease
+            result: A dict with the result
+
+        Returns:
+            A boolean `True` if the outcome was recorded, or `False` if the worker no longer held the lease
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def fail(self, work_item_id: str, worker_id: str, error: str)->bool:
+        """Records the failure of a leased work item
+
+        Args:
+            work_item_id: A string with the identifier of the work item
+            worker_id: A string identifying the worker holding the lease
+            error: A string describing the failure
+
+        Returns:
+            A boolean `True` if the outcome was recorded, or `False` if the worker no longer held the lease
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def get_outcome(self, work_item_id: str)->dict:
+        """Retrieves the outcome of a work item
+
+        Args:
+            work_item_id: A string with the identifier of the work item
+
+        Returns:
+            A dict with the outcome, or `None` if the work item is not yet completed or failed
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def requeue_expired_leases(self)->int:
+        """Makes work items of which the lease expired available again, or fails them after `max_attempts` leases
+
+        Returns:
+            An integer with the number of work items affected
+        """
+        raise Exception('Must be implemented/extended by client')
+
+    def remove(self, work_item_id: str):
+        """Removes a work item from the queue
+
+        Args:
+            work_item_id: A string with the identifier of the work item
+        """
+        raise Exception('Must be implemented/extended by client')
+
+
+class SqliteWorkQueue(WorkQueue):
+    """A `WorkQueue` implementation that stores work items in a SQLite database.
+
+    The database file is the broker: the `WorkflowExecutor` and all `WorkQueueWorker` instances open the same file, and
+    SQLite's file locking ensures every work item is leased by only one worker. Since SQLite relies on file locks, all
+    workers must run on the same host, or use a file system with reliable locking.
+
+    Payloads and results are stored with `pickle`, so the database must only be shared with trusted workers.
+
+    The following configuration is supported:
+
+    | Key               | Default       | Description                                                                 |
+    |-------------------|---------------|-----------------------------------------------------------------------------|
+    | `path`            | (required)    | Path to the SQLite database file                                            |
+    | `table_name`      | `work_items`  | Name of the table holding the work items                                    |
+    | `poll_interval`   | `0.5`         | Seconds to wait before checking for work or outcomes again                  |
+    | `max_attempts`    | `3`           | Number of times a work item may be leased before it is failed               |
+    | `outcome_timeout` | `3600`        | Seconds to wait for the outcome of a work item (`None` waits indefinitely)  |
+
+    Attributes:
+        configuration: A dict holding configuration data
+        poll_interval: A float with the number of seconds to wait before checking for work or outcomes again
+        max_attempts: An integer with the number of times a work item may be leased
+        outcome_timeout: A float with the number of seconds to wait for the outcome of a work item, or `None` to wait indefinitely
+    """
+
+    def __init__(self, configuration: dict=dict()):
+        super().__init__(configuration=configuration)
+        if 'path' not in configuration:
+            raise Exception('The path of the work queue database is required')
+        if re.fullmatch(r'\w+', configuration.get('table_name', 'work_items')) is None:
+            raise Exception('Invalid table name "{}"'.format(configuration.get('table_name')))
+        self._table_name = configuration.get('table_name', 'work_items')
+        self._lock = threading.RLock()
+        # Transactions are managed explicitly, so that leases can be taken with an immediate write lock
+        self._connection = sqlite3.connect(configuration['path'], timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS {} ('
+            'work_item_id TEXT PRIMARY KEY NOT NULL, '
+            'payload BLOB NOT NULL, '
+            'status TEXT NOT NULL, '
+            'worker_id TEXT, '
+            'lease_expires_at REAL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'result BLOB, '
+            'error TEXT, '
+            'published_at REAL NOT NULL'
+            ')'.format(self._table_name)
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS {0}_status ON {0} (status, published_at)'.format(self._table_name))
+
+    def _execute_in_transaction(self, function: object)->object:
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                return_value = function()
+            except:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+            return return_value
+
+    def publish(self, work_item_id: str, payload: dict):
+        with self._lock:
+            self._connection.execute(
+                'INSERT INTO {} (work_item_id, payload, status, published_at) VALUES (?, ?, ?, ?)'.format(self._table_name),
+                (work_item_id, pickle.dumps(payload), 'Queued', time.time(),)
+            )
+
+    def lease(self, worker_id: str, lease_duration: float)->dict:
+        def lease_oldest_work_item()->dict:
+            self._requeue_expired_leases()
+            row = self._connection.execute(
+                'SELECT work_item_id, payload, attempts FROM {} WHERE status = ? ORDER BY published_at LIMIT 1'.format(self._table_name),
+                ('Queued',)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                'UPDATE {} SET status = ?, worker_id = ?, lease_expires_at = ?, attempts = attempts + 1 WHERE work_item_id = ?'.format(self._table_name),
+                ('Leased', worker_id, time.time() + lease_duration, row[0],)
+            )
+            return {'WorkItemId': row[0], 'Payload': pickle.loads(row[1]), 'Attempts': row[2] + 1}
+        return self._execute_in_transaction(function=lease_oldest_work_item)
+
+    def heartbeat(self, work_item_id: str, worker_id: str, lease_duration: float)->bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                'UPDATE {} SET lease_expires_at = ? WHERE work_item_id = ? AND worker_id = ? AND status = ?'.format(self._table_name),
+                (time.time() + lease_duration, work_item_id, worker_id, 'Leased',)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, work_item_id: str, worker_id: str, result: dict)->bool:
+        return self._record_outcome(work_item_id=work_item_id, worker_id=worker_id, status='Completed', result=pickle.dumps(result), error=None)
+
+    def fail(self, work_item_id: str, worker_id: str, error: str)->bool:
+        return self._record_outcome(work_item_id=work_item_id, worker_id=worker_id, status='Failed', result=None, error=error)
+
+    def _record_outcome(self, work_item_id: str, worker_id: str, status: str, result: bytes, error: str)->bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                'UPDATE {} SET status = ?, result = ?, error = ?, lease_expires_at = NULL WHERE work_item_id = ? AND worker_id = ? AND status = ?'.format(self._table_name),
+                (status, result, error, work_item_id, worker_id, 'Leased',)
+            )
+            if cursor.rowcount != 1:
+                logger.warning('Worker "{}" no longer holds the lease of work item "{}" - outcome discarded'.format(worker_id, work_item_id))
+                return False
+            return True
+
+    def get_outcome(self, work_item_id: str)->dict:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT status, result, error, worker_id FROM {} WHERE work_item_id = ?'.format(self._table_name),
+                (work_item_id,)
+            ).fetchone()
+        if row is None or row[0] not in ('Completed', 'Failed',):
+            return None
+        result = None
+        if row[1] is not None:
+            result = pickle.loads(row[1])
+        return {'Status': row[0], 'Result': result, 'Error': row[2], 'WorkerId': row[3]}
+
+    def requeue_expired_leases(self)->int:
+        return self._execute_in_transaction(function=self._requeue_expired_leases)
+
+    def _requeue_expired_leases(self)->int:
+        now = time.time()
+        failed_qty = self._connection.execute(
+            'UPDATE {} SET status = ?, error = ? WHERE status = ? AND lease_expires_at < ? AND attempts >= ?'.format(self._table_name),
+            ('Failed', 'Lease expired after {} attempts'.format(self.max_attempts), 'Leased', now, self.max_attempts,)
+        ).rowcount
+        requeued_qty = self._connection.execute(
+            'UPDATE {} SET status = ?, worker_id = NULL, lease_expires_at = NULL WHERE status = ? AND lease_expires_at < ?'.format(self._table_name),
+            ('Queued', 'Leased', now,)
+        ).rowcount
+        if failed_qty + requeued_qty > 0:
+            logger.warning('Leases of {} work items expired: {} requeued and {} failed'.format(failed_qty + requeued_qty, requeued_qty, failed_qty))
+        return failed_qty + requeued_qty
+
+    def remove(self, work_item_id: str):
+        with self._lock:
+            self._connection.execute('DELETE FROM {} WHERE work_item_id = ?'.format(self._table_name), (work_item_id,))
+
+    def close(self):
+        """Closes the database connection
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class WorkQueueWorker:
+    """Processes `Task` work items published on a `WorkQueue` by a `WorkflowExecutor` in the `WorkQueue` execution mode.
+
+    A worker is typically run in its own process, on any node with access to the work queue:
+
+    ```python
+    task_process_store = TaskProcessStore()
+    task_process_store.register_task_processor(task_processor=MyTaskProcessor(), lifecycle='Singleton')
+    worker = WorkQueueWorker(work_queue=SqliteWorkQueue(configuration={'path': '/shared/work-queue.db'}), task_process_store=task_process_store)
+    worker.run()
+    ```
+
+    While a work item is processed, the lease is extended every `heartbeat_interval` seconds. Should the worker die, the
+    lease expires and the work item is made available to other workers again.
+
+    `PerWorkflow` instances of `TaskProcessor` implementations live for the duration of `run()`.
+
+    Attributes:
+        work_queue: The `WorkQueue`
+        task_process_store: The `TaskProcessStore` with the `TaskProcessor` implementations
+        worker_id: A string identifying the worker
+        lease_duration: A float with the number of seconds after which a lease expires without heartbeats
+        heartbeat_interval: A float with the number of seconds between heartbeats
+    """
+
+    def __init__(
+        self,
+        work_queue: WorkQueue,
+        task_process_store: TaskProcessStore,
+        worker_id: str=None,
+        lease_duration: float=30.0,
+        heartbeat_interval: float=10.0
+    ):
+        """Initializes the worker
+
         Args:
-            api_version: a string containing the desired API version
-
-        Returns:
-            An instance of the `TaskProcessor` matching the API version string
+            work_queue: The `WorkQueue`
+            task_process_store: The `TaskProcessStore` with the `TaskProcessor` implementations
+            worker_id: An optional string identifying the worker. By default, the host name, process ID and a random suffix is used
+            lease_duration: A float (default=30.0) with the number of seconds after which a lease expires without heartbeats
+            heartbeat_interval: A float (default=10.0) with the number of seconds between heartbeats
 
         Raises:
-            Exception: Should no suitable `TaskProcessor` matching the API version string be found
+            Exception: When the `heartbeat_interval` is not less than the `lease_duration`
         """
-        if api_version not in self.task_processor_register:
-            raise Exception('No processor found for API "{}"'.format(api_version))
-        return copy.deepcopy(self.task_processor_register[api_version])
-    
-    def get_task_processor_for_task(self, task: Task)->TaskProcessor:
-        """Method to get a `TaskProcessor` instance from the collection
+        if heartbeat_interval >= lease_duration:
+            raise Exception('The heartbeat interval must be less than the lease duration')
+        self.work_queue = work_queue
+        self.task_process_store = task_process_store
+        self.worker_id = worker_id
+        if self.worker_id is None:
+            self.worker_id = '{}:{}:{}'.format(socket.gethostname(), os.getpid(), uuid.uuid4().hex[0:8])
+        self.lease_duration = lease_duration
+        self.heartbeat_interval = heartbeat_interval
 
-        Args:
-            task: An instance of a `Task`
+    def process_next_work_item(self)->bool:
+        """Leases and processes the oldest available work item
 
         Returns:
-            An instance of the `TaskProcessor` matching the API version string from the `Task`
+            A boolean `True` if a work item was processed, or `False` if no work item was available
+        """
+        work_item = self.work_queue.lease(worker_id=self.worker_id, lease_duration=self.lease_duration)
+        if work_item is None:
+            return False
+        logger.info('Worker "{}" processing work item "{}" (attempt {})'.format(self.worker_id, work_item['WorkItemId'], work_item['Attempts']))
+        heartbeats_stopped = threading.Event()
+        heartbeat_thread = threading.Thread(
+            target=self._send_heartbeats,
+            args=(work_item['WorkItemId'], heartbeats_stopped,),
+            daemon=True
+        )
+        heartbeat_thread.start()
+        try:
+            result = _process_work(task_process_store=self.task_process_store, work=work_item['Payload'])
+        except:
+            heartbeats_stopped.set()
+            heartbeat_thread.join()
+            self.work_queue.fail(work_item_id=work_item['WorkItemId'], worker_id=self.worker_id, error=traceback.format_exc())
+            return True
+        heartbeats_stopped.set()
+        heartbeat_thread.join()
+        self.work_queue.complete(work_item_id=work_item['WorkItemId'], worker_id=self.worker_id, result=result)
+        return True
 
-        Raises:
-            Exception: Should no suitable `TaskProcessor` matching the API version be found
+    def _send_heartbeats(self, work_item_id: str, heartbeats_stopped: threading.Event):
+        while heartbeats_stopped.wait(timeout=self.heartbeat_interval) is False:
+            if self.work_queue.heartbeat(work_item_id=work_item_id, worker_id=self.worker_id, lease_duration=self.lease_duration) is False:
+                logger.warning('Worker "{}" lost the lease of work item "{}"'.format(self.worker_id, work_item_id))
+                return
+
+    def run(self, stop_event: threading.Event=None, max_work_items: int=None, max_idle_time: float=None)->int:
+        """Processes work items until stopped
+
+        Args:
+            stop_event: An optional `threading.Event` that stops the worker when set
+            max_work_items: An optional integer with the number of work items after which the worker stops
+            max_idle_time: An optional float with the number of seconds without any work after which the worker stops
+
+        Returns:
+            An integer with the number of work items processed
         """
-        if task.api_version not in self.task_processor_register:
-            raise Exception('No processor found for API "{}"'.format(task.api_version))
-        return copy.deepcopy(self.task_processor_register[task.api_version])
+        processed_qty = 0
+        idle_since = time.monotonic()
+        self.task_process_store.start_workflow()
+        self.task_process_store.warm_up()
+        try:
+            while stop_event is None or stop_event.is_set() is False:
+                if max_work_items is not None and processed_qty >= max_work_items:
+                    break
+                if self.process_next_work_item() is True:
+                    processed_qty += 1
+                    idle_since = time.monotonic()
+                    continue
+                if max_idle_time is not None and time.monotonic() - idle_since >= max_idle_time:
+                    break
+                if stop_event is not None:
+                    stop_event.wait(timeout=self.work_queue.poll_interval)
+                else:
+                    time.sleep(self.work_queue.poll_interval)
+        finally:
+            self.task_process_store.end_workflow()
+            self.task_process_store.shut_down()
+        return processed_qty
 
 
 class Hook:
@@ -1539,6 +5338,46 @@ class Hook:
         """
         raise Exception('Hook must be implemented/extended by client')
 
+    async def run_async(
+        self,
+        task: Task=None,
+        parameters: dict=dict(),
+        parameter_validator: ParameterValidation=ParameterValidation(constraints=None),
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_process_store: TaskProcessStore=TaskProcessStore()
+    )->VariableStore:
+        """Asynchronous variant of `run()`, used by the `AsyncWorkflowExecutor`.
+
+        The default implementation calls `run()` in a separate thread, which means any existing `Hook` implementation
+        can be used as is. Hooks performing I/O can override this method with a native coroutine.
+
+        Args:
+            task: The `Task` on which the `Hook` may need to work
+            parameters: A dict with additional parameters.
+            parameter_validator: An instance of `ParameterValidation`
+            persistence: The `StatePersistence` implementation for state persistence. By default a new `StatePersistence` is created.
+            variable_store: The current `VariableStore` instance
+            task_process_store: The `TaskProcessStore`, used to retrieve `TaskProcessor` instances for the `Task`, if required.
+
+        Returns:
+            An updated `VariableStore`
+
+        Raises:
+            Exception: As determined by the implementation
+        """
+        if persistence is None:
+            persistence = StatePersistence()
+        return await asyncio.to_thread(
+            self.run,
+            task=task,
+            parameters=parameters,
+            parameter_validator=parameter_validator,
+            persistence=persistence,
+            variable_store=variable_store,
+            task_process_store=task_process_store
+        )
+
 
 class TaskProcessingHook(Hook):
     """
@@ -1563,19 +5402,55 @@ class TaskProcessingHook(Hook):
         task_process_store: TaskProcessStore=TaskProcessStore()
     )->VariableStore:
         task_processor = task_process_store.get_task_processor_for_task(task=task)
-        task_resolved_spec = copy.deepcopy(task.spec)
+        try:
+            task_resolved_spec = self._get_task_resolved_spec(task=task, variable_store=variable_store)
+            if parameter_validator.validation_passed(parameters=parameters) is True:
+                with _trace_span(name=parameters['Action'], category='Action', task_id=task.task_id), _measure_duration(metric_key='ActionDuration', action=parameters['Action'], api_version=task.api_version):
+                    variable_store = task_processor.process_task(
+                        task=task,
+                        persistence=persistence,
+                        variable_store=copy.deepcopy(variable_store),
+                        action=parameters['Action'],
+                        task_resolved_spec=task_resolved_spec
+                    )
+        finally:
+            task_process_store.release_task_processor(task_processor=task_processor)
+        return copy.deepcopy(variable_store)
+
+    async def run_async(
+        self,
+        task: Task=None,
+        parameters: dict=dict(),
+        parameter_validator: ParameterValidation=TaskProcessingActionParameterValidation(constraints=None),
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_process_store: TaskProcessStore=TaskProcessStore()
+    )->VariableStore:
+        if persistence is None:
+            persistence = StatePersistence()
+        task_processor = task_process_store.get_task_processor_for_task(task=task)
+        try:
+            task_resolved_spec = self._get_task_resolved_spec(task=task, variable_store=variable_store)
+            if parameter_validator.validation_passed(parameters=parameters) is True:
+                with _trace_span(name=parameters['Action'], category='Action', task_id=task.task_id), _measure_duration(metric_key='ActionDuration', action=parameters['Action'], api_version=task.api_version):
+                    variable_store = await task_processor.process_task_async(
+                        task=task,
+                        persistence=persistence,
+                        variable_store=copy.deepcopy(variable_store),
+                        action=parameters['Action'],
+                        task_resolved_spec=task_resolved_spec
+                    )
+        finally:
+            task_process_store.release_task_processor(task_processor=task_processor)
+        return copy.deepcopy(variable_store)
+
+    def _get_task_resolved_spec(self, task: Task, variable_store: VariableStore)->dict:
         if 'ResolvedSpec:{}'.format(task.task_id) in variable_store.variable_store:
-            task_resolved_spec = copy.deepcopy(variable_store.variable_store['ResolvedSpec:{}'.format(task.task_id)])
+            task_resolved_spec = variable_store.get_variable(variable_name='ResolvedSpec:{}'.format(task.task_id))
+        else:
+            task_resolved_spec = copy.deepcopy(task.spec)
         self._log(message='task_resolved_spec: {}'.format(json.dumps(task_resolved_spec, default=str)), task=task, level='debug')
-        if parameter_validator.validation_passed(parameters=parameters) is True:
-            variable_store = task_processor.process_task(
-                task=task,
-                persistence=persistence,
-                variable_store=copy.deepcopy(variable_store),
-                action=parameters['Action'],
-                task_resolved_spec=task_resolved_spec
-            )
-        return copy.deepcopy(variable_store)
+        return task_resolved_spec
 
 
 class ResolveTaskSpecVariablesHook(Hook):
@@ -1663,54 +5538,15 @@ class ResolveTaskSpecVariablesHook(Hook):
         result = ''
         self._log(message='       raw_key: {}'.format(raw_key), task=task, level='debug')
         if raw_key.startswith('${VAR:'):                # ${VAR:MyId:SubKey1:SubKey2}        
-            key_parts = raw_key.split(':')              # ['${VAR', 'MyId', 'SubKey1', 'SubKey2}']
-            self._log(message='         key_parts      : {}'.format(key_parts), task=task, level='debug')
-            target_task_id = key_parts[1]               # MyId
-            target_index = ':'.join(key_parts[2:])      # SubKey1:SubKey2
-            target_index = target_index.replace('}', '')
+            target_task_id, target_index = _parse_variable_placeholder(raw_key=raw_key)     # MyId, SubKey1:SubKey2
             self._log(message='         target_task_id : {}'.format(target_task_id), task=task, level='debug')
             self._log(message='         target_index   : {}'.format(target_index), task=task, level='debug')
-            potential_keys = list()
-            potential_keys.append(
-                '{}:{}:{}:{}'.format(       # MyId:a_command:a_context:SubKey1:SubKey2 - variable bound to command and context
-                    target_task_id,
-                    command,
-                    context,
-                    target_index
-                )
-            )
-            potential_keys.append(
-                '{}:{}::{}'.format(       # MyId:a_command:a_context:SubKey1:SubKey2 - variable bound to command bot not context
-                    target_task_id,
-                    command,
-                    target_index
-                )
-            )
-            potential_keys.append(
-                '{}::{}:{}'.format(       # MyId:a_command:a_context:SubKey1:SubKey2 - variable bound to context bot not command
-                    target_task_id,
-                    context,
-                    target_index
-                )
-            )
-            potential_keys.append(
-                '{}:{}'.format(             # MyId:SubKey1:SubKey2 - variable not bound to any command or context
-                    target_task_id,
-                    target_index
-                )
+            result = variable_store.resolve_variable(
+                task_id=target_task_id,
+                variable_name=target_index,
+                command=command,
+                context=context
             )
-
-            for lookup_key_base in potential_keys:
-
-                self._log(message='         Looking for a key that looks like "{}" in key_value_store'.format(lookup_key_base), task=task, level='debug')
-                #self._log(message='           Potential keys: {}'.format(hook_name, list(variable_store.variable_store.keys())), task=task, level='debug')
-                for key in list(variable_store.variable_store.keys()):
-                    self._log(message='           Looking for key "{}" in "{}"'.format(lookup_key_base, key), task=task, level='debug')
-                    if lookup_key_base in key:
-                        self._log(message='              Resolved key "{}" to swap out for reference variable "{}"'.format(key, raw_key), task=task, level='info')
-                        result = copy.deepcopy(variable_store.variable_store[key])
-                    else:
-                        self._log(message='              Key "{}" Not Found'.format(lookup_key_base), task=task, level='info')
         else:
             raise Exception('Oops - the raw key is not what we expected: raw_key: "{}"'.format(raw_key))
         self._log(message='         Returning final result: "{}"'.format(result), task=task, level='debug')
@@ -1719,37 +5555,21 @@ class ResolveTaskSpecVariablesHook(Hook):
     def _analyse_data(self, task: Task, data: object, variable_store:VariableStore, command:str, context:str)->dict:
         self._log(message='   Analyzing data', task=task, level='info')
         self._log(message='   Inspecting object: {}'.format(data), task=task, level='debug')
-        if data is None:
-            return data
-        modified_data = None
-        if isinstance(data, str) is True:
-            modified_data: str = copy.deepcopy(data)
-            # matches = re.findall('(\$\{VAR:[\w|\-|\s|:|.|;|_]+\})', 'wc -l ${VAR:prompt_output_path:RESULT} > ${VAR:prompt_output_path:RESULT}_STATS && rm -vf ${VAR:prompt_output_2_path:RESULT}')
-            # ['${VAR:prompt_output_path:RESULT}', '${VAR:prompt_output_path:RESULT}', '${VAR:prompt_output_2_path:RESULT}']
-            matches = re.findall('(\$\{VAR:[\w|\-|\s|:|.|;|_]+\})', data)
-            self._log(message='       matches: {}'.format(matches), task=task, level='debug')
-            for match in matches:
-                self._log(message='     Looking up value for variable placeholder "{}"'.format(match), task=task, level='debug')
-                final_value = self._lookup_value(
-                    raw_key=match,
-                    command=command,
-                    context=context,
-                    variable_store=variable_store,
-                    task=task
-                )
-                modified_data = modified_data.replace(match, final_value)
-        elif isinstance(data, dict) is True:
-            modified_data: dict = dict()
-            for key, val in data.items():
-                modified_data[key] = self._analyse_data(task=task, data=val, variable_store=variable_store, command=command, context=context)
-        elif self._is_iterable(data=data) is True:
-            modified_data: list = list()
-            for val in data:
-                modified_data.append(self._analyse_data(task=task, data=val, variable_store=variable_store, command=command, context=context))
-        else:
-            modified_data = copy.deepcopy(data)
+        return SpecTemplate(spec=data).render(
+            resolve_placeholder=self._placeholder_resolver(task=task, variable_store=variable_store, command=command, context=context)
+        )
 
-        return modified_data
+    def _placeholder_resolver(self, task: Task, variable_store: VariableStore, command: str, context: str)->object:
+        def resolve_placeholder(raw_key: str)->object:
+            self._log(message='     Looking up value for variable placeholder "{}"'.format(raw_key), task=task, level='debug')
+            return self._lookup_value(
+                raw_key=raw_key,
+                command=command,
+                context=context,
+                variable_store=variable_store,
+                task=task
+            )
+        return resolve_placeholder
 
     def run(
         self,
@@ -1777,15 +5597,13 @@ class ResolveTaskSpecVariablesHook(Hook):
                     if len(parameters['Context']) > 0:
                         context = parameters['Context']
 
+        # The rendered spec shares data with the template, which is safe as the variable store copies it on first read
         updated_variable_store.add_variable(
             variable_name='ResolvedSpec:{}'.format(task.task_id),
-            value=self._analyse_data(
-                task=task,
-                data=copy.deepcopy(task.spec),
-                variable_store=variable_store,
-                command=command,
-                context=context
-            )
+            value=task.get_spec_template().render(
+                resolve_placeholder=self._placeholder_resolver(task=task, variable_store=variable_store, command=command, context=context)
+            ),
+            copy_value=False
         ) 
         return updated_variable_store
 
@@ -1922,7 +5740,8 @@ class TaskPostProcessingStateUpdateHook(Hook):
             report_label=task.task_id,
             created_timestamp=data['create_timestamp'],
             applied_resources_checksum=data['resource_checksum'],
-            current_resource_checksum=data['resource_checksum']
+            current_resource_checksum=data['resource_checksum'],
+            spec_blob_store=getattr(task.state, 'spec_blob_store', None)
         )
 
         persistence.update_object_state(
@@ -1932,7 +5751,8 @@ class TaskPostProcessingStateUpdateHook(Hook):
                 include_applied_spec=True
             )
         )
-        persistence.commit()
+        with _measure_duration(metric_key='StateCommitDuration', operation='commit'):
+            persistence.commit()
 
         return updated_variable_store
 
@@ -2054,7 +5874,8 @@ class WorkflowExecutor:
     Step 1: Prepare the `VariableStore` and load all required variables that must be pre-loaded. This is especially 
             relevant for the `ResolveTaskSpecVariablesHook` to perform the variable substitution in`Task` specs.
 
-    Step 2: Initialize the `StatePersistence` implementation required.
+    Step 2: Initialize the `StatePersistence` implementation required. When the `StatePersistence` is in lazy mode, only
+            the state of the tasks to be processed is retrieved at the start of each workflow execution.
 
     Step 3: Prepare an instance of the `TaskProcessStore` class and add all required `TaskProcessor` instances. Each 
             `Task` must have a compatible `TaskProcessor` that knows how to process that `Task`.
@@ -2070,6 +5891,96 @@ class WorkflowExecutor:
 
     Step 8: Execute the workflow by calling the `execute_workflow()` method.
 
+    ## Execution Modes
+
+    | Execution mode | Description                                                                                                                                                           |
+    |----------------|-----------------------------------------------------------------------------------------------------------------------------------------------------------------------|
+    | `Sequential`   | (default) Each `Task` is processed one after the other in the order determined by `Tasks.get_task_names_in_order()`                                                   |
+    | `ThreadPool`   | Tasks of which all dependencies were processed are dispatched to a thread pool with `max_workers` threads. Ideal when `TaskProcessor` implementations are I/O bound. |
+    | `ProcessPool`  | As for `ThreadPool`, but the `TaskProcessor` runs in a pool of `max_workers` processes. Ideal when `TaskProcessor` implementations are CPU bound.                   |
+    | `WorkQueue`    | As for `ProcessPool`, but the `TaskProcessor` runs on `WorkQueueWorker` instances, possibly on other nodes, that lease tasks from the `work_queue`.                  |
+
+    In the `ThreadPool` mode each `Task` receives a snapshot of the `VariableStore` that includes all variables produced
+    by the tasks it depends on. After the hooks for a `Task` completed, the variables it added, changed or removed are
+    merged back into the workflow `VariableStore`. Tasks that are not dependent on each other must therefore not write
+    to the same variables. The `StatePersistence` and `TaskProcessor` implementations must also be thread safe.
+
+    When a `Task` fails in the `ThreadPool` mode, no new tasks will be dispatched. Tasks that are already running will
+    be allowed to complete before the failure is handled in the same way as in the `Sequential` mode.
+
+    In the `ProcessPool` mode, tasks are scheduled and all hooks are run in the same way as in the `ThreadPool` mode.
+    Only the `TaskProcessor.process_task()` call of the `TaskProcessingHook` is performed in a worker process, which
+    receives:
+
+    * The `Task` and its resolved spec
+    * The variables of the `Task` (named `<task_id>:...`) and of the tasks referenced by variables in the `spec`
+    * The persisted state of the `Task` (identifiers starting with `<task_id>:`)
+
+    Variables, state and events produced by the `TaskProcessor` are returned and merged in the parent process. Each
+    worker process receives a copy of the `TaskProcessStore` registrations when it starts, and the lifecycles of the
+    `TaskProcessor` instances apply per worker process (a `PerWorkflow` instance lives for as long as the worker). The
+    `Task`, variables, state and `TaskProcessor` instances must therefore be picklable, and `TaskProcessor` classes
+    must be importable by the worker processes, which are started with the `spawn` method.
+
+    The `WorkQueue` mode sends the same data, and expects the same of the `Task`, variables and state, but publishes
+    each `Task` on the `work_queue` and waits for its outcome. The `TaskProcessor` instances are those registered in
+    the `TaskProcessStore` of the `WorkQueueWorker` that leases the `Task`, and only the API versions registered in the
+    `TaskProcessStore` of the `WorkflowExecutor` are accepted. When a worker stops sending heartbeats, the `Task` is
+    leased by another worker, and `TaskProcessor` implementations must therefore be able to process a `Task` again
+    after a partial attempt. A `Task` that fails on a worker fails the workflow in the same way as in the `ThreadPool`
+    mode.
+
+    ## Processing Order
+
+    For the `DeleteAction`, all tasks are processed in reverse order: a `Task` is only processed after all the tasks
+    depending on it were processed. This ensures resources are never deleted while other resources still depend on
+    them. In the `ThreadPool` mode (and with the `AsyncWorkflowExecutor`), independent tasks are deleted concurrently.
+
+    ## Incremental Processing
+
+    When `incremental` is set to True, the `CreateAction` and `UpdateAction` will skip any `Task` of which the inputs
+    did not change since it was last processed successfully. The inputs of a `Task` are summarized in a fingerprint
+    calculated from:
+
+    * The action, command and context
+    * The `spec` of the `Task`
+    * The current values of all variables referenced in the `spec`
+    * The output fingerprints of the tasks it depends on, which changes whenever the variables produced by those tasks change
+
+    After a `Task` was processed, the fingerprint is persisted together with the variables the `Task` added or changed in
+    the `VariableStore` as `<task_id>:TASK_INCREMENTAL_STATE`. A `Task` is only skipped if the persisted fingerprint
+    matches and the persisted `<task_id>:TASK_STATE` indicates the `Task` was created, in which case the persisted
+    variables are restored in the `VariableStore` without calling any hooks. A fingerprint persisted with the `sha256-json`
+    checksums used before the `ChecksumEngine` was introduced is accepted as well, after which the incremental state and
+    the spec checksums in `<task_id>:TASK_STATE` are rewritten in canonical form. Only variables with JSON compatible values
+    (dicts with string keys, lists, strings, numbers, booleans and `None`) are persisted: a `Task` producing any other
+    value is always processed, and gets a new output fingerprint every time, so that all tasks depending on it are
+    processed again as well.
+
+    The `DeleteAction` removes the persisted incremental state of a `Task`. Without `incremental`, the incremental state
+    is not read or written at all. Any state left behind by a `DeleteAction` in that case is never used, because a
+    `Task` is only skipped when its `<task_id>:TASK_STATE` indicates it was created.
+
+    ## Events
+
+    All events added by `TaskProcessor.add_event()` while the hooks of a `Task` are running, are recorded in the
+    `event_journal` and not in the `VariableStore`. When a `Task` fails, all events recorded during the workflow
+    execution are logged.
+
+    ## Tracing
+
+    When a `tracer` is supplied, a span is recorded for the workflow execution, the ordering of the tasks, every `Task`,
+    every `Hook` run on a `Task`, every `TaskProcessor` action and the copies of the `VariableStore` made in between (see
+    `Tracer`). In the `ProcessPool` and `WorkQueue` modes the `Action` span covers the remote processing, including the
+    transfer of the `Task` and its data.
+
+    ## Metrics
+
+    When a `metrics_registry` is supplied, the number of processed tasks, the durations of workflows, hooks, actions and
+    state commits, the size of the `VariableStore` and, in the concurrent execution modes, the number of tasks in flight
+    and waiting for a worker are recorded (see `MetricsRegistry`). The exporters of the registry are called at the end
+    of every workflow execution, whether or not it succeeded.
+
     Attributes:
         ordered_workflow_steps: An instance of `Hooks` containing all the hooks to run in sequence on each qualifying `Task`
         tasks: All the registered `Tasks`
@@ -2077,6 +5988,13 @@ class WorkflowExecutor:
         persistence: An instance of `StatePersistence`
         variable_store: An instance of `VariableStore`. Any pre-existing variables required for processing should already be loaded.
         task_process_store: An instance of `TaskProcessStore`
+        execution_mode: A string with the execution mode
+        max_workers: An integer with the maximum number of tasks to process concurrently, when the execution mode supports concurrent processing.
+        incremental: A boolean indicating if tasks with unchanged inputs must be skipped
+        event_journal: An instance of `EventJournal` in which all `Task` processing events are recorded
+        work_queue: An instance of `WorkQueue` on which tasks are published in the `WorkQueue` execution mode
+        tracer: An instance of `Tracer` in which timed spans are recorded, or `None` when tracing is disabled
+        metrics_registry: An instance of `MetricsRegistry` in which engine metrics are recorded, or `None` when metrics are disabled
     """
 
     def __init__(
@@ -2084,7 +6002,14 @@ class WorkflowExecutor:
         parameter_validator: ParameterValidation=ParameterValidation(constraints=None),
         persistence: StatePersistence=StatePersistence(),
         variable_store: VariableStore=VariableStore(),
-        task_process_store: TaskProcessStore=TaskProcessStore()
+        task_process_store: TaskProcessStore=TaskProcessStore(),
+        execution_mode: str='Sequential',
+        max_workers: int=4,
+        incremental: bool=False,
+        event_journal: EventJournal=None,
+        work_queue: WorkQueue=None,
+        tracer: Tracer=None,
+        metrics_registry: MetricsRegistry=None
     ):
         """Initialization of the `WorkflowExecutor` (see step 5).
 
@@ -2095,13 +6020,38 @@ class WorkflowExecutor:
             persistence: An instance of `StatePersistence` (see step 2)
             task_process_store: An instance of `TaskProcessStore` (see step 3)
             parameter_validator: An instance of `ParameterValidation`
+            execution_mode: A string with the execution mode. Supported values: `Sequential` (default), `ThreadPool`, `ProcessPool` or `WorkQueue`
+            max_workers: An integer (default=4) with the maximum number of tasks to process concurrently in the `ThreadPool`, `ProcessPool` and `WorkQueue` execution modes
+            incremental: A boolean (default=False). If True, tasks with unchanged inputs are skipped (see "Incremental Processing")
+            event_journal: An optional instance of `EventJournal`. By default a new `EventJournal` is created.
+            work_queue: An instance of `WorkQueue`, required in the `WorkQueue` execution mode
+            tracer: An optional instance of `Tracer` in which timed spans of each workflow execution are recorded
+            metrics_registry: An optional instance of `MetricsRegistry` in which metrics of each workflow execution are recorded
+
+        Raises:
+            Exception: When the execution mode is not supported, `max_workers` is less than 1 or the `work_queue` is missing
         """
+        if execution_mode not in ('Sequential', 'ThreadPool', 'ProcessPool', 'WorkQueue',):
+            raise Exception('Unsupported execution mode "{}"'.format(execution_mode))
+        if execution_mode == 'WorkQueue' and work_queue is None:
+            raise Exception('The WorkQueue execution mode requires a work_queue')
+        if max_workers is None or max_workers < 1:
+            raise Exception('max_workers must be at least 1')
         self.ordered_workflow_steps = Hooks()
         self.tasks = Tasks()
         self.parameter_validator = parameter_validator
         self.persistence = persistence
         self.variable_store = variable_store
         self.task_process_store = task_process_store
+        self.execution_mode = execution_mode
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.event_journal = event_journal
+        if self.event_journal is None:
+            self.event_journal = EventJournal()
+        self.work_queue = work_queue
+        self.tracer = tracer
+        self.metrics_registry = metrics_registry
         self.command_to_action_map = dict()
         self.command_to_action_map['create'] = 'CreateAction'
         self.command_to_action_map['rollback'] = 'RollbackAction'
@@ -2109,7 +6059,8 @@ class WorkflowExecutor:
         self.command_to_action_map['update'] = 'UpdateAction'
         self.command_to_action_map['describe'] = 'DescribeAction'
         self.command_to_action_map['drift'] = 'DetectDriftAction'
-        self.persistence.load()
+        if getattr(self.persistence, 'lazy', False) is False:
+            self.persistence.load()
 
     def _pop_old_command_map(self, action_name: str):
         for key, val in self.command_to_action_map.items():
@@ -2271,6 +6222,10 @@ class WorkflowExecutor:
         Ideally an instance of the `TaskProcessingHook` must be part of the `ordered_workflow_steps` in order to do any
         meaningful processing on each `Task`
 
+        In the `ThreadPool` execution mode, tasks are not processed in a strict sequence. Instead, every `Task` of which
+        all dependencies were processed is dispatched to the thread pool, where the hooks are called in the same
+        sequence on the `Task`.
+
         `Task` processing will most often result in more variables being added to the `VariableStore`. AFter all
         processing is done, and assuming there are no exceptions raised in the process, the final updated
         `VariableStore` will be returned to the client.
@@ -2287,53 +6242,700 @@ class WorkflowExecutor:
         """
         if len(self.ordered_workflow_steps) == 0:
             raise Exception('No steps to execute')
-        updated_variable_store = copy.deepcopy(self.variable_store)
-
         if command not in self.command_to_action_map:
             raise Exception('Unrecognized command "{}"'.format(command))
 
-        parameters = dict()
-        parameters['Action'] = self.command_to_action_map[command]
-        parameters['Command'] = command
-        parameters['Context'] = context
+        tracer_token = _active_tracer.set(self.tracer)
+        metrics_registry_token = _active_metrics_registry.set(self.metrics_registry)
+        workflow_start = time.perf_counter()
+        workflow_outcome = 'Failed'
+        try:
+            with _trace_span(name='{}:{}'.format(command, context), category='Workflow'):
+                with _trace_span(name='VariableStore', category='Copy'):
+                    updated_variable_store = copy.deepcopy(self.variable_store)
 
-        all_events = list()
+                parameters = dict()
+                parameters['Action'] = self.command_to_action_map[command]
+                parameters['Command'] = command
+                parameters['Context'] = context
+                self._prefetch_task_state(command=command, context=context)
 
+                self.task_process_store.start_workflow()
+                try:
+                    if self.execution_mode == 'ThreadPool':
+                        updated_variable_store = self._execute_tasks_in_thread_pool(
+                            command=command,
+                            context=context,
+                            parameters=parameters,
+                            variable_store=updated_variable_store
+                        )
+                    elif self.execution_mode == 'ProcessPool':
+                        updated_variable_store = self._execute_tasks_in_process_pool(
+                            command=command,
+                            context=context,
+                            parameters=parameters,
+                            variable_store=updated_variable_store
+                        )
+                    elif self.execution_mode == 'WorkQueue':
+                        updated_variable_store = self._execute_tasks_in_work_queue(
+                            command=command,
+                            context=context,
+                            parameters=parameters,
+                            variable_store=updated_variable_store
+                        )
+                    else:
+                        updated_variable_store = self._execute_tasks_in_sequence(parameters=parameters, variable_store=updated_variable_store)
+                finally:
+                    self.task_process_store.end_workflow()
+                with _measure_duration(metric_key='StateCommitDuration', operation='flush'):
+                    self.persistence.flush()
+                self._record_variable_store_size(variable_store=updated_variable_store)
+                workflow_outcome = 'Succeeded'
+                with _trace_span(name='VariableStore', category='Copy'):
+                    return copy.deepcopy(updated_variable_store)
+        finally:
+            _active_metrics_registry.reset(metrics_registry_token)
+            _active_tracer.reset(tracer_token)
+            self._record_workflow_metrics(command=command, outcome=workflow_outcome, duration=time.perf_counter() - workflow_start)
+
+    def _execute_tasks_in_sequence(self, parameters: dict, variable_store: VariableStore)->VariableStore:
+        first_event_sequence = self.event_journal.next_event_sequence
         task_name: str
-        for task_name in self.tasks.get_task_names_in_order(command=command, context=context):
+        for task_name in self._get_processing_graph(parameters=parameters)['TaskNamesInOrder']:
             task = self.tasks.get_task_instance_by_name(task_name=task_name)
-            hook: Hook
-            for hook in self.ordered_workflow_steps:
+            result = self._run_hooks_for_task(task=task, parameters=parameters, variable_store=variable_store)
+            if result['FailedHook'] is not None:
+                self._handle_task_failure(
+                    task=task,
+                    parameters=parameters,
+                    hook=result['FailedHook'],
+                    exception_stacktrace=result['ExceptionStacktrace'],
+                    first_event_sequence=first_event_sequence
+                )
+            variable_store = result['VariableStore']
+            self._record_variable_store_size(variable_store=variable_store)
+        return variable_store
+
+    def _prefetch_task_state(self, command: str, context: str):
+        if getattr(self.persistence, 'lazy', False) is False:
+            return
+        object_identifiers = list()
+        for task_name in self.tasks.get_task_dependency_graph(command=command, context=context)['TaskNamesInOrder']:
+            object_identifiers.append('{}:TASK_STATE'.format(task_name))
+            if self.incremental is True:
+                object_identifiers.append('{}:TASK_INCREMENTAL_STATE'.format(task_name))
+        self.persistence.prefetch(object_identifiers=object_identifiers)
+
+    def _run_hooks_for_task(self, task: Task, parameters: dict, variable_store: VariableStore, task_process_store: TaskProcessStore=None)->dict:
+        if task_process_store is None:
+            task_process_store = self.task_process_store
+        # Thread pool workers do not inherit the context of the workflow execution
+        tracer_token = _active_tracer.set(self.tracer)
+        metrics_registry_token = _active_metrics_registry.set(self.metrics_registry)
+        try:
+            return self._run_hooks_for_task_in_context(task=task, parameters=parameters, variable_store=variable_store, task_process_store=task_process_store)
+        finally:
+            _active_metrics_registry.reset(metrics_registry_token)
+            _active_tracer.reset(tracer_token)
+
+    def _run_hooks_for_task_in_context(self, task: Task, parameters: dict, variable_store: VariableStore, task_process_store: TaskProcessStore)->dict:
+        # Hooks may update the state of the Task, which is not allowed on the read only instance held by Tasks. The
+        # read only metadata and spec are shared with the copy.
+        task = task.clone(state_only=True)
+        result = {
+            'VariableStore': variable_store,
+            'FailedHook': None,
+            'ExceptionStacktrace': None,
+        }
+        with _trace_span(name=task.task_id, category='Task', task_id=task.task_id):
+            inputs_fingerprint = self._get_incremental_inputs_fingerprint(task=task, parameters=parameters, variable_store=variable_store)
+            if self._restore_unchanged_task_outputs(task=task, parameters=parameters, inputs_fingerprint=inputs_fingerprint, variable_store=variable_store, result=result) is True:
+                self._record_task_outcome(parameters=parameters, result=result, skipped=True)
+                return result
+            event_journal_token = _active_event_journal.set(self.event_journal)
+            try:
+                hook: Hook
+                for hook in self.ordered_workflow_steps:
+                    try:
+                        with _trace_span(name='VariableStore', category='Copy', task_id=task.task_id):
+                            hook_variable_store = copy.deepcopy(result['VariableStore'])
+                        with _trace_span(name=hook.name, category='Hook', task_id=task.task_id), _measure_duration(metric_key='HookDuration', hook=hook.name):
+                            result['VariableStore'] = hook.run(
+                                task=task,
+                                parameters=parameters,
+                                parameter_validator=self.parameter_validator,
+                                persistence=self.persistence,
+                                variable_store=hook_variable_store,
+                                task_process_store=task_process_store
+                            )
+                    except:
+                        result['FailedHook'] = hook
+                        result['ExceptionStacktrace'] = traceback.format_exc()
+                        break
+            finally:
+                _active_event_journal.reset(event_journal_token)
+            self._update_incremental_state(task=task, parameters=parameters, inputs_fingerprint=inputs_fingerprint, variable_store=variable_store, result=result)
+        self._record_task_outcome(parameters=parameters, result=result)
+        return result
+
+    def _record_task_outcome(self, parameters: dict, result: dict, skipped: bool=False):
+        if self.metrics_registry is None:
+            return
+        outcome = 'Succeeded'
+        if skipped is True:
+            outcome = 'Skipped'
+        elif result['FailedHook'] is not None:
+            outcome = 'Failed'
+        self.metrics_registry.engine_metrics['TasksProcessed'].increment(labels={'action': parameters['Action'], 'outcome': outcome})
+
+    def _record_variable_store_size(self, variable_store: VariableStore):
+        if self.metrics_registry is None:
+            return
+        self.metrics_registry.engine_metrics['VariableStoreSize'].set(value=len(variable_store.variable_store))
+
+    def _record_task_queue_depth(self, running_task_qty: int, worker_qty: int):
+        if self.metrics_registry is None:
+            return
+        self.metrics_registry.engine_metrics['TasksInFlight'].set(value=running_task_qty)
+        self.metrics_registry.engine_metrics['QueuedTasks'].set(value=max(0, running_task_qty - worker_qty))
+
+    def _record_workflow_metrics(self, command: str, outcome: str, duration: float):
+        if self.metrics_registry is None:
+            return
+        self.metrics_registry.engine_metrics['WorkflowDuration'].observe(value=duration, labels={'command': command, 'outcome': outcome})
+        self._record_task_queue_depth(running_task_qty=0, worker_qty=0)
+        self.metrics_registry.export()
+
+    def _get_incremental_inputs_fingerprint(self, task: Task, parameters: dict, variable_store: VariableStore, legacy: bool=False)->str:
+        if self.incremental is False or parameters['Action'] not in ('CreateAction', 'UpdateAction',):
+            return None
+        template = task.get_spec_template()
+        variable_values = dict()
+        for raw_key in template.placeholder_names:
+            target_task_id, target_index = _parse_variable_placeholder(raw_key=raw_key)
+            variable_values[raw_key] = variable_store.resolve_variable(
+                task_id=target_task_id,
+                variable_name=target_index,
+                command=parameters['Command'],
+                context=parameters['Context']
+            )
+        upstream_output_fingerprints = dict()
+        graph = self.tasks.get_task_dependency_graph(command=parameters['Command'], context=parameters['Context'])
+        for dependency_task_name in graph['Dependencies'][task.task_id]:
+            incremental_state = self.persistence.get(
+                object_identifier='{}:TASK_INCREMENTAL_STATE'.format(dependency_task_name),
+                refresh_cache_if_identifier_not_found=False
+            )
+            upstream_output_fingerprints[dependency_task_name] = incremental_state.get('OutputFingerprint')
+            if legacy is True and incremental_state.get('InputsFingerprint') is not None:
+                # The legacy inputs fingerprint was calculated with the legacy output fingerprint, which may have been
+                # rewritten in canonical form already
+                upstream_output_fingerprints[dependency_task_name] = _legacy_checksum_engine.hexdigest(data=incremental_state['OutputVariables'])
+        data = {
+            'Action': parameters['Action'],
+            'Command': parameters['Command'],
+            'Context': parameters['Context'],
+            'Spec': template.spec,
+            'Variables': variable_values,
+            'Upstream': upstream_output_fingerprints,
+        }
+        if legacy is True:
+            return _legacy_checksum_engine.hexdigest(data=data)
+        return checksum_engine.hexdigest(data=data)
+
+    def _restore_unchanged_task_outputs(self, task: Task, parameters: dict, inputs_fingerprint: str, variable_store: VariableStore, result: dict)->bool:
+        if inputs_fingerprint is None:
+            return False
+        object_identifier = '{}:TASK_INCREMENTAL_STATE'.format(task.task_id)
+        incremental_state = self.persistence.get(object_identifier=object_identifier, refresh_cache_if_identifier_not_found=False)
+        persisted_inputs_fingerprint = incremental_state.get('InputsFingerprint')
+        if persisted_inputs_fingerprint is None:
+            return False
+        legacy_state = False
+        if persisted_inputs_fingerprint != inputs_fingerprint:
+            if checksum_engine.algorithm == 'sha256-json':
+                return False
+            # Incremental state persisted with the legacy sha256-json checksums remains valid
+            if persisted_inputs_fingerprint != self._get_incremental_inputs_fingerprint(task=task, parameters=parameters, variable_store=variable_store, legacy=True):
+                return False
+            legacy_state = True
+        task_state = self.persistence.get(
+            object_identifier='{}:TASK_STATE'.format(task.task_id),
+            refresh_cache_if_identifier_not_found=False
+        )
+        if task_state.get('IsCreated') is not True:
+            return False
+        logger.info('Task "{}" inputs unchanged since it was last processed - skipping'.format(task.task_id))
+        if legacy_state is True:
+            # Rewritten in canonical form, to be persisted with the next commit
+            self.persistence.update_object_state(
+                object_identifier=object_identifier,
+                data={
+                    'InputsFingerprint': inputs_fingerprint,
+                    'OutputFingerprint': checksum_engine.hexdigest(data=incremental_state['OutputVariables']),
+                    'OutputVariables': incremental_state['OutputVariables'],
+                }
+            )
+            self._rewrite_legacy_task_state_checksums(task=task, task_state=task_state)
+        result['VariableStore'] = copy.deepcopy(result['VariableStore'])
+        for variable_name, value in incremental_state['OutputVariables'].items():
+            result['VariableStore'].add_variable(variable_name=variable_name, value=value, copy_value=False)
+        return True
+
+    def _rewrite_legacy_task_state_checksums(self, task: Task, task_state: dict):
+        # A skipped Task does not reach the TaskPostProcessingStateUpdateHook, which would otherwise persist its spec
+        # checksums in canonical form
+        if isinstance(task_state.get('AppliedSpec'), dict) is False:
+            return
+        data = {'spec': task_state['AppliedSpec'], 'metadata': dict()}
+        legacy_checksum = _legacy_checksum_engine.hexdigest(data=data)
+        updated_checksums = dict()
+        for checksum_name in ('AppliedSpecChecksum', 'CurrentResolvedSpecChecksum',):
+            if task_state.get(checksum_name) == legacy_checksum:
+                updated_checksums[checksum_name] = checksum_engine.hexdigest(data=data)
+        if len(updated_checksums) > 0:
+            self.persistence.update_object_state(object_identifier='{}:TASK_STATE'.format(task.task_id), data=dict(task_state, **updated_checksums))
+
+    def _update_incremental_state(self, task: Task, parameters: dict, inputs_fingerprint: str, variable_store: VariableStore, result: dict):
+        if self.incremental is False or result['FailedHook'] is not None:
+            return
+        object_identifier = '{}:TASK_INCREMENTAL_STATE'.format(task.task_id)
+        if parameters['Action'] == 'DeleteAction':
+            self._clear_incremental_state(object_identifier=object_identifier)
+            return
+        if inputs_fingerprint is None:
+            return
+        output_variables = dict()
+        for variable_name in result['VariableStore'].variable_store:
+            if variable_name.endswith(':PROCESSING_EVENTS') is True:
+                continue
+            value = result['VariableStore'].variable_store.get_shared_value(variable_name)
+            if variable_name in variable_store.variable_store:
+                original_value = variable_store.variable_store.get_shared_value(variable_name)
+                if original_value is value or original_value == value:
+                    continue
+            output_variables[variable_name] = value
+        if _is_json_safe_value(value=output_variables) is False:
+            # Persistence implementations are only required to store JSON data, so the outputs may not be restored as
+            # is. Without an inputs fingerprint the task is never skipped, and a new output fingerprint for every run
+            # ensures that the tasks depending on it are processed again as well.
+            logger.info('Task "{}" produced output variables that can not be persisted as JSON - it will always be processed'.format(task.task_id))
+            self.persistence.update_object_state(
+                object_identifier=object_identifier,
+                data={
+                    'InputsFingerprint': None,
+                    'OutputFingerprint': uuid.uuid4().hex,
+                    'OutputVariables': dict(),
+                }
+            )
+            return
+        self.persistence.update_object_state(
+            object_identifier=object_identifier,
+            data={
+                'InputsFingerprint': inputs_fingerprint,
+                'OutputFingerprint': checksum_engine.hexdigest(data=output_variables),
+                'OutputVariables': output_variables,
+            }
+        )
+
+    def _clear_incremental_state(self, object_identifier: str):
+        if len(self.persistence.get(object_identifier=object_identifier, refresh_cache_if_identifier_not_found=False)) > 0:
+            self.persistence.update_object_state(object_identifier=object_identifier, data=dict())
+
+    def _handle_task_failure(self, task: Task, parameters: dict, hook: Hook, exception_stacktrace: str, first_event_sequence: int):
+        general_error_hook = self._report_task_failure(parameters=parameters, exception_stacktrace=exception_stacktrace, first_event_sequence=first_event_sequence)
+        if general_error_hook is not None:
+            general_error_hook.run(
+                task=task,
+                parameters=parameters,
+                parameter_validator=self.parameter_validator,
+                persistence=self.persistence,
+                variable_store=self.variable_store,
+                task_process_store=self.task_process_store
+            )
+        raise Exception('Failure to process hook "{}" - cannot continue'.format(hook.name))
+
+    def _report_task_failure(self, parameters: dict, exception_stacktrace: str, first_event_sequence: int)->Hook:
+        # Retain the state of all tasks that were processed successfully
+        with _measure_duration(metric_key='StateCommitDuration', operation='flush'):
+            self.persistence.flush()
+        self.event_journal.flush()
+        logger.error('EXCEPTION: {}'.format(exception_stacktrace))
+        for event in self.event_journal.get_events(since_event_sequence=first_event_sequence):
+            logger.error('POST EXCEPTION EVENT DUMP >> {}'.format(event))
+        if self.ordered_workflow_steps.general_error_hook is not None:
+            if isinstance(self.ordered_workflow_steps.general_error_hook, Hook):
+                parameters['ExceptionStacktrace'] = exception_stacktrace
+                return self.ordered_workflow_steps.general_error_hook
+        else:
+            print(exception_stacktrace) # pragma: no cover
+        return None
+
+    def _merge_variable_store_changes(self, target_variable_store: VariableStore, original_variable_store: VariableStore, updated_variable_store: VariableStore):
+        for key in list(original_variable_store.variable_store.keys()):
+            if key not in updated_variable_store.variable_store:
+                target_variable_store.variable_store.pop(key, None)
+        for key in updated_variable_store.variable_store:
+            value = updated_variable_store.variable_store.get_shared_value(key)
+            if key not in original_variable_store.variable_store:
+                target_variable_store.variable_store.set_shared_value(key, value)
+                continue
+            original_value = original_variable_store.variable_store.get_shared_value(key)
+            # Values that were never written to are still shared with the original, which avoids a full comparison
+            if original_value is not value and original_value != value:
+                target_variable_store.variable_store.set_shared_value(key, value)
+
+    def _prepare_task_readiness(self, graph: dict)->tuple:
+        outstanding_dependencies_qty = dict()
+        ready_task_names = deque()
+        for task_name in graph['TaskNamesInOrder']:
+            outstanding_dependencies_qty[task_name] = len(graph['Dependencies'][task_name])
+            if outstanding_dependencies_qty[task_name] == 0:
+                ready_task_names.append(task_name)
+        return outstanding_dependencies_qty, ready_task_names
+
+    def _release_dependant_tasks(self, graph: dict, task_name: str, outstanding_dependencies_qty: dict, ready_task_names: deque):
+        for dependant_task_name in graph['Dependants'][task_name]:
+            outstanding_dependencies_qty[dependant_task_name] -= 1
+            if outstanding_dependencies_qty[dependant_task_name] == 0:
+                ready_task_names.append(dependant_task_name)
+
+    def _get_processing_graph(self, parameters: dict)->dict:
+        # Resources must be deleted before the resources they depend on
+        with _trace_span(name='get_task_dependency_graph', category='Ordering'):
+            return self.tasks.get_task_dependency_graph(
+                command=parameters['Command'],
+                context=parameters['Context'],
+                reverse=parameters['Action'] == 'DeleteAction'
+            )
+
+    def _execute_tasks_in_process_pool(self, command: str, context: str, parameters: dict, variable_store: VariableStore)->VariableStore:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_initialize_process_pool_worker,
+            initargs=(self.task_process_store,)
+        ) as process_pool:
+            return self._execute_tasks_in_thread_pool(
+                command=command,
+                context=context,
+                parameters=parameters,
+                variable_store=variable_store,
+                task_process_store=_RemoteTaskProcessStore(
+                    task_process_store=self.task_process_store,
+                    create_task_processor=lambda api_version: _ProcessPoolTaskProcessor(api_version=api_version, process_pool=process_pool)
+                )
+            )
+
+    def _execute_tasks_in_work_queue(self, command: str, context: str, parameters: dict, variable_store: VariableStore)->VariableStore:
+        workflow_execution_id = uuid.uuid4().hex
+        return self._execute_tasks_in_thread_pool(
+            command=command,
+            context=context,
+            parameters=parameters,
+            variable_store=variable_store,
+            task_process_store=_RemoteTaskProcessStore(
+                task_process_store=self.task_process_store,
+                create_task_processor=lambda api_version: _WorkQueueTaskProcessor(
+                    api_version=api_version,
+                    work_queue=self.work_queue,
+                    workflow_execution_id=workflow_execution_id
+                )
+            )
+        )
+
+    def _execute_tasks_in_thread_pool(self, command: str, context: str, parameters: dict, variable_store: VariableStore, task_process_store: TaskProcessStore=None)->VariableStore:
+        graph = self._get_processing_graph(parameters=parameters)
+        outstanding_dependencies_qty, ready_task_names = self._prepare_task_readiness(graph=graph)
+
+        first_event_sequence = self.event_journal.next_event_sequence
+        running_tasks = dict()
+        completed_futures = queue.SimpleQueue()
+        failed_task = None
+        failed_task_result = None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(running_tasks) > 0 or (len(ready_task_names) > 0 and failed_task is None):
+                while len(ready_task_names) > 0 and failed_task is None:
+                    task = self.tasks.get_task_instance_by_name(task_name=ready_task_names.popleft())
+                    task_variable_store = copy.deepcopy(variable_store)
+                    future = executor.submit(self._run_hooks_for_task, task, copy.deepcopy(parameters), task_variable_store, task_process_store)
+                    running_tasks[future] = (task, task_variable_store,)
+                    future.add_done_callback(completed_futures.put)
+                    logger.debug('Dispatched task "{}" - {} task(s) running'.format(task.task_id, len(running_tasks)))
+                self._record_task_queue_depth(running_task_qty=len(running_tasks), worker_qty=self.max_workers)
+                future = completed_futures.get()
+                task, task_variable_store = running_tasks.pop(future)
+                self._record_task_queue_depth(running_task_qty=len(running_tasks), worker_qty=self.max_workers)
+                result = future.result()
+                if result['FailedHook'] is not None:
+                    if failed_task is None:
+                        failed_task = task
+                        failed_task_result = result
+                    continue
+                self._merge_variable_store_changes(
+                    target_variable_store=variable_store,
+                    original_variable_store=task_variable_store,
+                    updated_variable_store=result['VariableStore']
+                )
+                self._record_variable_store_size(variable_store=variable_store)
+                self._release_dependant_tasks(
+                    graph=graph,
+                    task_name=task.task_id,
+                    outstanding_dependencies_qty=outstanding_dependencies_qty,
+                    ready_task_names=ready_task_names
+                )
+
+        if failed_task is not None:
+            self._handle_task_failure(
+                task=failed_task,
+                parameters=parameters,
+                hook=failed_task_result['FailedHook'],
+                exception_stacktrace=failed_task_result['ExceptionStacktrace'],
+                first_event_sequence=first_event_sequence
+            )
+        return variable_store
+
+
+class AsyncWorkflowExecutor(WorkflowExecutor):
+    """An `asyncio` based implementation of the `WorkflowExecutor`, suitable for processing many I/O bound tasks
+    concurrently on a single event loop.
+
+    Initialization and configuration is exactly the same as for the `WorkflowExecutor`, including the `Tasks` ordering
+    and the command mapping. The difference is that `execute_workflow()` is a coroutine:
+
+    ```python
+    we = AsyncWorkflowExecutor(task_process_store=task_processor_store, max_concurrent_tasks=500)
+    we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+    we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+    we.add_task(task=some_task)
+    variable_store = asyncio.run(we.execute_workflow(command='create', context='test'))
+    ```
+
+    Each `Task` is started as soon as all the tasks it depends on were processed, after which the `run_async()` method
+    of every registered `Hook` is awaited in sequence. The `TaskProcessingHook` in turn awaits the asynchronous action
+    methods of the `TaskProcessor` (for example `create_action_async()`). Hooks and task processors that only implement
+    the synchronous methods are run in a separate thread.
+
+    Variables are handled in the same way as the `ThreadPool` execution mode of the `WorkflowExecutor`: each `Task`
+    receives a snapshot of the `VariableStore` and the changes are merged back when the `Task` is done.
+
+    Attributes:
+        max_concurrent_tasks: An integer with the maximum number of tasks in flight at any given time
+    """
+
+    def __init__(
+        self,
+        parameter_validator: ParameterValidation=ParameterValidation(constraints=None),
+        persistence: StatePersistence=None,
+        variable_store: VariableStore=VariableStore(),
+        task_process_store: TaskProcessStore=TaskProcessStore(),
+        max_concurrent_tasks: int=100,
+        incremental: bool=False,
+        event_journal: EventJournal=None,
+        tracer: Tracer=None,
+        metrics_registry: MetricsRegistry=None
+    ):
+        """Initialization of the `AsyncWorkflowExecutor`
+
+        All arguments are optional.
+
+        Args:
+            variable_store: An instance of `VariableStore`
+            persistence: An instance of `StatePersistence`. By default a new `StatePersistence` is created.
+            task_process_store: An instance of `TaskProcessStore`
+            parameter_validator: An instance of `ParameterValidation`
+            max_concurrent_tasks: An integer (default=100) with the maximum number of tasks in flight at any given time
+            incremental: A boolean (default=False). If True, tasks with unchanged inputs are skipped (see `WorkflowExecutor`)
+            event_journal: An optional instance of `EventJournal`. By default a new `EventJournal` is created.
+            tracer: An optional instance of `Tracer` in which timed spans of each workflow execution are recorded
+            metrics_registry: An optional instance of `MetricsRegistry` in which metrics of each workflow execution are recorded
+
+        Raises:
+            Exception: When `max_concurrent_tasks` is less than 1
+        """
+        if persistence is None:
+            persistence = StatePersistence()
+        if max_concurrent_tasks is None or max_concurrent_tasks < 1:
+            raise Exception('max_concurrent_tasks must be at least 1')
+        super().__init__(
+            parameter_validator=parameter_validator,
+            persistence=persistence,
+            variable_store=variable_store,
+            task_process_store=task_process_store,
+            incremental=incremental,
+            event_journal=event_journal,
+            tracer=tracer,
+            metrics_registry=metrics_registry
+        )
+        self.max_concurrent_tasks = max_concurrent_tasks
+
+    async def execute_workflow(
+        self,
+        command: str,
+        context: str
+    )->VariableStore:
+        """Executes the workflow on the running event loop
+
+        Args:
+            command: A string with the desired command to run on all `Tasks`
+            context: A string with the desired context
+
+        Returns:
+            An updated `VariableStore`
+
+        Raises:
+            Exception: Any exception raised during `Task` processing or due to some validation error.
+        """
+        if len(self.ordered_workflow_steps) == 0:
+            raise Exception('No steps to execute')
+        if command not in self.command_to_action_map:
+            raise Exception('Unrecognized command "{}"'.format(command))
+
+        # Tasks created for the workflow inherit the context, and with it the tracer
+        tracer_token = _active_tracer.set(self.tracer)
+        metrics_registry_token = _active_metrics_registry.set(self.metrics_registry)
+        workflow_start = time.perf_counter()
+        workflow_outcome = 'Failed'
+        try:
+            with _trace_span(name='{}:{}'.format(command, context), category='Workflow'):
+                with _trace_span(name='VariableStore', category='Copy'):
+                    variable_store = copy.deepcopy(self.variable_store)
+
+                parameters = dict()
+                parameters['Action'] = self.command_to_action_map[command]
+                parameters['Command'] = command
+                parameters['Context'] = context
+                self._prefetch_task_state(command=command, context=context)
+
+                self.task_process_store.start_workflow()
                 try:
-                    updated_variable_store: VariableStore
-                    updated_variable_store = hook.run(
+                    variable_store = await self._execute_tasks_concurrently(parameters=parameters, variable_store=variable_store)
+                finally:
+                    self.task_process_store.end_workflow()
+                with _measure_duration(metric_key='StateCommitDuration', operation='flush'):
+                    self.persistence.flush()
+                self._record_variable_store_size(variable_store=variable_store)
+                workflow_outcome = 'Succeeded'
+                with _trace_span(name='VariableStore', category='Copy'):
+                    return copy.deepcopy(variable_store)
+        finally:
+            _active_metrics_registry.reset(metrics_registry_token)
+            _active_tracer.reset(tracer_token)
+            self._record_workflow_metrics(command=command, outcome=workflow_outcome, duration=time.perf_counter() - workflow_start)
+
+    async def _execute_tasks_concurrently(self, parameters: dict, variable_store: VariableStore)->VariableStore:
+        graph = self._get_processing_graph(parameters=parameters)
+        outstanding_dependencies_qty, ready_task_names = self._prepare_task_readiness(graph=graph)
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+
+        first_event_sequence = self.event_journal.next_event_sequence
+        running_tasks = dict()
+        completed_tasks = asyncio.Queue()
+        failed_task = None
+        failed_task_result = None
+        while len(running_tasks) > 0 or (len(ready_task_names) > 0 and failed_task is None):
+            while len(ready_task_names) > 0 and failed_task is None:
+                task = self.tasks.get_task_instance_by_name(task_name=ready_task_names.popleft())
+                running_task = asyncio.ensure_future(
+                    self._run_hooks_for_task_when_permitted(
                         task=task,
-                        parameters=parameters,
-                        parameter_validator=self.parameter_validator,
-                        persistence=self.persistence,
-                        variable_store=copy.deepcopy(updated_variable_store),
-                        task_process_store=self.task_process_store
+                        parameters=copy.deepcopy(parameters),
+                        variable_store=variable_store,
+                        semaphore=semaphore
                     )
-                    if '{}:PROCESSING_EVENTS'.format(task.task_id) in updated_variable_store.variable_store:
-                        all_events += copy.deepcopy(updated_variable_store.variable_store['{}:PROCESSING_EVENTS'.format(task.task_id)])
-                except:
-                    exception_stacktrace = traceback.format_exc()
-                    logger.error('EXCEPTION: {}'.format(exception_stacktrace))
-                    for event in all_events: logger.error('POST EXCEPTION EVENT DUMP >> {}'.format(event))
-                    if self.ordered_workflow_steps.general_error_hook is not None:
-                        if isinstance(self.ordered_workflow_steps.general_error_hook, Hook):
-                            parameters['ExceptionStacktrace'] = exception_stacktrace
-                            self.ordered_workflow_steps.general_error_hook.run(
+                )
+                running_tasks[running_task] = task
+                running_task.add_done_callback(completed_tasks.put_nowait)
+            self._record_task_queue_depth(running_task_qty=len(running_tasks), worker_qty=self.max_concurrent_tasks)
+            running_task = await completed_tasks.get()
+            task = running_tasks.pop(running_task)
+            self._record_task_queue_depth(running_task_qty=len(running_tasks), worker_qty=self.max_concurrent_tasks)
+            result = running_task.result()
+            if result['FailedHook'] is not None:
+                if failed_task is None:
+                    failed_task = task
+                    failed_task_result = result
+                continue
+            self._merge_variable_store_changes(
+                target_variable_store=variable_store,
+                original_variable_store=result['OriginalVariableStore'],
+                updated_variable_store=result['VariableStore']
+            )
+            self._record_variable_store_size(variable_store=variable_store)
+            self._release_dependant_tasks(
+                graph=graph,
+                task_name=task.task_id,
+                outstanding_dependencies_qty=outstanding_dependencies_qty,
+                ready_task_names=ready_task_names
+            )
+
+        if failed_task is not None:
+            await self._handle_task_failure_async(
+                task=failed_task,
+                parameters=parameters,
+                hook=failed_task_result['FailedHook'],
+                exception_stacktrace=failed_task_result['ExceptionStacktrace'],
+                first_event_sequence=first_event_sequence
+            )
+        return variable_store
+
+    async def _handle_task_failure_async(self, task: Task, parameters: dict, hook: Hook, exception_stacktrace: str, first_event_sequence: int):
+        general_error_hook = self._report_task_failure(parameters=parameters, exception_stacktrace=exception_stacktrace, first_event_sequence=first_event_sequence)
+        if general_error_hook is not None:
+            await general_error_hook.run_async(
+                task=task,
+                parameters=parameters,
+                parameter_validator=self.parameter_validator,
+                persistence=self.persistence,
+                variable_store=self.variable_store,
+                task_process_store=self.task_process_store
+            )
+        raise Exception('Failure to process hook "{}" - cannot continue'.format(hook.name))
+
+    async def _run_hooks_for_task_when_permitted(self, task: Task, parameters: dict, variable_store: VariableStore, semaphore: asyncio.Semaphore)->dict:
+        async with semaphore:
+            # The snapshot is only taken once the task may run, so that tasks waiting for the semaphore hold no copies
+            task_variable_store = copy.deepcopy(variable_store)
+            result = await self._run_hooks_for_task_async(task=task, parameters=parameters, variable_store=task_variable_store)
+        result['OriginalVariableStore'] = task_variable_store
+        return result
+
+    async def _run_hooks_for_task_async(self, task: Task, parameters: dict, variable_store: VariableStore)->dict:
+        # Hooks may update the state of the Task, which is not allowed on the read only instance held by Tasks. The
+        # read only metadata and spec are shared with the copy.
+        task = task.clone(state_only=True)
+        result = {
+            'VariableStore': variable_store,
+            'FailedHook': None,
+            'ExceptionStacktrace': None,
+        }
+        with _trace_span(name=task.task_id, category='Task', task_id=task.task_id):
+            inputs_fingerprint = self._get_incremental_inputs_fingerprint(task=task, parameters=parameters, variable_store=variable_store)
+            if self._restore_unchanged_task_outputs(task=task, parameters=parameters, inputs_fingerprint=inputs_fingerprint, variable_store=variable_store, result=result) is True:
+                self._record_task_outcome(parameters=parameters, result=result, skipped=True)
+                return result
+            event_journal_token = _active_event_journal.set(self.event_journal)
+            try:
+                hook: Hook
+                for hook in self.ordered_workflow_steps:
+                    try:
+                        with _trace_span(name='VariableStore', category='Copy', task_id=task.task_id):
+                            hook_variable_store = copy.deepcopy(result['VariableStore'])
+                        with _trace_span(name=hook.name, category='Hook', task_id=task.task_id), _measure_duration(metric_key='HookDuration', hook=hook.name):
+                            result['VariableStore'] = await hook.run_async(
                                 task=task,
                                 parameters=parameters,
                                 parameter_validator=self.parameter_validator,
                                 persistence=self.persistence,
-                                variable_store=self.variable_store,
+                                variable_store=hook_variable_store,
                                 task_process_store=self.task_process_store
                             )
-                    else:
-                        print(exception_stacktrace) # pragma: no cover
-                    raise Exception('Failure to process hook "{}" - cannot continue'.format(hook.name))
-        self.persistence.commit()
-        return copy.deepcopy(updated_variable_store)
-
+                    except:
+                        result['FailedHook'] = hook
+                        result['ExceptionStacktrace'] = traceback.format_exc()
+                        break
+            finally:
+                _active_event_journal.reset(event_journal_token)
+            self._update_incremental_state(task=task, parameters=parameters, inputs_fingerprint=inputs_fingerprint, variable_store=variable_store, result=result)
+        self._record_task_outcome(parameters=parameters, result=result)
+        return result
@@ -1,6 +1,13 @@
 import sys
+import csv
+import io
 import os
 import hashlib
+import threading
+import asyncio
+import sqlite3
+import tempfile
+import urllib.request
 from inspect import stack
 
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../src")
@@ -396,6 +403,89 @@ class DummyTaskProcessor1(TaskProcessor):
         return updated_variable_store
 
 
+concurrency_check_barrier = threading.Barrier(parties=3, timeout=10)
+
+
+class ConcurrencyCheckTaskProcessor(DummyTaskProcessor1):
+    """Only completes the create action when three tasks are processed at the same time"""
+
+    def __init__(self, api_version: str='ConcurrencyCheckTaskProcessor/v1') -> None:
+        super().__init__(api_version)
+
+    def create_action(
+        self,
+        task: Task,
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        concurrency_check_barrier.wait()
+        return super().create_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+
+class TupleOutputTaskProcessor(DummyTaskProcessor1):
+    """Adds an output variable with a value that does not survive a JSON round trip"""
+
+    coordinates = (1, 2,)
+
+    def __init__(self, api_version: str='TupleOutputTaskProcessor/v1') -> None:
+        super().__init__(api_version)
+
+    def create_action(
+        self,
+        task: Task,
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        variable_store = super().create_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+        variable_store.add_variable(variable_name=self.create_identifier(task=task, variable_name='COORDINATES'), value=self.coordinates)
+        return variable_store
+
+
+class VariableReaderTaskProcessor(DummyTaskProcessor1):
+    """Records the value of the variable named by `readVariable` in the spec, without referencing it in the spec"""
+
+    def __init__(self, api_version: str='VariableReaderTaskProcessor/v1') -> None:
+        super().__init__(api_version)
+
+    def create_action(
+        self,
+        task: Task,
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        variable_store = super().create_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+        value = variable_store.get_variable(variable_name=task.spec['readVariable'])
+        variable_store.add_variable(variable_name=self.create_identifier(task=task, variable_name='SEEN'), value=list(value))
+        return variable_store
+
+
+class AsyncConcurrencyCheckTaskProcessor(DummyTaskProcessor1):
+    """Records the maximum number of create actions in flight at the same time"""
+
+    tasks_in_flight_qty = 0
+    max_tasks_in_flight_qty = 0
+
+    def __init__(self, api_version: str='AsyncConcurrencyCheckTaskProcessor/v1') -> None:
+        super().__init__(api_version)
+
+    async def create_action_async(
+        self,
+        task: Task,
+        persistence: StatePersistence=StatePersistence(),
+        variable_store: VariableStore=VariableStore(),
+        task_resolved_spec: dict=dict()
+    )->VariableStore:
+        AsyncConcurrencyCheckTaskProcessor.tasks_in_flight_qty += 1
+        if AsyncConcurrencyCheckTaskProcessor.tasks_in_flight_qty > AsyncConcurrencyCheckTaskProcessor.max_tasks_in_flight_qty:
+            AsyncConcurrencyCheckTaskProcessor.max_tasks_in_flight_qty = AsyncConcurrencyCheckTaskProcessor.tasks_in_flight_qty
+        await asyncio.sleep(0.05)
+        AsyncConcurrencyCheckTaskProcessor.tasks_in_flight_qty -= 1
+        return super().create_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+
+
 class TestDummyTaskProcessor1(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -663,6 +753,31 @@ class TestDummyTaskProcessor1(unittest.TestCase):    # pragma: no cover
         self.assertTrue(variable_store.variable_store['test-task:RESOURCE_DRIFTED'])
 
 
+class LifecycleTrackingTaskProcessor(DummyTaskProcessor1):
+
+    lifecycle_events = list()
+
+    def warm_up(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events.append(('WarmUp', id(self),))
+
+    def shut_down(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events.append(('ShutDown', id(self),))
+
+
+class ProcessIdTaskProcessor(DummyTaskProcessor1):
+
+    def create_action(self, task: Task, persistence: StatePersistence=StatePersistence(), variable_store: VariableStore=VariableStore(), task_resolved_spec: dict=dict())->VariableStore:
+        updated_variable_store = super().create_action(task=task, persistence=persistence, variable_store=variable_store, task_resolved_spec=task_resolved_spec)
+        updated_variable_store.add_variable(variable_name=self.create_identifier(task=task, variable_name='PROCESS_ID'), value=os.getpid())
+        return updated_variable_store
+
+
+class FailingTaskProcessor(DummyTaskProcessor1):
+
+    def create_action(self, task: Task, persistence: StatePersistence=StatePersistence(), variable_store: VariableStore=VariableStore(), task_resolved_spec: dict=dict())->VariableStore:
+        raise Exception('Failed to create resource')
+
+
 class TestTaskProcessStore(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -711,6 +826,51 @@ class TestTaskProcessStore(unittest.TestCase):    # pragma: no cover
             )
 
 
+    def test_lifecycle_singleton_01(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events = list()
+        task_processor = LifecycleTrackingTaskProcessor()
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=task_processor, lifecycle='Singleton')
+        p1 = task_processor_store.get_task_processor_for_task(task=self.task)
+        task_processor_store.release_task_processor(task_processor=p1)
+        p2 = task_processor_store.get_task_processor_for_task(task=self.task)
+        self.assertIs(p1, task_processor)
+        self.assertIs(p2, task_processor)
+        self.assertEqual(LifecycleTrackingTaskProcessor.lifecycle_events, [('WarmUp', id(task_processor),)])
+        task_processor_store.shut_down()
+        self.assertEqual(LifecycleTrackingTaskProcessor.lifecycle_events[-1], ('ShutDown', id(task_processor),))
+
+    def test_lifecycle_per_workflow_01(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events = list()
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=LifecycleTrackingTaskProcessor(), lifecycle='PerWorkflow')
+        task_processor_store.start_workflow()
+        p1 = task_processor_store.get_task_processor_for_task(task=self.task)
+        task_processor_store.release_task_processor(task_processor=p1)
+        p2 = task_processor_store.get_task_processor_for_task(task=self.task)
+        self.assertIs(p1, p2)
+        self.assertEqual(len(LifecycleTrackingTaskProcessor.lifecycle_events), 1)
+        task_processor_store.end_workflow()
+        self.assertEqual(LifecycleTrackingTaskProcessor.lifecycle_events, [('WarmUp', id(p1),), ('ShutDown', id(p1),)])
+        task_processor_store.start_workflow()
+        self.assertIsNot(task_processor_store.get_task_processor_for_task(task=self.task), p1)
+        task_processor_store.end_workflow()
+
+    def test_lifecycle_per_task_01(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events = list()
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=LifecycleTrackingTaskProcessor())
+        p1 = task_processor_store.get_task_processor_for_task(task=self.task)
+        p2 = task_processor_store.get_task_processor_for_task(task=self.task)
+        self.assertIsNot(p1, p2)
+        task_processor_store.release_task_processor(task_processor=p1)
+        self.assertEqual(LifecycleTrackingTaskProcessor.lifecycle_events, [('WarmUp', id(p1),), ('WarmUp', id(p2),), ('ShutDown', id(p1),)])
+
+    def test_lifecycle_invalid_01(self):
+        with self.assertRaises(Exception):
+            TaskProcessStore().register_task_processor(task_processor=DummyTaskProcessor1(), lifecycle='Forever')
+
+
 class TestTasks(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -1151,6 +1311,102 @@ class TestTasks(unittest.TestCase):    # pragma: no cover
             self.assertIsInstance(task, Task)
             self.assertTrue(task.task_id.startswith('test-task-0'))
 
+    def test_tasks_hold_read_only_copies_01(self):
+        tasks = Tasks()
+        tasks.add_task(task=self.task_01)
+        self.task_01.spec = {'changed': True}
+        task = tasks.get_task_instance_by_name(task_name='test-task-01')
+        self.assertIs(task, tasks.get_task_instance_by_name(task_name='test-task-01'))
+        self.assertIs(task, tasks[0])
+        self.assertEqual(task.spec, {'testField': 'testValue'})
+        with self.assertRaises(Exception) as context_manager:
+            task.state = None
+        self.assertTrue('read only' in str(context_manager.exception))
+        for modifiable_task in (task.clone(), copy.deepcopy(task),):
+            modifiable_task.state = None
+            self.assertIsNone(modifiable_task.state)
+            self.assertIsNotNone(task.state)
+
+    def test_tasks_hold_read_only_copies_02(self):
+        tasks = Tasks()
+        tasks.add_task(task=Task(api_version='v1', kind='Test', metadata={'name': 'nested', 'dependencies': [{'tasks': ['other']}]}, spec={'items': [{'key': 'value'}]}))
+        task = tasks.get_task_instance_by_name(task_name='nested')
+        for change in (
+            lambda: task.metadata.update({'name': 'changed'}),
+            lambda: task.metadata['dependencies'][0]['tasks'].append('another'),
+            lambda: task.spec['items'][0].pop('key'),
+            lambda: task.spec.__setitem__('new', 1),
+        ):
+            with self.assertRaises(Exception) as context_manager:
+                change()
+            self.assertTrue('read only' in str(context_manager.exception))
+        self.assertEqual(tasks.tasks['nested']['TaskDependencies'], tasks._extract_task_dependencies(metadata=task.metadata))
+        self.assertIsInstance(task.spec, dict)
+        self.assertEqual(json.loads(json.dumps(task.spec)), {'items': [{'key': 'value'}]})
+        self.assertEqual(pickle.loads(pickle.dumps(task)).spec, task.spec)
+
+        state_copy = task.clone(state_only=True)
+        self.assertIs(state_copy.spec, task.spec)
+        self.assertIs(state_copy.metadata, task.metadata)
+        self.assertIsNot(state_copy.state, task.state)
+        state_copy.state = None
+        self.assertIsNotNone(task.state)
+
+        modifiable_spec = copy.deepcopy(task.spec)
+        modifiable_spec['items'][0]['key'] = 'changed'
+        self.assertEqual(task.spec['items'][0]['key'], 'value')
+
+    def test_task_names_scoped_for_processing_01(self):
+        def create_task(name: str, processing_scope: object)->Task:
+            metadata = {'name': name}
+            if processing_scope is not None:
+                metadata['processingScope'] = processing_scope
+            return Task(api_version='DummyTaskProcessor1/v1', kind='DummyTaskProcessor1', metadata=metadata, spec={})
+        tasks = Tasks()
+        tasks.add_task(task=create_task(name='no-scope', processing_scope=None))
+        tasks.add_task(task=create_task(name='command-and-context', processing_scope=[{'commands': ['create', 'delete'], 'contexts': ['con1']}]))
+        tasks.add_task(task=create_task(name='command-only', processing_scope=[{'commands': ['delete']}]))
+        tasks.add_task(task=create_task(name='context-only', processing_scope=[{'contexts': ['con2']}, None]))
+        tasks.add_task(task=create_task(name='irregular', processing_scope=[{'commands': 'create-or-update'}]))
+        self.assertEqual(tasks.get_task_names_scoped_for_processing(command='create', context='con1'), {'no-scope', 'command-and-context', 'irregular'})
+        self.assertEqual(tasks.get_task_names_scoped_for_processing(command='delete', context='con2'), {'no-scope', 'command-only', 'context-only'})
+        self.assertEqual(tasks.get_task_names_scoped_for_processing(command='update', context='con3'), {'no-scope', 'irregular'})
+        self.assertFalse(tasks.task_scoped_for_processing(task_name='command-only', command='create', context='con1'))
+
+        # Replacing a task also replaces its scope
+        tasks.add_task(task=create_task(name='command-only', processing_scope=[{'commands': ['create']}]))
+        self.assertTrue(tasks.task_scoped_for_processing(task_name='command-only', command='create', context='con1'))
+        self.assertFalse(tasks.task_scoped_for_processing(task_name='command-only', command='delete', context='con2'))
+        with self.assertRaises(Exception):
+            tasks.task_scoped_for_processing(task_name='unknown', command='create', context='con1')
+
+    def test_task_dependencies_and_dependants_01(self):
+        def create_task(name: str, dependencies: list=list())->Task:
+            return Task(api_version='DummyTaskProcessor1/v1', kind='DummyTaskProcessor1', metadata={'name': name, 'dependencies': dependencies}, spec={})
+        tasks = Tasks()
+        tasks.add_task(task=create_task(name='a'))
+        tasks.add_task(task=create_task(name='b'))
+        tasks.add_task(task=create_task(name='c', dependencies=[
+            {'tasks': ['a'], 'commands': ['create'], 'contexts': ['con1']},
+            {'tasks': ['b'], 'commands': ['delete']},
+        ]))
+        tasks.add_task(task=create_task(name='d', dependencies=[
+            {'tasks': ['b'], 'contexts': ['con1']},
+            {'tasks': ['a']},
+        ]))
+        self.assertEqual(tasks.get_task_dependencies_as_list_of_task_names(task_name='c', command='create', context='con1'), ['a'])
+        self.assertEqual(tasks.get_task_dependencies_as_list_of_task_names(task_name='c', command='delete', context='con2'), ['b'])
+        self.assertEqual(tasks.get_task_dependencies_as_list_of_task_names(task_name='d', command='delete', context='con1'), ['b', 'a'])
+        self.assertEqual(tasks.get_task_dependants_as_list_of_task_names(task_name='a', command='create', context='con1'), ['c', 'd'])
+        self.assertEqual(tasks.get_task_dependants_as_list_of_task_names(task_name='a', command='create', context='con2'), ['d'])
+        self.assertEqual(tasks.get_task_dependants_as_list_of_task_names(task_name='b', command='delete', context='con1'), ['c', 'd'])
+        self.assertEqual(tasks.get_task_dependants_as_list_of_task_names(task_name='b', command='update', context='con2'), [])
+
+        # Replacing a task also replaces its dependencies
+        tasks.add_task(task=create_task(name='c'))
+        self.assertEqual(tasks.get_task_dependencies_as_list_of_task_names(task_name='c', command='create', context='con1'), [])
+        self.assertEqual(tasks.get_task_dependants_as_list_of_task_names(task_name='a', command='create', context='con1'), ['d'])
+
     def test_task_ordering_dependency_raises_exception_01(self):
         # setup most basic dependency
         self.task_01.metadata['processingScope'] = [
@@ -1218,6 +1474,75 @@ class TestTasks(unittest.TestCase):    # pragma: no cover
             print_logger_lines(logger=logger)
             logger.reset()
 
+    def test_task_ordering_circular_dependency_raises_exception_01(self):
+        self.task_01.metadata['dependencies'] = [
+            {
+                'tasks': ['test-task-03',],
+            }
+        ]
+        self.task_02.metadata['dependencies'] = [
+            {
+                'tasks': ['test-task-01',],
+            }
+        ]
+        self.task_03.metadata['dependencies'] = [
+            {
+                'tasks': ['test-task-02',],
+            }
+        ]
+        tasks = Tasks()
+        tasks.add_task(task=copy.deepcopy(self.task_01))
+        tasks.add_task(task=copy.deepcopy(self.task_02))
+        tasks.add_task(task=copy.deepcopy(self.task_03))
+        tasks.add_task(task=copy.deepcopy(self.task_04))
+        with self.assertRaises(Exception) as context_manager:
+            tasks.get_task_names_in_order(command='command1', context='con1')
+
+        print_logger_lines(logger=logger)
+
+        self.assertTrue('test-task-01 -> test-task-03 -> test-task-02 -> test-task-01' in str(context_manager.exception))
+
+    def test_task_ordering_long_chain_01(self):
+        tasks = Tasks()
+        for i in range(2000):
+            metadata = {'name': 'chain-task-{}'.format(i)}
+            if i > 0:
+                metadata['dependencies'] = [{'tasks': ['chain-task-{}'.format(i-1),],},]
+            tasks.add_task(task=Task(api_version='DummyTaskProcessor1/v1', kind='DummyTaskProcessor1', metadata=metadata, spec={'index': i}))
+        result = tasks.get_task_names_in_order(command='command1', context='con1')
+        self.assertEqual(len(result), 2000)
+        self.assertEqual(result, ['chain-task-{}'.format(i) for i in range(2000)])
+
+    def test_task_dependency_graph_cache_cleared_on_add_task_01(self):
+        self.task_02.metadata['dependencies'] = [
+            {
+                'tasks': ['test-task-01',],
+            }
+        ]
+        tasks = Tasks()
+        tasks.add_task(task=copy.deepcopy(self.task_02))
+        tasks.add_task(task=copy.deepcopy(self.task_01))
+        graph = tasks.get_task_dependency_graph(command='command1', context='con1')
+        self.assertEqual(graph['TaskNamesInOrder'], ['test-task-01', 'test-task-02'])
+        self.assertEqual(graph['Dependencies']['test-task-02'], ['test-task-01'])
+        self.assertEqual(graph['Dependants']['test-task-01'], ['test-task-02'])
+        self.assertIs(graph, tasks.get_task_dependency_graph(command='command1', context='con1'))
+
+        tasks.add_task(task=copy.deepcopy(self.task_03))
+        result = tasks.get_task_names_in_order(command='command1', context='con1')
+        self.assertEqual(result, ['test-task-01', 'test-task-02', 'test-task-03'])
+
+    def test_task_dependency_graph_depth_first_order_01(self):
+        tasks = Tasks()
+        for task_name, dependency_task_names in (('task-a', ['task-c', 'task-d',]), ('task-b', []), ('task-c', ['task-d',]), ('task-d', [])):
+            metadata = {'name': task_name}
+            if len(dependency_task_names) > 0:
+                metadata['dependencies'] = [{'tasks': dependency_task_names},]
+            tasks.add_task(task=Task(api_version='v1', kind='TestKind', metadata=metadata, spec={}))
+        # Dependencies are listed right before the first task depending on them, like the former recursive ordering
+        self.assertEqual(tasks.get_task_names_in_order(command='command1', context='con1'), ['task-d', 'task-c', 'task-a', 'task-b'])
+        self.assertEqual(tasks.get_task_names_in_order(command='command1', context='con1', reverse=True), ['task-b', 'task-a', 'task-c', 'task-d'])
+
 
 class TestVariousFunctions(unittest.TestCase):    # pragma: no cover
 
@@ -1255,6 +1580,58 @@ class TestVariousFunctions(unittest.TestCase):    # pragma: no cover
         self.assertTrue('----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------' in result)
 
 
+class TestClassChecksumEngine(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def test_method_hexdigest_key_order_independent_01(self):
+        engine = ChecksumEngine(algorithm='blake2b')
+        checksum_1 = engine.hexdigest(data={'a': 1, 'b': {'c': [1, 2], 'd': None}})
+        checksum_2 = engine.hexdigest(data={'b': {'d': None, 'c': [1, 2]}, 'a': 1})
+        self.assertEqual(checksum_1, checksum_2)
+        self.assertEqual(len(checksum_1), 64)
+
+    def test_method_hexdigest_typed_encoding_01(self):
+        engine = ChecksumEngine(algorithm='blake2b')
+        checksums = set()
+        for data in ({'a': 1}, {'a': '1'}, {'a': 1.0}, {'a': True}, {'a': None}, {'a': [1]}, {1: 1}, {'a': {'b': 1}}, {'a': '{"b": 1}'}):
+            checksums.add(engine.hexdigest(data=data))
+        self.assertEqual(len(checksums), 9)
+        self.assertEqual(engine.hexdigest(data={'a': [1, 2]}), engine.hexdigest(data={'a': (1, 2,)}))
+        self.assertNotEqual(engine.hexdigest(data={'a': [1, 2]}), engine.hexdigest(data={'a': [2, 1]}))
+
+    def test_method_hexdigest_algorithms_01(self):
+        data = {'a': 1}
+        self.assertNotEqual(ChecksumEngine(algorithm='blake2b').hexdigest(data=data), ChecksumEngine(algorithm='sha256').hexdigest(data=data))
+        self.assertEqual(len(ChecksumEngine(algorithm='sha256').digest(data=data)), 32)
+        with self.assertRaises(Exception):
+            ChecksumEngine(algorithm='md5')
+
+    def test_method_digest_memo_01(self):
+        engine = ChecksumEngine(algorithm='blake2b')
+        nested = {'b': [1, 2, 3]}
+        memo = dict()
+        checksum_1 = engine.digest(data={'a': nested}, memo=memo)
+        self.assertTrue(id(nested) in memo)
+        self.assertEqual(engine.digest(data={'a': nested}, memo=memo), checksum_1)
+        self.assertEqual(engine.digest(data={'a': {'b': [1, 2, 3]}}), checksum_1)
+
+    def test_method_matches_01(self):
+        engine = ChecksumEngine()
+        self.assertEqual(engine.algorithm, 'blake2b')
+        data = {'b': [1, 2], 'a': 'x'}
+        legacy_checksum = hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+        self.assertNotEqual(engine.hexdigest(data=data), legacy_checksum)
+        self.assertTrue(engine.matches(checksum=engine.hexdigest(data=data), data=data))
+        self.assertTrue(engine.matches(checksum=legacy_checksum, data=data))
+        self.assertFalse(engine.matches(checksum=legacy_checksum, data={'a': 'x', 'b': [1, 2]}))
+        self.assertFalse(engine.matches(checksum=None, data=data))
+        self.assertFalse(ChecksumEngine(algorithm='sha256-json').matches(checksum=engine.hexdigest(data=data), data=data))
+
+
 class TestClassTaskState(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -1436,7 +1813,7 @@ class TestClassTaskState(unittest.TestCase):    # pragma: no cover
         print(produce_column_headers())
         print(produce_column_header_horizontal_line())
         print('{}'.format(result))
-        self.assertTrue('test-task-01      Yes      1970-01-01 01:16:40        Yes                Yes                38320c1e644eb074b24bb343e131e420  fcacd5b851d3ef945b3b11bf07ad1e17  a                                 b' in result)
+        self.assertTrue('test-task-01      Yes      1970-01-01 01:16:40        Yes                Yes                9366566792a85866b78492e1706a7eab  dbde9f4746f515b04c50cb5553ff1988  a                                 b' in result)
 
     def test_method_repr(self):
         task_state = TaskState(
@@ -1454,6 +1831,233 @@ class TestClassTaskState(unittest.TestCase):    # pragma: no cover
         self.assertIsNotNone(result)
         self.assertIsInstance(result, str)
 
+    def test_spec_checksums_cached_01(self):
+        task_state = TaskState(
+            applied_spec={'field_value': 1},
+            resolved_spec={'field_value': 1},
+            report_label='test-task-01',
+            created_timestamp=1000
+        )
+        applied_spec_checksum = task_state.applied_spec_checksum
+        self.assertEqual(applied_spec_checksum, task_state.calculate_manifest_state_checksum(spec={'field_value': 1}))
+        self.assertEqual(task_state.current_resolved_spec_checksum, applied_spec_checksum)
+        self.assertIs(task_state.applied_spec_checksum, applied_spec_checksum)
+
+        # Checksums are only recalculated after a new spec is set
+        self.assertTrue(task_state.to_dict(current_resolved_spec={'field_value': 2})['SpecDrifted'])
+        self.assertIs(task_state.applied_spec_checksum, applied_spec_checksum)
+        self.assertNotEqual(task_state.current_resolved_spec_checksum, applied_spec_checksum)
+        task_state.update_applied_spec(new_applied_spec={'field_value': 2}, new_applied_resource_checksum='a', updated_timestamp=2000)
+        self.assertNotEqual(task_state.applied_spec_checksum, applied_spec_checksum)
+        self.assertFalse(task_state.to_dict()['SpecDrifted'])
+
+    def test_to_dict_current_resolved_spec_checksum_without_argument_01(self):
+        task_state = TaskState(
+            applied_spec={'field_value': 1},
+            resolved_spec={'field_value': 2},
+            report_label='test-task-01',
+            created_timestamp=1000
+        )
+        data = task_state.to_dict(with_checksums=True)
+        self.assertEqual(data['CurrentResolvedSpecChecksum'], task_state.calculate_manifest_state_checksum(spec={'field_value': 2}))
+
+    def test_function_produce_state_report_01(self):
+        task_states = list()
+        for i in range(3):
+            task_states.append(
+                TaskState(
+                    applied_spec={'field_value': 1},
+                    resolved_spec={'field_value': 1},
+                    report_label='test-task-0{}'.format(i),
+                    created_timestamp=1000,
+                    applied_resources_checksum='a',
+                    current_resource_checksum='a'
+                )
+            )
+        report = produce_state_report(task_states=task_states, current_resolved_specs={'test-task-01': {'field_value': 2}})
+        print(report)
+        lines = report.split('\n')
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0], produce_column_headers())
+        created_timestamp = datetime.fromtimestamp(1000).strftime('%Y-%m-%d %H:%M:%S %z').strip()
+        expected_column_qty = len(created_timestamp.split()) + 3
+        self.assertEqual(lines[2].split()[:expected_column_qty], ['test-task-00', 'Yes',] + created_timestamp.split() + ['No',])
+        self.assertEqual(lines[3].split()[:expected_column_qty], ['test-task-01', 'Yes',] + created_timestamp.split() + ['Yes',])
+
+    def test_spec_checksum_recalculated_after_in_place_update_01(self):
+        resolved_spec = {'field_value': 1}
+        task_state = TaskState(applied_spec={'field_value': 1}, resolved_spec=resolved_spec, created_timestamp=1000)
+        self.assertEqual(task_state.applied_spec_checksum, task_state.current_resolved_spec_checksum)
+        self.assertIsNone(task_state.to_dict()['SpecDrifted'])
+        resolved_spec['field_value'] = 2
+        task_state.current_resolved_spec = resolved_spec
+        self.assertNotEqual(task_state.applied_spec_checksum, task_state.current_resolved_spec_checksum)
+        self.assertTrue(task_state.to_dict()['SpecDrifted'])
+
+    def test_function_write_state_report_01(self):
+        def task_states_generator():
+            for i in range(3):
+                yield TaskState(
+                    applied_spec={'field_value': 1},
+                    resolved_spec={'field_value': 1},
+                    report_label='test-task-0{}'.format(i),
+                    created_timestamp=1000,
+                    applied_resources_checksum='a',
+                    current_resource_checksum='a'
+                )
+
+        output = io.StringIO()
+        self.assertEqual(write_state_report(task_states=task_states_generator(), output=output, output_format='csv', human_readable=False, with_checksums=True), 3)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]['Label'], 'test-task-01')
+        self.assertEqual(rows[1]['ResourceDrifted'], 'False')
+        self.assertEqual(rows[1]['AppliedResourcesChecksum'], 'a')
+
+        output = io.StringIO()
+        write_state_report(task_states=task_states_generator(), output=output, output_format='ndjson', current_resource_checksums={'test-task-02': 'b'})
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]['ResourceDrifted'], 'No')
+        self.assertEqual(records[2]['ResourceDrifted'], 'Yes')
+
+        with self.assertRaises(Exception):
+            write_state_report(task_states=task_states_generator(), output=io.StringIO(), output_format='xml')
+
+    def test_compact_representation_01(self):
+        checksum = hashlib.sha256('resources'.encode('utf-8')).hexdigest()
+        task_state = TaskState(
+            manifest_spec={'field_value': 1},
+            applied_spec={'field_value': 1},
+            resolved_spec={'field_value': 1},
+            report_label='test-task-01',
+            created_timestamp=1000,
+            applied_resources_checksum=checksum,
+            current_resource_checksum='a'
+        )
+        self.assertFalse(hasattr(task_state, '__dict__'))
+        self.assertIsInstance(task_state._applied_resources_checksum, bytes)
+        self.assertEqual(len(task_state._applied_resources_checksum), 32)
+        self.assertEqual(task_state.applied_resources_checksum, checksum)
+        self.assertEqual(task_state.current_resource_checksum, 'a')
+
+    def test_load_baseline_format_state_01(self):
+        # TASK_STATE as persisted before the ChecksumEngine was introduced
+        spec = {'field_value': 1, 'nested': {'b': 2, 'a': [1, 'x']}}
+        task_id = hashlib.sha256(json.dumps(spec, default=str).encode('utf-8')).hexdigest()[0:16]
+        applied_spec_checksum = hashlib.sha256(json.dumps({'spec': spec, 'metadata': dict()}).encode('utf-8')).hexdigest()
+        persistence = StatePersistence()
+        persistence.update_object_state(
+            object_identifier='{}:TASK_STATE'.format(task_id),
+            data={
+                'Label': task_id,
+                'IsCreated': True,
+                'CreatedTimestamp': 1000,
+                'SpecDrifted': None,
+                'ResourceDrifted': False,
+                'AppliedSpecChecksum': applied_spec_checksum,
+                'CurrentResolvedSpecChecksum': applied_spec_checksum,
+                'AppliedResourcesChecksum': 'a',
+                'CurrentResourceChecksum': 'a',
+                'AppliedSpec': spec,
+            }
+        )
+
+        task = Task(api_version='v1', kind='Test', metadata=dict(), spec=spec)
+        self.assertEqual(task.task_id, task_id)
+        persisted_state = persistence.get(object_identifier='{}:TASK_STATE'.format(task.task_id))
+        self.assertIsNotNone(persisted_state)
+        task_state = TaskState(
+            manifest_spec=task.spec,
+            applied_spec=persisted_state['AppliedSpec'],
+            resolved_spec=copy.deepcopy(task.spec),
+            report_label=task.task_id,
+            created_timestamp=persisted_state['CreatedTimestamp'],
+            applied_resources_checksum=persisted_state['AppliedResourcesChecksum'],
+            current_resource_checksum=persisted_state['CurrentResourceChecksum']
+        )
+        data = task_state.to_dict(with_checksums=True)
+        # The canonical checksum differs, but the persisted checksum is still accepted
+        self.assertNotEqual(data['AppliedSpecChecksum'], persisted_state['AppliedSpecChecksum'])
+        self.assertTrue(task_state.applied_spec_checksum_matches(checksum=persisted_state['AppliedSpecChecksum']))
+        self.assertTrue(task_state.applied_spec_checksum_matches(checksum=data['AppliedSpecChecksum']))
+        self.assertFalse(task_state.applied_spec_checksum_matches(checksum='a'))
+        self.assertIsNone(data['SpecDrifted'])
+        self.assertFalse(data['ResourceDrifted'])
+
+    def test_spec_blob_store_shared_specs_01(self):
+        spec_blob_store = SpecBlobStore()
+        task_states = list()
+        for i in range(10):
+            task_states.append(
+                TaskState(
+                    manifest_spec={'field_value': 1},
+                    applied_spec={'field_value': 1},
+                    resolved_spec={'field_value': 1},
+                    manifest_metadata={'name': 'test-task-{}'.format(i)},
+                    report_label='test-task-{}'.format(i),
+                    created_timestamp=1000,
+                    spec_blob_store=spec_blob_store
+                )
+            )
+        # One spec and ten distinct metadata dicts - the applied and resolved specs are not held in the store
+        self.assertEqual(len(spec_blob_store), 11)
+        self.assertIs(task_states[0].raw_spec, task_states[9].raw_spec)
+        self.assertEqual(task_states[9].applied_spec, {'field_value': 1})
+        self.assertEqual(task_states[3].raw_metadata, {'name': 'test-task-3'})
+
+        copied_task_state = copy.deepcopy(task_states[0])
+        self.assertIs(copied_task_state.spec_blob_store, spec_blob_store)
+        copied_task_state.update_applied_spec(new_applied_spec={'field_value': 2}, new_applied_resource_checksum='b', updated_timestamp=2000)
+        self.assertEqual(copied_task_state.applied_spec, {'field_value': 2})
+        self.assertEqual(task_states[0].applied_spec, {'field_value': 1})
+        self.assertTrue(copied_task_state.to_dict()['SpecDrifted'])
+        self.assertEqual(len(spec_blob_store), 11)
+
+        with self.assertRaises(Exception) as context_manager:
+            task_states[0].raw_spec['field_value'] = 3
+        self.assertTrue('read only' in str(context_manager.exception))
+        self.assertEqual(task_states[9].applied_spec, {'field_value': 1})
+        modifiable_spec = copy.deepcopy(task_states[0].raw_spec)
+        modifiable_spec['field_value'] = 3
+        self.assertEqual(task_states[9].raw_spec, {'field_value': 1})
+
+    def test_spec_blob_store_used_by_tasks_01(self):
+        tasks = Tasks()
+        for i in range(10):
+            tasks.add_task(task=Task(api_version='v1', kind='Test', metadata={'name': 'test-task-{}'.format(i)}, spec={'field_value': 1}))
+        # One spec and ten distinct metadata dicts
+        self.assertEqual(len(tasks.spec_blob_store), 11)
+        task_state_00 = tasks.get_task_instance_by_name(task_name='test-task-0').state
+        task_state_09 = tasks.get_task_instance_by_name(task_name='test-task-9').state
+        self.assertIs(task_state_00.spec_blob_store, tasks.spec_blob_store)
+        self.assertIsInstance(task_state_00._raw_spec, bytes)
+        self.assertIs(task_state_00.raw_spec, task_state_09.raw_spec)
+        self.assertEqual(task_state_09.raw_metadata, {'name': 'test-task-9'})
+        with self.assertRaises(Exception):
+            task_state_00.raw_spec['field_value'] = 2
+        self.assertEqual(task_state_09.raw_spec, {'field_value': 1})
+
+    def test_spec_blob_store_distinct_specs_01(self):
+        tasks = Tasks()
+        specs = (
+            {'a': (1, 2,), 'when': '2024-01-01 00:00:00'},
+            {'a': [1, 2], 'when': datetime(2024, 1, 1)},
+            {1: 'a'},
+            {'1': 'a'},
+        )
+        for i, spec in enumerate(specs):
+            tasks.add_task(task=Task(api_version='v1', kind='Test', metadata={'name': 'test-task-{}'.format(i)}, spec=spec))
+        for i, spec in enumerate(specs):
+            raw_spec = tasks.get_task_instance_by_name(task_name='test-task-{}'.format(i)).state.raw_spec
+            self.assertEqual(raw_spec, spec)
+            for key, value in spec.items():
+                self.assertIsInstance(raw_spec[key], type(value))
+        spec_blob_store = SpecBlobStore()
+        self.assertNotEqual(spec_blob_store.put(data={'a': (1, 2,)}), spec_blob_store.put(data={'a': [1, 2]}))
+        self.assertEqual(spec_blob_store.put(data={'a': [1, 2]}), spec_blob_store.put(data={'a': [1, 2]}))
+        self.assertEqual(len(spec_blob_store), 2)
+
 
 class TestClassStatePersistence(unittest.TestCase):    # pragma: no cover
 
@@ -1516,6 +2120,181 @@ class TestClassStatePersistence(unittest.TestCase):    # pragma: no cover
         self.assertIsInstance(p.state_cache, dict)
         self.assertEqual(len(p.state_cache), 1)
 
+    def test_lazy_get_and_prefetch_01(self):
+        class MyStatePersistence(StatePersistence):
+            def load(self, on_failure: object=False)->bool:
+                raise Exception('load() must not be called in lazy mode')
+            def load_objects_state(self, object_identifiers: list)->dict:
+                self.requested_object_identifiers.append(list(object_identifiers))
+                objects_state = dict()
+                for object_identifier in object_identifiers:
+                    if object_identifier.startswith('found'):
+                        objects_state[object_identifier] = {'value': object_identifier}
+                return objects_state
+
+        p = MyStatePersistence(lazy=True)
+        p.requested_object_identifiers = list()
+        p.prefetch(object_identifiers=['found-1', 'missing-1', 'found-2'])
+        self.assertEqual(p.get(object_identifier='found-1'), {'value': 'found-1'})
+        self.assertEqual(p.get(object_identifier='missing-1'), dict())
+        self.assertEqual(p.get(object_identifier='found-3'), {'value': 'found-3'})
+        self.assertEqual(p.get(object_identifier='missing-2'), dict())
+        self.assertEqual(p.get(object_identifier='missing-2'), dict())
+        p.prefetch(object_identifiers=['found-1', 'missing-1', 'missing-2'])
+        self.assertEqual(p.requested_object_identifiers, [['found-1', 'missing-1', 'found-2'], ['found-3'], ['missing-2']])
+        p.update_object_state(object_identifier='missing-1', data={'value': 1})
+        self.assertEqual(p.get(object_identifier='missing-1'), {'value': 1})
+
+
+class TestClassSqliteStatePersistence(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = '{}{}state.db'.format(self.temp_dir.name, os.sep)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def _read_rows(self)->dict:
+        connection = sqlite3.connect(self.path)
+        rows = dict(connection.execute('SELECT object_identifier, data FROM task_state').fetchall())
+        connection.close()
+        return rows
+
+    def test_flush_and_load_01(self):
+        p = SqliteStatePersistence(configuration={'path': self.path, 'commit_interval': 0})
+        p.update_object_state(object_identifier='a', data={'result': 'it worked!'})
+        p.update_object_state(object_identifier='b', data={'result': 1})
+        p.commit()
+        self.assertEqual(len(self._read_rows()), 0)
+        p.flush()
+        self.assertEqual(len(self._read_rows()), 2)
+        p.close()
+
+        p = SqliteStatePersistence(configuration={'path': self.path})
+        self.assertEqual(p.get(object_identifier='a'), {'result': 'it worked!'})
+        self.assertEqual(p.state_cache['b'], {'result': 1})
+        p.close()
+
+    def test_commit_writes_by_default_01(self):
+        p = SqliteStatePersistence(configuration={'path': self.path})
+        self.assertEqual(p.commit_interval, 1)
+        p.update_object_state(object_identifier='a', data={'result': 1})
+        p.commit()
+        self.assertEqual(self._read_rows(), {'a': '{"result": 1}'})
+        p.update_object_state(object_identifier='a', data={'result': 2})
+        p.commit()
+        self.assertEqual(self._read_rows(), {'a': '{"result": 2}'})
+        # Without close() or flush(), nothing is left outstanding
+        self.assertEqual(len(p._dirty_object_identifiers), 0)
+        p.close()
+
+    def test_only_changed_objects_written_01(self):
+        p = SqliteStatePersistence(configuration={'path': self.path, 'commit_interval': 2})
+        p.update_object_state(object_identifier='a', data={'result': 1})
+        p.update_object_state(object_identifier='b', data={'result': 1})
+        p.flush()
+        total_changes = p._connection.total_changes
+        p.update_object_state(object_identifier='a', data={'result': 2})
+        p.commit()
+        self.assertEqual(self._read_rows()['a'], '{"result": 1}')
+        p.commit()
+        self.assertEqual(self._read_rows()['a'], '{"result": 2}')
+        self.assertEqual(p._connection.total_changes - total_changes, 1)
+        p.close()
+
+    def test_get_single_object_without_full_load_01(self):
+        p1 = SqliteStatePersistence(configuration={'path': self.path})
+        p2 = SqliteStatePersistence(configuration={'path': self.path}, load_on_init=False)
+        p1.update_object_state(object_identifier='a', data={'result': 1})
+        p1.update_object_state(object_identifier='b', data={'result': 2})
+        p1.flush()
+        self.assertEqual(p2.get(object_identifier='a'), {'result': 1})
+        self.assertFalse('b' in p2.state_cache)
+        self.assertEqual(p2.get(object_identifier='c'), dict())
+        p1.close()
+        p2.close()
+
+    def test_lazy_prefetch_01(self):
+        p1 = SqliteStatePersistence(configuration={'path': self.path})
+        for i in range(1200):
+            p1.update_object_state(object_identifier='object-{}'.format(i), data={'result': i})
+        p1.flush()
+        p2 = SqliteStatePersistence(configuration={'path': self.path, 'lazy': True})
+        self.assertEqual(len(p2.state_cache), 0)
+        p2.prefetch(object_identifiers=['object-{}'.format(i) for i in range(0, 1200, 2)] + ['object-x',])
+        self.assertEqual(len(p2.state_cache), 600)
+        self.assertEqual(p2.get(object_identifier='object-1198'), {'result': 1198})
+        self.assertEqual(p2.get(object_identifier='object-x'), dict())
+        p1.close()
+        p2.close()
+
+
+class TestClassSqliteWorkQueue(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = '{}{}work-queue.db'.format(self.temp_dir.name, os.sep)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def test_lease_and_complete_01(self):
+        q1 = SqliteWorkQueue(configuration={'path': self.path})
+        q2 = SqliteWorkQueue(configuration={'path': self.path})
+        q1.publish(work_item_id='item-1', payload={'Value': 1})
+        q1.publish(work_item_id='item-2', payload={'Value': 2})
+        work_item = q2.lease(worker_id='worker-1', lease_duration=30.0)
+        self.assertEqual(work_item, {'WorkItemId': 'item-1', 'Payload': {'Value': 1}, 'Attempts': 1})
+        self.assertIsNone(q1.get_outcome(work_item_id='item-1'))
+        self.assertEqual(q2.lease(worker_id='worker-2', lease_duration=30.0)['WorkItemId'], 'item-2')
+        self.assertIsNone(q2.lease(worker_id='worker-3', lease_duration=30.0))
+        self.assertTrue(q2.heartbeat(work_item_id='item-1', worker_id='worker-1', lease_duration=30.0))
+        self.assertFalse(q2.heartbeat(work_item_id='item-1', worker_id='worker-2', lease_duration=30.0))
+        self.assertTrue(q2.complete(work_item_id='item-1', worker_id='worker-1', result={'Value': 10}))
+        self.assertTrue(q2.fail(work_item_id='item-2', worker_id='worker-2', error='it failed'))
+        self.assertEqual(q1.get_outcome(work_item_id='item-1'), {'Status': 'Completed', 'Result': {'Value': 10}, 'Error': None, 'WorkerId': 'worker-1'})
+        self.assertEqual(q1.get_outcome(work_item_id='item-2')['Status'], 'Failed')
+        self.assertEqual(q1.get_outcome(work_item_id='item-2')['Error'], 'it failed')
+        q1.remove(work_item_id='item-1')
+        self.assertIsNone(q1.get_outcome(work_item_id='item-1'))
+        q1.close()
+        q2.close()
+
+    def test_expired_lease_requeued_01(self):
+        q = SqliteWorkQueue(configuration={'path': self.path, 'max_attempts': 2})
+        q.publish(work_item_id='item-1', payload={'Value': 1})
+        self.assertEqual(q.lease(worker_id='worker-1', lease_duration=-1.0)['Attempts'], 1)
+        self.assertEqual(q.requeue_expired_leases(), 1)
+
+        # The outcome of a worker that lost its lease is discarded
+        self.assertFalse(q.complete(work_item_id='item-1', worker_id='worker-1', result={'Value': 10}))
+        self.assertIsNone(q.get_outcome(work_item_id='item-1'))
+
+        # After max_attempts, an expired lease fails the work item
+        self.assertEqual(q.lease(worker_id='worker-2', lease_duration=-1.0)['Attempts'], 2)
+        self.assertIsNone(q.lease(worker_id='worker-3', lease_duration=30.0))
+        outcome = q.get_outcome(work_item_id='item-1')
+        self.assertEqual(outcome['Status'], 'Failed')
+        self.assertEqual(outcome['WorkerId'], 'worker-2')
+        self.assertTrue('expired' in outcome['Error'])
+        q.close()
+
+    def test_invalid_configuration_01(self):
+        with self.assertRaises(Exception):
+            SqliteWorkQueue(configuration=dict())
+        with self.assertRaises(Exception):
+            SqliteWorkQueue(configuration={'path': self.path, 'table_name': 'work items; --'})
+
+
 class TestClassParameterValidation(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -1706,6 +2485,155 @@ class TestClassVariableStore(unittest.TestCase):    # pragma: no cover
             self.assertIsInstance(result, int)
             self.assertEqual(result, 100)
 
+    def test_copy_isolation_01(self):
+        v1 = VariableStore()
+        v1.add_variable(variable_name='a', value={'list': [1, 2]})
+        v1.add_variable(variable_name='b', value='text')
+        v2 = copy.deepcopy(v1)
+        self.assertIs(v1.variable_store.get_shared_value('a'), v2.variable_store.get_shared_value('a'))
+
+        v2.variable_store['a']['list'].append(3)
+        v2.variable_store['c'] = 1
+        v1.variable_store.pop('b')
+
+        self.assertEqual(v1.variable_store['a'], {'list': [1, 2]})
+        self.assertEqual(v2.variable_store['a'], {'list': [1, 2, 3]})
+        self.assertFalse('c' in v1.variable_store)
+        self.assertEqual(v2.variable_store['b'], 'text')
+        self.assertEqual(sorted(list(v2.variable_store.keys())), ['a', 'b', 'c'])
+
+    def test_copy_isolation_with_held_reference_01(self):
+        v1 = VariableStore()
+        v1.add_variable(variable_name='a', value=[1,])
+        value = v1.variable_store['a']
+        v2 = copy.deepcopy(v1)
+        value.append(2)
+        # The copy detaches references handed out before it was made from both dicts
+        self.assertEqual(v1.variable_store['a'], [1,])
+        self.assertEqual(v2.variable_store['a'], [1,])
+        value = v1.variable_store['a']
+        value.append(3)
+        self.assertEqual(v1.variable_store['a'], [1, 3])
+        self.assertEqual(v2.variable_store['a'], [1,])
+
+        v2.variable_store['b'] = {'key': 'value'}
+        v3 = copy.deepcopy(v2)
+        v2.variable_store['b']['key'] = 'changed'
+        self.assertEqual(v3.variable_store['b'], {'key': 'value'})
+
+    def test_copy_isolation_when_converted_to_dict_01(self):
+        v1 = VariableStore()
+        v1.add_variable(variable_name='a', value=[1,])
+        for convert in (lambda data: dict(data), lambda data: {**data}, lambda data: data | dict(), lambda data: dict(data.items())):
+            v2 = copy.deepcopy(v1)
+            convert(v2.variable_store)['a'].append(2)
+            self.assertEqual(v1.get_variable(variable_name='a'), [1,])
+        v2 = copy.deepcopy(v1)
+        converted = dict(v2.variable_store)
+        converted['a'].append(2)
+        self.assertEqual(v2.variable_store['a'], [1, 2])
+        self.assertEqual(v1.get_variable(variable_name='a'), [1,])
+
+    def test_copy_cost_01(self):
+        deep_copy_qty = {'Qty': 0}
+
+        class CountedValue:
+            def __init__(self):
+                self.items = list()
+            def __deepcopy__(self, memo):
+                deep_copy_qty['Qty'] += 1
+                return CountedValue()
+
+        v1 = VariableStore()
+        for i in range(100):
+            v1.variable_store.set_owned_value('value-{}'.format(i), CountedValue())
+        v1.variable_store['value-0'].items.append(1)
+        v1.variable_store['value-1'] = CountedValue()
+        for i in range(10):
+            copy.deepcopy(v1)
+        # Only the two values handed out are copied, and only once
+        self.assertEqual(deep_copy_qty['Qty'], 2)
+
+        shared = [1,]
+        container = {'a': v1, 'b': v1, 'c': shared}
+        v1.variable_store['x'] = shared
+        container_copy = copy.deepcopy(container)
+        self.assertIs(container_copy['a'], container_copy['b'])
+        self.assertIs(container_copy['a'].variable_store.get_shared_value('x'), container_copy['c'])
+
+    def test_add_variable_without_copy_01(self):
+        value = {'list': [1, 2]}
+        v = VariableStore()
+        v.add_variable(variable_name='a', value=value, copy_value=False)
+        self.assertIs(v.variable_store.get_shared_value('a'), value)
+        v.variable_store['a']['list'].append(3)
+        self.assertEqual(value, {'list': [1, 2]})
+
+    def test_resolve_variable_precedence_01(self):
+        v = VariableStore()
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='create', context='c1'), '')
+        v.add_variable(variable_name='t1:K1', value='bare')
+        v.add_variable(variable_name='t1:K1:K2', value='other')
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='create', context='c1'), 'bare')
+        v.add_variable(variable_name='t1::c1:K1', value='context')
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='create', context='c1'), 'context')
+        v.add_variable(variable_name='t1:create::K1', value='command')
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='create', context='c1'), 'command')
+        v.add_variable(variable_name='t1:create:c1:K1', value='command_and_context')
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='create', context='c1'), 'command_and_context')
+        self.assertEqual(v.resolve_variable(task_id='t1', variable_name='K1', command='delete', context='c2'), 'bare')
+
+    def test_set_plain_dict_01(self):
+        v = VariableStore()
+        v.variable_store = {'a': 1}
+        self.assertIsInstance(v.variable_store, CopyOnWriteDict)
+        self.assertIsInstance(v.variable_store, dict)
+        self.assertEqual(v.get_variable(variable_name='a'), 1)
+        self.assertEqual(json.loads(json.dumps(copy.deepcopy(v).variable_store)), {'a': 1})
+
+
+class TestClassSpecTemplate(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def tearDown(self):
+        return super().tearDown()
+
+    def test_render_without_placeholders_01(self):
+        template = SpecTemplate(spec={'a': [1, 2], 'b': {'c': 'text'}})
+        self.assertEqual(template.placeholder_qty, 0)
+        rendered_spec = template.render(resolve_placeholder=lambda raw_key: 'x')
+        self.assertIs(rendered_spec, template.spec)
+        self.assertEqual(rendered_spec, {'a': [1, 2], 'b': {'c': 'text'}})
+
+    def test_render_shares_unchanged_data_01(self):
+        lookups = list()
+        def resolve_placeholder(raw_key: str)->str:
+            lookups.append(raw_key)
+            return 'value-{}'.format(len(lookups))
+        template = SpecTemplate(spec={
+            'unchanged': {'list': [1, 2]},
+            'changed': ('a ${VAR:t1:K1} b ${VAR:t1:K2} c ${VAR:t1:K1}', 'no placeholder',),
+        })
+        self.assertEqual(template.placeholder_qty, 3)
+        rendered_spec = template.render(resolve_placeholder=resolve_placeholder)
+        self.assertEqual(rendered_spec['changed'], ['a value-1 b value-2 c value-1', 'no placeholder'])
+        self.assertEqual(lookups, ['${VAR:t1:K1}', '${VAR:t1:K2}'])
+        self.assertIs(rendered_spec['unchanged'], template.spec['unchanged'])
+        self.assertEqual(template.spec['changed'][0], 'a ${VAR:t1:K1} b ${VAR:t1:K2} c ${VAR:t1:K1}')
+
+    def test_task_spec_template_cache_01(self):
+        task = Task(api_version='DummyTaskProcessor1/v1', kind='DummyTaskProcessor1', metadata={'name': 'test-task-01'}, spec={'a': '${VAR:t1:K1}'})
+        template = task.get_spec_template()
+        self.assertIs(task.get_spec_template(), template)
+        self.assertIs(copy.deepcopy(task).get_spec_template(), template)
+        task.spec = {'a': 'b'}
+        self.assertIsNot(task.get_spec_template(), template)
+        self.assertEqual(task.get_spec_template().placeholder_qty, 0)
+
 
 class TestClassTask(unittest.TestCase):    # pragma: no cover
 
@@ -1762,6 +2690,215 @@ class TestClassTask(unittest.TestCase):    # pragma: no cover
         self.assertEqual(len(t.spec), 0)
 
 
+class TestClassEventJournal(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def tearDown(self):
+        print_logger_lines(logger=logger)
+
+    def test_method_add_event_01(self):
+        journal = EventJournal()
+        journal.add_event(task_id='task-01', event_label='Label 1', event_description='Description 1')
+        journal.add_event(task_id='task-02', event_label='Label 2', event_description='Description 2')
+        journal.add_event(task_id='task-01', event_label='Label 3', event_description='Description 3')
+        self.assertEqual(len(journal), 3)
+        self.assertEqual(journal.next_event_sequence, 3)
+        self.assertEqual([event['EventLabel'] for event in journal.get_events(task_id='task-01')], ['Label 1', 'Label 3'])
+        self.assertEqual([event['EventLabel'] for event in journal.get_events(since_event_sequence=1)], ['Label 2', 'Label 3'])
+        self.assertEqual(len(journal.get_events(task_id='task-03')), 0)
+
+    def test_method_add_event_evicts_oldest_events_01(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        spill_path = '{}{}events.ndjson'.format(temp_dir.name, os.sep)
+        journal = EventJournal(max_events=2, spill_path=spill_path)
+        journal.add_event(task_id='task-01', event_label='Label 1', event_description='Description 1')
+        journal.add_event(task_id='task-02', event_label='Label 2', event_description='Description 2')
+        journal.add_event(task_id='task-02', event_label='Label 3', event_description='Description 3')
+        journal.add_event(task_id='task-02', event_label='Label 4', event_description='Description 4')
+        journal.close()
+        self.assertEqual(len(journal), 2)
+        self.assertEqual(len(journal.get_events(task_id='task-01')), 0)
+        self.assertEqual([event['EventLabel'] for event in journal.get_events(task_id='task-02')], ['Label 3', 'Label 4'])
+        with open(spill_path, 'r', encoding='utf-8') as f:
+            spilled_events = [json.loads(line) for line in f]
+        self.assertEqual([event['EventLabel'] for event in spilled_events], ['Label 1', 'Label 2'])
+        self.assertEqual(spilled_events[0]['TaskId'], 'task-01')
+        temp_dir.cleanup()
+
+    def test_method_init_invalid_max_events_01(self):
+        with self.assertRaises(Exception):
+            EventJournal(max_events=0)
+
+
+class TestClassTracer(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def tearDown(self):
+        print_logger_lines(logger=logger)
+
+    def test_method_span_01(self):
+        tracer = Tracer()
+        with tracer.span(name='outer', category='Workflow'):
+            with tracer.span(name='inner', category='Task', task_id='task-01'):
+                pass
+        with self.assertRaises(Exception):
+            with tracer.span(name='failing', category='Hook', task_id='task-01'):
+                raise Exception('Hook failed')
+        self.assertEqual(len(tracer), 3)
+        spans = tracer.get_spans()
+        self.assertEqual([span['Name'] for span in spans], ['inner', 'outer', 'failing'])
+        self.assertTrue(spans[1]['StartTime'] <= spans[0]['StartTime'])
+        self.assertTrue(spans[1]['Duration'] >= spans[0]['Duration'])
+        self.assertEqual(spans[0]['TaskId'], 'task-01')
+        self.assertFalse(spans[0]['Failed'])
+        self.assertTrue(spans[2]['Failed'])
+        self.assertEqual([span['Name'] for span in tracer.get_spans(category='Hook')], ['failing'])
+
+    def test_method_add_span_drops_oldest_spans_01(self):
+        tracer = Tracer(max_spans=2)
+        for span_number in range(3):
+            tracer.add_span(name='span-{}'.format(span_number), category='Task', start_ns=0, duration_ns=1000, thread_id=1)
+        self.assertEqual([span['Name'] for span in tracer.get_spans()], ['span-1', 'span-2'])
+        self.assertEqual(tracer.dropped_spans_qty, 1)
+        tracer.clear()
+        self.assertEqual(len(tracer), 0)
+
+    def test_method_write_chrome_trace_01(self):
+        tracer = Tracer()
+        with tracer.span(name='task-01', category='Task', task_id='task-01'):
+            pass
+        output = io.StringIO()
+        self.assertEqual(tracer.write_chrome_trace(output=output), 1)
+        chrome_trace = json.loads(output.getvalue())
+        self.assertEqual(len(chrome_trace['traceEvents']), 1)
+        trace_event = chrome_trace['traceEvents'][0]
+        self.assertEqual(trace_event['ph'], 'X')
+        self.assertEqual(trace_event['name'], 'task-01')
+        self.assertEqual(trace_event['cat'], 'Task')
+        self.assertEqual(trace_event['pid'], os.getpid())
+        self.assertEqual(trace_event['args']['TaskId'], 'task-01')
+
+    def test_method_produce_summary_01(self):
+        tracer = Tracer()
+        tracer.add_span(name='task-01', category='Task', start_ns=0, duration_ns=2000000, thread_id=1)
+        tracer.add_span(name='task-02', category='Task', start_ns=0, duration_ns=5000000, thread_id=1)
+        tracer.add_span(name='TaskProcessingHook', category='Hook', start_ns=0, duration_ns=1000000, thread_id=1)
+        tracer.add_span(name='TaskProcessingHook', category='Hook', start_ns=0, duration_ns=3000000, thread_id=1)
+        tracer.add_span(name='ResolveTaskSpecVariablesHook', category='Hook', start_ns=0, duration_ns=500000, thread_id=1)
+        summary = tracer.produce_summary(top_n=1)
+        print(summary)
+        lines = summary.split('\n')
+        self.assertEqual(lines[0], 'Slowest Tasks')
+        self.assertEqual(lines[4].split(), ['task-02', '5.000'])
+        self.assertFalse('task-01' in summary)
+        self.assertEqual(lines[-1].split(), ['Hook', 'TaskProcessingHook', '2', '4.000', '2.000', '3.000'])
+        self.assertFalse('ResolveTaskSpecVariablesHook' in summary)
+
+    def test_method_init_invalid_max_spans_01(self):
+        with self.assertRaises(Exception):
+            Tracer(max_spans=0)
+
+
+class TestClassMetricsRegistry(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def tearDown(self):
+        print_logger_lines(logger=logger)
+
+    def test_method_counter_and_gauge_01(self):
+        metrics_registry = MetricsRegistry()
+        counter = metrics_registry.counter(name='test_items_total', documentation='Test items', label_names=('kind',))
+        counter.increment(labels={'kind': 'a'})
+        counter.increment(amount=2, labels={'kind': 'a'})
+        self.assertEqual(counter.get_value(labels={'kind': 'a'}), 3)
+        self.assertIsNone(counter.get_value(labels={'kind': 'b'}))
+        with self.assertRaises(Exception):
+            counter.increment(amount=-1, labels={'kind': 'a'})
+        with self.assertRaises(Exception):
+            counter.increment(labels={'other': 'a'})
+        gauge = metrics_registry.gauge(name='test_level', documentation='Test level')
+        gauge.set(value=5)
+        gauge.increment(amount=-2)
+        self.assertEqual(gauge.get_value(), 3)
+        self.assertIs(metrics_registry.counter(name='test_items_total', documentation='Test items', label_names=('kind',)), counter)
+        self.assertIs(metrics_registry.get_metric(name='test_level'), gauge)
+        with self.assertRaises(Exception):
+            metrics_registry.gauge(name='test_items_total', documentation='Test items', label_names=('kind',))
+        self.assertIs(copy.deepcopy(metrics_registry), metrics_registry)
+
+    def test_method_histogram_01(self):
+        histogram = Histogram(name='test_duration_seconds', documentation='Test durations', buckets=(0.1, 1.0,))
+        for value in (0.05, 0.1, 0.5, 2.0,):
+            histogram.observe(value=value)
+        value = histogram.get_value()
+        self.assertEqual(value['Buckets'], {0.1: 2, 1.0: 3, float('inf'): 4})
+        self.assertEqual(value['Count'], 4)
+        self.assertAlmostEqual(value['Sum'], 2.65)
+        with self.assertRaises(Exception):
+            Histogram(name='test_duration_seconds', documentation='Test durations', buckets=(1.0, 0.1,))
+        with self.assertRaises(Exception):
+            Histogram(name='test_duration_seconds', documentation='Test durations', label_names=('le',))
+
+    def test_method_produce_prometheus_text_01(self):
+        metrics_registry = MetricsRegistry()
+        metrics_registry.counter(name='test_items_total', documentation='Test items', label_names=('kind',)).increment(labels={'kind': 'say "hi"\n'})
+        metrics_registry.histogram(name='test_duration_seconds', documentation='Test durations', buckets=(0.5,)).observe(value=0.25)
+        text = metrics_registry.produce_prometheus_text()
+        print(text)
+        lines = text.split('\n')
+        self.assertTrue('# TYPE magnum_opus_tasks_processed_total counter' in lines)
+        self.assertTrue('# HELP test_items_total Test items' in lines)
+        self.assertTrue('test_items_total{kind="say \\"hi\\"\\n"} 1' in lines)
+        self.assertTrue('# TYPE test_duration_seconds histogram' in lines)
+        self.assertTrue('test_duration_seconds_bucket{le="0.5"} 1' in lines)
+        self.assertTrue('test_duration_seconds_bucket{le="+Inf"} 1' in lines)
+        self.assertTrue('test_duration_seconds_sum 0.25' in lines)
+        self.assertTrue('test_duration_seconds_count 1' in lines)
+
+    def test_method_file_metrics_exporter_01(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = '{}{}metrics.prom'.format(temp_dir, os.sep)
+            metrics_registry = MetricsRegistry()
+            metrics_registry.add_exporter(exporter=FileMetricsExporter(configuration={'path': path}))
+            metrics_registry.gauge(name='test_level', documentation='Test level').set(value=7)
+            metrics_registry.export()
+            with open(path, 'r') as f:
+                self.assertTrue('test_level 7\n' in f.read())
+            self.assertEqual(os.listdir(temp_dir), ['metrics.prom',])
+        with self.assertRaises(Exception):
+            FileMetricsExporter(configuration=dict())
+
+    def test_method_http_metrics_exporter_01(self):
+        metrics_registry = MetricsRegistry()
+        exporter = HttpMetricsExporter(configuration={'port': 0})
+        with self.assertRaises(Exception):
+            exporter.start()
+        metrics_registry.add_exporter(exporter=exporter)
+        metrics_registry.gauge(name='test_level', documentation='Test level').set(value=7)
+        exporter.start()
+        try:
+            with urllib.request.urlopen('http://127.0.0.1:{}/metrics'.format(exporter.port), timeout=10) as response:
+                self.assertEqual(response.status, 200)
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+                self.assertTrue('test_level 7\n' in response.read().decode('utf-8'))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen('http://127.0.0.1:{}/other'.format(exporter.port), timeout=10)
+        finally:
+            exporter.close()
+
+
 class TestClassTaskProcessor(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -1815,6 +2952,29 @@ class TestClassTaskProcessor(unittest.TestCase):    # pragma: no cover
 
         print_logger_lines(logger=logger)
 
+    def test_method_process_task_and_process_task_async_failure_01(self):
+        vs = VariableStore()
+        tp = DummyTaskProcessor1()
+        vs.add_variable(variable_name=tp.create_identifier(task=self.task, variable_name='UNITTEST_TROW_EXCEPTION'), value=True)
+        expected_message = 'Action "CreateAction" failed with exception - please see logs for details. Auto Rollback action was attempted.'
+        with self.assertRaises(Exception) as context_manager:
+            tp.process_task(task=self.task, action='CreateAction', variable_store=copy.deepcopy(vs), task_resolved_spec={'testField': 'testValue'})
+        self.assertEqual(str(context_manager.exception), expected_message)
+        with self.assertRaises(Exception) as context_manager:
+            asyncio.run(tp.process_task_async(task=self.task, action='CreateAction', variable_store=copy.deepcopy(vs), task_resolved_spec={'testField': 'testValue'}))
+        self.assertEqual(str(context_manager.exception), expected_message)
+
+        print_logger_lines(logger=logger)
+
+    def test_method_process_task_async_default_persistence_01(self):
+        tp = DummyTaskProcessor1()
+        variable_store = asyncio.run(tp.process_task_async(task=self.task, action='CreateAction', task_resolved_spec={'testField': 'testValue'}))
+        self.assertIsInstance(variable_store, VariableStore)
+        variable_store = asyncio.run(tp.create_action_async(task=self.task, task_resolved_spec={'testField': 'testValue'}))
+        self.assertIsInstance(variable_store, VariableStore)
+
+        print_logger_lines(logger=logger)
+
     def test_basic_update_task_01(self):
         tp = DummyTaskProcessor1()
         variable_store = tp.process_task(
@@ -1943,6 +3103,121 @@ class UnitTestExceptionThrowingHook1(Hook):
         raise Exception('I really did quit!')
     
 
+class CountingResourceFactory:
+
+    def __init__(self):
+        self.created = list()
+        self.closed = list()
+
+    def create(self)->dict:
+        resource = {'ResourceNumber': len(self.created), 'Healthy': True}
+        self.created.append(resource)
+        return resource
+
+    def close(self, resource: dict):
+        self.closed.append(resource)
+
+
+class TestClassResourcePool(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def test_method_acquire_reuses_released_resource_01(self):
+        factory = CountingResourceFactory()
+        pool = ResourcePool(create_resource=factory.create, close_resource=factory.close, max_size=2)
+        r1 = pool.acquire()
+        pool.release(resource=r1)
+        r2 = pool.acquire()
+        self.assertIs(r1, r2)
+        self.assertEqual(len(factory.created), 1)
+        self.assertEqual(pool.leased_qty, 1)
+        pool.release(resource=r2)
+        pool.close()
+        self.assertEqual(factory.closed, [r1,])
+
+    def test_method_acquire_bounded_01(self):
+        factory = CountingResourceFactory()
+        pool = ResourcePool(create_resource=factory.create, max_size=2, acquire_timeout=0.05)
+        pool.acquire()
+        pool.acquire()
+        with self.assertRaises(Exception):
+            pool.acquire()
+        self.assertEqual(len(factory.created), 2)
+
+    def test_method_acquire_replaces_unhealthy_resource_01(self):
+        factory = CountingResourceFactory()
+        pool = ResourcePool(create_resource=factory.create, close_resource=factory.close, health_check=lambda resource: resource['Healthy'], max_size=1)
+        r1 = pool.acquire()
+        r1['Healthy'] = False
+        pool.release(resource=r1)
+        r2 = pool.acquire()
+        self.assertIsNot(r1, r2)
+        self.assertEqual(factory.closed, [r1,])
+
+    def test_method_evict_idle_resources_01(self):
+        factory = CountingResourceFactory()
+        pool = ResourcePool(create_resource=factory.create, close_resource=factory.close, idle_timeout=0.0)
+        pool.release(resource=pool.acquire())
+        self.assertEqual(pool.idle_qty, 1)
+        self.assertEqual(pool.evict_idle_resources(), 1)
+        self.assertEqual(pool.idle_qty, 0)
+        self.assertEqual(len(factory.closed), 1)
+
+
+class SessionTaskProcessor(PooledTaskProcessor):
+
+    def __init__(self):
+        super().__init__(api_version='SessionTaskProcessor/v1', max_pool_size=2)
+        self.created_sessions = list()
+        self.leased_sessions = list()
+
+    def create_resource(self)->dict:
+        session = {'SessionNumber': len(self.created_sessions)}
+        self.created_sessions.append(session)
+        return session
+
+    def create_action(self, task: Task, persistence: StatePersistence=StatePersistence(), variable_store: VariableStore=VariableStore(), task_resolved_spec: dict=dict())->VariableStore:
+        self.leased_sessions.append(self.get_leased_resource())
+        return variable_store
+
+
+class TestClassPooledTaskProcessor(unittest.TestCase):    # pragma: no cover
+
+    def setUp(self):
+        print()
+        print('-'*80)
+        logger.reset()
+
+    def test_method_process_task_leases_resource_01(self):
+        task_processor = SessionTaskProcessor()
+        for i in range(3):
+            task = Task(api_version='SessionTaskProcessor/v1', kind='Session', metadata={'name': 'task-{}'.format(i)}, spec=dict())
+            task_processor.process_task(task=task, persistence=StatePersistence(), variable_store=VariableStore())
+        self.assertEqual(len(task_processor.created_sessions), 1)
+        self.assertEqual(len(task_processor.leased_sessions), 3)
+        self.assertEqual(task_processor.resource_pool.idle_qty, 1)
+        with self.assertRaises(Exception):
+            task_processor.get_leased_resource()
+        task_processor.shut_down()
+        self.assertIsNone(task_processor.resource_pool)
+
+    def test_method_execute_workflow_thread_pool_01(self):
+        task_processor = SessionTaskProcessor()
+        task_process_store = TaskProcessStore()
+        task_process_store.register_task_processor(task_processor=task_processor, lifecycle='Singleton')
+        we = WorkflowExecutor(task_process_store=task_process_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='ThreadPool', max_workers=4)
+        for i in range(8):
+            we.add_task(task=Task(api_version='SessionTaskProcessor/v1', kind='Session', metadata={'name': 'task-{}'.format(i)}, spec=dict()))
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.execute_workflow(command='create', context='con1')
+        self.assertEqual(len(task_processor.leased_sessions), 8)
+        self.assertTrue(len(task_processor.created_sessions) <= 2)
+        task_process_store.shut_down()
+
+
 class TestClassUnitTestExceptionThrowingHook1(unittest.TestCase):    # pragma: no cover
 
     def setUp(self):
@@ -2998,6 +4273,558 @@ class TestClassWorkflowExecutor(unittest.TestCase):    # pragma: no cover
         print_logger_lines(logger=logger)
 
 
+    def test_class_workflow_executor_init_invalid_execution_mode_01(self):
+        with self.assertRaises(Exception):
+            WorkflowExecutor(task_process_store=self.task_processor_store, execution_mode='NoSuchMode')
+        with self.assertRaises(Exception):
+            WorkflowExecutor(task_process_store=self.task_processor_store, execution_mode='ThreadPool', max_workers=0)
+
+    def test_method_execute_workflow_thread_pool_01(self):
+        results = dict()
+        for execution_mode in ('Sequential', 'ThreadPool',):
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), execution_mode=execution_mode, max_workers=3)
+            we.add_task(task=self.task_01)
+            we.add_task(task=self.task_02)
+            we.add_task(task=self.task_03)
+            we.add_task(task=self.task_04)
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+            results[execution_mode] = we.execute_workflow(command='create', context='con1')
+
+        print_logger_lines(logger=logger)
+
+        self.assertEqual(
+            sorted(list(results['Sequential'].variable_store.keys())),
+            sorted(list(results['ThreadPool'].variable_store.keys()))
+        )
+        for task_name in ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',):
+            self.assertTrue('{}:TASK_RESOLVED_SPEC_CHECKSUM'.format(task_name) in results['ThreadPool'].variable_store)
+
+    def test_method_execute_workflow_with_tracer_01(self):
+        task_names = ['test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',]
+        for execution_mode in ('Sequential', 'ThreadPool',):
+            tracer = Tracer()
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), execution_mode=execution_mode, tracer=tracer)
+            we.add_task(task=self.task_01)
+            we.add_task(task=self.task_02)
+            we.add_task(task=self.task_03)
+            we.add_task(task=self.task_04)
+            we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            we.execute_workflow(command='create', context='con1')
+
+            workflow_spans = tracer.get_spans(category='Workflow')
+            self.assertEqual([span['Name'] for span in workflow_spans], ['create:con1',])
+            self.assertEqual(len(tracer.get_spans(category='Ordering')), 1)
+            self.assertEqual(sorted([span['Name'] for span in tracer.get_spans(category='Task')]), task_names)
+            self.assertEqual(len(tracer.get_spans(category='Hook')), 8)
+            self.assertEqual(sorted([span['TaskId'] for span in tracer.get_spans(category='Action')]), task_names)
+            self.assertEqual(set([span['Name'] for span in tracer.get_spans(category='Action')]), {'CreateAction',})
+            self.assertTrue(len(tracer.get_spans(category='Copy')) >= 8)
+            for span in tracer.get_spans():
+                self.assertTrue(span['StartTime'] >= workflow_spans[0]['StartTime'])
+                self.assertFalse(span['Failed'])
+            print(tracer.produce_summary())
+
+        # Without a tracer, nothing is recorded by the tracer of another executor
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore())
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        spans_qty = len(tracer)
+        we.execute_workflow(command='create', context='con1')
+        self.assertEqual(len(tracer), spans_qty)
+
+    def test_method_execute_workflow_with_metrics_registry_01(self):
+        for execution_mode in ('Sequential', 'ThreadPool',):
+            metrics_registry = MetricsRegistry()
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), execution_mode=execution_mode, metrics_registry=metrics_registry)
+            we.add_task(task=self.task_01)
+            we.add_task(task=self.task_02)
+            we.add_task(task=self.task_03)
+            we.add_task(task=self.task_04)
+            we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            variable_store = we.execute_workflow(command='create', context='con1')
+
+            engine_metrics = metrics_registry.engine_metrics
+            self.assertEqual(engine_metrics['TasksProcessed'].get_value(labels={'action': 'CreateAction', 'outcome': 'Succeeded'}), 4)
+            self.assertEqual(engine_metrics['ActionDuration'].get_value(labels={'action': 'CreateAction', 'api_version': 'DummyTaskProcessor1/v1'})['Count'], 4)
+            self.assertEqual(engine_metrics['HookDuration'].get_value(labels={'hook': 'TaskProcessingHook'})['Count'], 4)
+            self.assertEqual(engine_metrics['StateCommitDuration'].get_value(labels={'operation': 'flush'})['Count'], 1)
+            self.assertEqual(engine_metrics['WorkflowDuration'].get_value(labels={'command': 'create', 'outcome': 'Succeeded'})['Count'], 1)
+            self.assertEqual(engine_metrics['VariableStoreSize'].get_value(), len(variable_store.variable_store))
+            self.assertEqual(engine_metrics['TasksInFlight'].get_value(), 0)
+            self.assertEqual(engine_metrics['QueuedTasks'].get_value(), 0)
+            print(metrics_registry.produce_prometheus_text())
+
+        variable_store = VariableStore()
+        variable_store.add_variable(variable_name='{}:UNITTEST_TROW_EXCEPTION'.format(self.task_03.task_id), value=True)
+        metrics_registry = MetricsRegistry()
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=variable_store, metrics_registry=metrics_registry)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        with self.assertRaises(Exception):
+            we.execute_workflow(command='create', context='con1')
+        self.assertEqual(metrics_registry.engine_metrics['TasksProcessed'].get_value(labels={'action': 'CreateAction', 'outcome': 'Failed'}), 1)
+        self.assertEqual(metrics_registry.engine_metrics['WorkflowDuration'].get_value(labels={'command': 'create', 'outcome': 'Failed'})['Count'], 1)
+
+    def test_method_execute_workflow_thread_pool_processes_independent_tasks_concurrently_01(self):
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=ConcurrencyCheckTaskProcessor())
+        we = WorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), execution_mode='ThreadPool', max_workers=3)
+        for i in range(3):
+            we.add_task(
+                task=Task(
+                    api_version='ConcurrencyCheckTaskProcessor/v1',
+                    kind='ConcurrencyCheckTaskProcessor',
+                    metadata={'name': 'concurrent-task-{}'.format(i)},
+                    spec={'testField': 'testValue'}
+                )
+            )
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        variable_store = we.execute_workflow(command='create', context='con1')
+        for i in range(3):
+            self.assertTrue('concurrent-task-{}:TASK_STATE_UPDATES'.format(i) in variable_store.variable_store)
+
+    def test_method_execute_workflow_thread_pool_task_exception_01(self):
+        variable_store = VariableStore()
+        variable_store.add_variable(
+            variable_name='{}:UNITTEST_TROW_EXCEPTION'.format(self.task_03.task_id),
+            value=True
+        )
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=variable_store, persistence=StatePersistence(), execution_mode='ThreadPool')
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        with self.assertRaises(Exception) as context_manager:
+            we.execute_workflow(command='create', context='con1')
+
+        print_logger_lines(logger=logger)
+
+        self.assertTrue('TaskProcessingHook' in str(context_manager.exception))
+        self.assertFalse('test-task-04:TASK_STATE' in we.persistence.state_cache)
+
+
+    def test_class_async_workflow_executor_init_invalid_max_concurrent_tasks_01(self):
+        with self.assertRaises(Exception) as context_manager:
+            AsyncWorkflowExecutor(max_concurrent_tasks=0)
+        self.assertTrue('max_concurrent_tasks' in str(context_manager.exception))
+
+    def test_method_async_execute_workflow_01(self):
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence())
+        async_we = AsyncWorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence())
+        for executor in (we, async_we,):
+            executor.add_task(task=self.task_01)
+            executor.add_task(task=self.task_02)
+            executor.add_task(task=self.task_03)
+            executor.add_task(task=self.task_04)
+            executor.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            executor.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        sequential_variable_store = we.execute_workflow(command='create', context='con1')
+        async_variable_store = asyncio.run(async_we.execute_workflow(command='create', context='con1'))
+
+        print_logger_lines(logger=logger)
+
+        self.assertIsInstance(async_variable_store, VariableStore)
+        self.assertEqual(
+            sorted(list(sequential_variable_store.variable_store.keys())),
+            sorted(list(async_variable_store.variable_store.keys()))
+        )
+        for task_name in ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',):
+            self.assertTrue('{}:TASK_STATE'.format(task_name) in async_we.persistence.state_cache)
+
+    def test_method_async_execute_workflow_limits_concurrent_tasks_01(self):
+        AsyncConcurrencyCheckTaskProcessor.tasks_in_flight_qty = 0
+        AsyncConcurrencyCheckTaskProcessor.max_tasks_in_flight_qty = 0
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=AsyncConcurrencyCheckTaskProcessor())
+        we = AsyncWorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), max_concurrent_tasks=3)
+        for i in range(10):
+            we.add_task(
+                task=Task(
+                    api_version='AsyncConcurrencyCheckTaskProcessor/v1',
+                    kind='AsyncConcurrencyCheckTaskProcessor',
+                    metadata={'name': 'concurrent-task-{}'.format(i)},
+                    spec={'testField': 'testValue'}
+                )
+            )
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        variable_store = asyncio.run(we.execute_workflow(command='create', context='con1'))
+        for i in range(10):
+            self.assertTrue('concurrent-task-{}:TASK_STATE_UPDATES'.format(i) in variable_store.variable_store)
+        self.assertEqual(AsyncConcurrencyCheckTaskProcessor.max_tasks_in_flight_qty, 3)
+
+    def test_method_async_execute_workflow_task_exception_01(self):
+        variable_store = VariableStore()
+        variable_store.add_variable(
+            variable_name='{}:UNITTEST_TROW_EXCEPTION'.format(self.task_03.task_id),
+            value=True
+        )
+        we = AsyncWorkflowExecutor(task_process_store=self.task_processor_store, variable_store=variable_store, persistence=StatePersistence())
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        with self.assertRaises(Exception) as context_manager:
+            asyncio.run(we.execute_workflow(command='create', context='con1'))
+
+        print_logger_lines(logger=logger)
+
+        self.assertTrue('TaskProcessingHook' in str(context_manager.exception))
+        self.assertFalse('test-task-04:TASK_STATE' in we.persistence.state_cache)
+
+    def test_method_async_execute_workflow_task_exception_runs_error_hook_async_01(self):
+        class RecordingErrorHook(GeneralErrorHook):
+
+            def run(self, **kwargs)->VariableStore:
+                raise Exception('The synchronous error hook must not run on the event loop')
+
+            async def run_async(self, task: Task=None, parameters: dict=dict(), **kwargs)->VariableStore:
+                self.failed_task_names.append(task.task_id)
+                return VariableStore()
+
+        variable_store = VariableStore()
+        variable_store.add_variable(variable_name='{}:UNITTEST_TROW_EXCEPTION'.format(self.task_03.task_id), value=True)
+        we = AsyncWorkflowExecutor(task_process_store=self.task_processor_store, variable_store=variable_store, persistence=StatePersistence())
+        we.ordered_workflow_steps.general_error_hook = RecordingErrorHook()
+        we.ordered_workflow_steps.general_error_hook.failed_task_names = list()
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        with self.assertRaises(Exception) as context_manager:
+            asyncio.run(we.execute_workflow(command='create', context='con1'))
+        self.assertTrue('TaskProcessingHook' in str(context_manager.exception))
+        self.assertEqual(we.ordered_workflow_steps.general_error_hook.failed_task_names, ['test-task-03',])
+
+    def test_method_execute_workflow_per_workflow_task_processor_01(self):
+        LifecycleTrackingTaskProcessor.lifecycle_events = list()
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=LifecycleTrackingTaskProcessor(), lifecycle='PerWorkflow')
+        we = WorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='ThreadPool')
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        we.execute_workflow(command='create', context='con1')
+
+        # All tasks were processed by a single instance, which was shut down at the end of the workflow
+        self.assertEqual([event[0] for event in LifecycleTrackingTaskProcessor.lifecycle_events], ['WarmUp', 'ShutDown',])
+        self.assertEqual(len(task_processor_store._workflow_task_processors), 0)
+
+    def test_method_execute_workflow_process_pool_01(self):
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=ProcessIdTaskProcessor())
+        we = WorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='ProcessPool', max_workers=2)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        variable_store = we.execute_workflow(command='create', context='con1')
+
+        print_logger_lines(logger=logger)
+
+        for task_name in ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',):
+            self.assertNotEqual(variable_store.get_variable(variable_name='{}:PROCESS_ID'.format(task_name)), os.getpid())
+            self.assertTrue('{}:TASK_RESOLVED_SPEC_CHECKSUM'.format(task_name) in variable_store.variable_store)
+            self.assertTrue(we.persistence.get(object_identifier='{}:TASK_STATE'.format(task_name))['IsCreated'])
+            self.assertTrue(len(we.event_journal.get_events(task_id=task_name)) > 0)
+
+    def _start_work_queue_workers(self, path: str, task_processor: TaskProcessor, stop_event: threading.Event, workers_qty: int=2)->list:
+        workers = list()
+        for worker_number in range(workers_qty):
+            task_processor_store = TaskProcessStore()
+            task_processor_store.register_task_processor(task_processor=task_processor, lifecycle='PerWorkflow')
+            worker = WorkQueueWorker(
+                work_queue=SqliteWorkQueue(configuration={'path': path, 'poll_interval': 0.01}),
+                task_process_store=task_processor_store,
+                worker_id='worker-{}'.format(worker_number)
+            )
+            worker_thread = threading.Thread(target=worker.run, kwargs={'stop_event': stop_event})
+            worker_thread.start()
+            workers.append(worker_thread)
+        return workers
+
+    def test_method_execute_workflow_work_queue_01(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        path = '{}{}work-queue.db'.format(temp_dir.name, os.sep)
+        work_queue = SqliteWorkQueue(configuration={'path': path, 'poll_interval': 0.01})
+        stop_event = threading.Event()
+        workers = self._start_work_queue_workers(path=path, task_processor=DummyTaskProcessor1(), stop_event=stop_event)
+        try:
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='WorkQueue', work_queue=work_queue)
+            we.add_task(task=self.task_01)
+            we.add_task(task=self.task_02)
+            we.add_task(task=self.task_03)
+            we.add_task(task=self.task_04)
+            we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+            variable_store = we.execute_workflow(command='create', context='con1')
+        finally:
+            stop_event.set()
+            for worker_thread in workers:
+                worker_thread.join()
+            work_queue.close()
+            temp_dir.cleanup()
+
+        print_logger_lines(logger=logger)
+
+        for task_name in ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',):
+            self.assertTrue('{}:TASK_RESOLVED_SPEC_CHECKSUM'.format(task_name) in variable_store.variable_store)
+            self.assertTrue(we.persistence.get(object_identifier='{}:TASK_STATE'.format(task_name))['IsCreated'])
+            self.assertTrue(len(we.event_journal.get_events(task_id=task_name)) > 0)
+
+    def test_method_execute_workflow_work_queue_failure_01(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        path = '{}{}work-queue.db'.format(temp_dir.name, os.sep)
+        work_queue = SqliteWorkQueue(configuration={'path': path, 'poll_interval': 0.01})
+        stop_event = threading.Event()
+        workers = self._start_work_queue_workers(path=path, task_processor=FailingTaskProcessor(), stop_event=stop_event, workers_qty=1)
+        try:
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='WorkQueue', work_queue=work_queue)
+            we.add_task(task=self.task_01)
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            with self.assertRaises(Exception):
+                we.execute_workflow(command='create', context='con1')
+        finally:
+            stop_event.set()
+            for worker_thread in workers:
+                worker_thread.join()
+            work_queue.close()
+            temp_dir.cleanup()
+
+    def test_method_execute_workflow_work_queue_without_workers_times_out_01(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        path = '{}{}work-queue.db'.format(temp_dir.name, os.sep)
+        work_queue = SqliteWorkQueue(configuration={'path': path, 'poll_interval': 0.01, 'outcome_timeout': 0.2})
+        try:
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode='WorkQueue', work_queue=work_queue)
+            we.add_task(task=self.task_01)
+            we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+            with self.assertRaises(Exception):
+                we.execute_workflow(command='create', context='con1')
+            self.assertIsNone(work_queue.lease(worker_id='late-worker', lease_duration=1.0))
+        finally:
+            work_queue.close()
+            temp_dir.cleanup()
+
+    def test_init_work_queue_required_01(self):
+        with self.assertRaises(Exception):
+            WorkflowExecutor(execution_mode='WorkQueue')
+
+    def test_method_execute_workflow_incremental_01(self):
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), incremental=True)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        task_names = ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',)
+
+        first_run_variable_store = we.execute_workflow(command='create', context='con1')
+        for task_name in task_names:
+            self.assertTrue(len(we.event_journal.get_events(task_id=task_name)) > 0)
+            self.assertTrue('{}:TASK_INCREMENTAL_STATE'.format(task_name) in we.persistence.state_cache)
+
+        # Nothing changed - all tasks are skipped, but their output variables are restored
+        event_sequence = we.event_journal.next_event_sequence
+        second_run_variable_store = we.execute_workflow(command='create', context='con1')
+        for task_name in task_names:
+            self.assertEqual(len(we.event_journal.get_events(task_id=task_name, since_event_sequence=event_sequence)), 0)
+            self.assertEqual(
+                first_run_variable_store.get_variable(variable_name='{}:TASK_RESOLVED_SPEC_CHECKSUM'.format(task_name)),
+                second_run_variable_store.get_variable(variable_name='{}:TASK_RESOLVED_SPEC_CHECKSUM'.format(task_name))
+            )
+
+        # A changed spec causes the task to be processed again, as well as test-task-01 which depends on the changed
+        # outputs of test-task-04. The outputs of test-task-01 remain the same, so test-task-02 is still skipped
+        task_04 = copy.deepcopy(self.task_04)
+        task_04.spec = {'testField': 'changedValue'}
+        we.add_task(task=task_04)
+        event_sequence = we.event_journal.next_event_sequence
+        we.execute_workflow(command='create', context='con1')
+
+        print_logger_lines(logger=logger)
+
+        for task_name in ('test-task-02', 'test-task-03',):
+            self.assertEqual(len(we.event_journal.get_events(task_id=task_name, since_event_sequence=event_sequence)), 0)
+        for task_name in ('test-task-01', 'test-task-04',):
+            self.assertTrue(len(we.event_journal.get_events(task_id=task_name, since_event_sequence=event_sequence)) > 0)
+
+        # Other actions are never skipped
+        we.execute_workflow(command='delete', context='con1')
+        self.assertEqual(we.persistence.get(object_identifier='test-task-04:TASK_INCREMENTAL_STATE'), dict())
+
+    def test_method_execute_workflow_incremental_legacy_checksums_01(self):
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), incremental=True)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=ResolveTaskSpecVariablesHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        task_names = ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',)
+
+        # State persisted with the checksums calculated before the ChecksumEngine was introduced
+        override_checksum_engine(engine=ChecksumEngine(algorithm='sha256-json'))
+        try:
+            we.execute_workflow(command='create', context='con1')
+        finally:
+            override_checksum_engine(engine=ChecksumEngine())
+        legacy_states = dict()
+        for task_name in task_names:
+            legacy_states[task_name] = (
+                copy.deepcopy(we.persistence.get(object_identifier='{}:TASK_INCREMENTAL_STATE'.format(task_name))),
+                copy.deepcopy(we.persistence.get(object_identifier='{}:TASK_STATE'.format(task_name))),
+            )
+
+        # The legacy checksums are accepted, so all tasks are skipped and their state is rewritten in canonical form
+        for _ in range(2):
+            event_sequence = we.event_journal.next_event_sequence
+            we.execute_workflow(command='create', context='con1')
+            for task_name in task_names:
+                self.assertEqual(len(we.event_journal.get_events(task_id=task_name, since_event_sequence=event_sequence)), 0)
+
+        print_logger_lines(logger=logger)
+
+        for task_name in task_names:
+            legacy_incremental_state, legacy_task_state = legacy_states[task_name]
+            incremental_state = we.persistence.get(object_identifier='{}:TASK_INCREMENTAL_STATE'.format(task_name))
+            task_state = we.persistence.get(object_identifier='{}:TASK_STATE'.format(task_name))
+            self.assertNotEqual(incremental_state['InputsFingerprint'], legacy_incremental_state['InputsFingerprint'])
+            self.assertEqual(incremental_state['OutputFingerprint'], ChecksumEngine().hexdigest(data=incremental_state['OutputVariables']))
+            self.assertEqual(incremental_state['OutputVariables'], legacy_incremental_state['OutputVariables'])
+            self.assertNotEqual(task_state['AppliedSpecChecksum'], legacy_task_state['AppliedSpecChecksum'])
+            self.assertEqual(task_state['AppliedSpecChecksum'], ChecksumEngine().hexdigest(data={'spec': task_state['AppliedSpec'], 'metadata': dict()}))
+
+    def test_method_execute_workflow_incremental_state_not_persisted_01(self):
+        # Without incremental processing, no incremental state is read or written
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence())
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        we.execute_workflow(command='create', context='con1')
+        we.execute_workflow(command='delete', context='con1')
+        for object_identifier in we.persistence.state_cache:
+            self.assertFalse(object_identifier.endswith(':TASK_INCREMENTAL_STATE'))
+
+        # Outputs that can not be persisted as JSON are not restored, so the task is always processed
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=TupleOutputTaskProcessor())
+        we = WorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), incremental=True)
+        we.add_task(task=Task(api_version='TupleOutputTaskProcessor/v1', kind='TupleOutputTaskProcessor', metadata={'name': 'tuple-task'}, spec={'testField': 'testValue'}))
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        for _ in range(2):
+            event_sequence = we.event_journal.next_event_sequence
+            variable_store = we.execute_workflow(command='create', context='con1')
+            self.assertTrue(len(we.event_journal.get_events(task_id='tuple-task', since_event_sequence=event_sequence)) > 0)
+            self.assertEqual(variable_store.get_variable(variable_name='tuple-task:COORDINATES'), (1, 2,))
+        incremental_state = we.persistence.get(object_identifier='tuple-task:TASK_INCREMENTAL_STATE')
+        self.assertIsNone(incremental_state['InputsFingerprint'])
+        self.assertEqual(incremental_state['OutputVariables'], dict())
+
+    def test_method_execute_workflow_incremental_dependant_of_unpersisted_outputs_01(self):
+        # The outputs of tuple-task can not be persisted, so reader-task must be processed whenever tuple-task is
+        task_processor_store = TaskProcessStore()
+        task_processor_store.register_task_processor(task_processor=TupleOutputTaskProcessor())
+        task_processor_store.register_task_processor(task_processor=VariableReaderTaskProcessor())
+        we = WorkflowExecutor(task_process_store=task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), incremental=True)
+        we.add_task(task=Task(api_version='TupleOutputTaskProcessor/v1', kind='TupleOutputTaskProcessor', metadata={'name': 'tuple-task'}, spec={'testField': 'testValue'}))
+        we.add_task(task=Task(api_version='VariableReaderTaskProcessor/v1', kind='VariableReaderTaskProcessor', metadata={'name': 'reader-task', 'dependencies': [{'tasks': ['tuple-task']}]}, spec={'readVariable': 'tuple-task:COORDINATES'}))
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        try:
+            variable_store = we.execute_workflow(command='create', context='con1')
+            self.assertEqual(variable_store.get_variable(variable_name='reader-task:SEEN'), [1, 2])
+            TupleOutputTaskProcessor.coordinates = (1, 3,)
+            event_sequence = we.event_journal.next_event_sequence
+            variable_store = we.execute_workflow(command='create', context='con1')
+            self.assertTrue(len(we.event_journal.get_events(task_id='reader-task', since_event_sequence=event_sequence)) > 0)
+            self.assertEqual(variable_store.get_variable(variable_name='tuple-task:COORDINATES'), (1, 3,))
+            self.assertEqual(variable_store.get_variable(variable_name='reader-task:SEEN'), [1, 3])
+        finally:
+            TupleOutputTaskProcessor.coordinates = (1, 2,)
+
+    def test_method_execute_workflow_sqlite_state_persistence_01(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        persistence = SqliteStatePersistence(configuration={'path': '{}{}state.db'.format(temp_dir.name, os.sep)})
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=persistence)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_02)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.add_workflow_step_by_hook_instance(hook=TaskPostProcessingStateUpdateHook())
+        we.execute_workflow(command='create', context='con1')
+        persistence.close()
+
+        persistence = SqliteStatePersistence(configuration={'path': '{}{}state.db'.format(temp_dir.name, os.sep)})
+        for task_name in ('test-task-01', 'test-task-02', 'test-task-03', 'test-task-04',):
+            self.assertTrue(persistence.get(object_identifier='{}:TASK_STATE'.format(task_name))['IsCreated'])
+        persistence.close()
+
+        # In lazy mode only the state of the tasks to be processed is retrieved
+        persistence = SqliteStatePersistence(configuration={'path': '{}{}state.db'.format(temp_dir.name, os.sep), 'lazy': True})
+        we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=persistence)
+        we.add_task(task=self.task_01)
+        we.add_task(task=self.task_03)
+        we.add_task(task=self.task_04)
+        we.add_workflow_step_by_hook_instance(hook=TaskProcessingHook())
+        we.execute_workflow(command='create', context='con1')
+        self.assertEqual(
+            sorted(list(persistence.state_cache.keys())),
+            ['test-task-01:TASK_STATE', 'test-task-03:TASK_STATE', 'test-task-04:TASK_STATE']
+        )
+        persistence.close()
+        temp_dir.cleanup()
+
+    def test_method_execute_workflow_delete_in_reverse_order_01(self):
+        class RecordingHook(Hook):
+            def run(self, task: Task=None, parameters: dict=dict(), parameter_validator: ParameterValidation=ParameterValidation(constraints=None), persistence: StatePersistence=StatePersistence(), variable_store: VariableStore=VariableStore(), task_process_store: TaskProcessStore=TaskProcessStore())->VariableStore:
+                self.processed_task_names.append(task.task_id)
+                return variable_store
+
+        for execution_mode in ('Sequential', 'ThreadPool',):
+            hook = RecordingHook(name='RecordingHook')
+            hook.processed_task_names = list()
+            we = WorkflowExecutor(task_process_store=self.task_processor_store, variable_store=VariableStore(), persistence=StatePersistence(), execution_mode=execution_mode)
+            we.add_task(task=self.task_01)
+            we.add_task(task=self.task_02)
+            we.add_task(task=self.task_03)
+            we.add_task(task=self.task_04)
+            we.add_workflow_step_by_hook_instance(hook=hook)
+            we.execute_workflow(command='create', context='con1')
+            self.assertEqual(hook.processed_task_names, ['test-task-03', 'test-task-04', 'test-task-01', 'test-task-02'])
+            hook.processed_task_names = list()
+            we.execute_workflow(command='delete', context='con1')
+            self.assertEqual(hook.processed_task_names, ['test-task-02', 'test-task-01', 'test-task-04', 'test-task-03'])
+
 
 if __name__ == '__main__':
     unittest.main()